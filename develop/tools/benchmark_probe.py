@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""
+Name: benchmark_probe.py
+Porpose: compare the files per second of ffprobe and ffprobe_batch
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+
+DESCRIPTION:
+   Creates a number of short audio files using FFmpeg (or uses the
+   files found in the directory given with --dir) then probes them
+   one by one with the `ffprobe` function and all together with the
+   `ffprobe_batch` function, checks that the results are identical
+   and prints the files per second of both. The probe cache is not
+   used here.
+
+   Usage:
+       python3 develop/tools/benchmark_probe.py --count 1000
+
+This file is part of Videomass.
+
+    Videomass is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Videomass is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import subprocess
+import tempfile
+import shutil
+import argparse
+import time
+import glob
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+from videomass.vdms_threads.ffprobe import ffprobe, ffprobe_batch  # noqa
+
+
+def make_files(ffmpeg, count, outputdir):
+    """
+    Create `count` short audio files into `outputdir`,
+    returns the list of their pathnames.
+    """
+    source = os.path.join(outputdir, 'source.wav')
+    subprocess.run([ffmpeg, '-v', 'error', '-y', '-f', 'lavfi', '-i',
+                    'sine=frequency=440:duration=0.5', source], check=True)
+    files = []
+    for num in range(count):
+        name = os.path.join(outputdir, f'short_{num:05}.wav')
+        shutil.copyfile(source, name)
+        files.append(name)
+    return files
+
+
+def main():
+    """
+    Parse the arguments and run the benchmark
+    """
+    parser = argparse.ArgumentParser(description='ffprobe benchmark')
+    parser.add_argument('--count', type=int, default=1000,
+                        help='number of files to create (default 1000)')
+    parser.add_argument('--dir', help='probe the files in this directory '
+                        'instead of creating new ones')
+    parser.add_argument('--ffmpeg', default='ffmpeg')
+    parser.add_argument('--ffprobe', default='ffprobe')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='max ffprobe processes at once for '
+                        'ffprobe_batch (default: CPU cores, min 4)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if args.dir:
+            files = sorted(glob.glob(os.path.join(args.dir, '*.*')))
+        else:
+            files = make_files(args.ffmpeg, args.count, tmpdir)
+
+        start = time.perf_counter()
+        single = [ffprobe(name, args.ffprobe, hide_banner=None, pretty=None)
+                  for name in files]
+        single_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = ffprobe_batch(files, args.ffprobe, njobs=args.jobs,
+                              hide_banner=None, pretty=None)
+        batch_time = time.perf_counter() - start
+
+    if single != batch:
+        sys.exit('ERROR: ffprobe_batch results differ from ffprobe')
+
+    print(f'files: {len(files)}')
+    print(f'ffprobe:       {len(files) / single_time:8.1f} files/s')
+    print(f'ffprobe_batch: {len(files) / batch_time:8.1f} files/s')
+
+
+if __name__ == '__main__':
+    main()
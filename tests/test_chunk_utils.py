@@ -0,0 +1,84 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the chunk_utils.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.chunk_utils import (chunk_ranges,
+                                                  concat_list,
+                                                  check_chunked_output,
+                                                  frame_rate,
+                                                  )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestChunkRanges(unittest.TestCase):
+    """Test case for the chunk_ranges function."""
+
+    def test_even_split(self):
+        self.assertEqual(chunk_ranges(120000, 4),
+                         [(0, 30000), (30000, 30000), (60000, 30000),
+                          (90000, 30000)])
+
+    def test_min_length(self):
+        self.assertEqual(chunk_ranges(50000, 8), [(0, 25000), (25000, 25000)])
+        self.assertEqual(chunk_ranges(10000, 8), [(0, 10000)])
+
+    def test_keyframes(self):
+        keyframes = [10000, 28000, 41000, 59000, 95000, 100000]
+        self.assertEqual(chunk_ranges(120000, 4, keyframes),
+                         [(0, 28000), (28000, 31000), (59000, 36000),
+                          (95000, 25000)])
+
+    def test_keyframes_too_close(self):
+        # the nearest keyframe of both boundaries is the same
+        self.assertEqual(chunk_ranges(90000, 3, [45000]),
+                         [(0, 45000), (45000, 45000)])
+
+
+class TestConcat(unittest.TestCase):
+    """Test case for the concat_list and check functions."""
+
+    def test_concat_list(self):
+        self.assertEqual(concat_list(['/tmp/a.mkv', "/tmp/it's.mkv"]),
+                         "file '/tmp/a.mkv'\nfile '/tmp/it'\\''s.mkv'\n")
+
+    def test_frame_rate(self):
+        probe = {'streams': [{'codec_type': 'audio'},
+                             {'codec_type': 'video',
+                              'avg_frame_rate': '30000/1001'}]}
+        self.assertAlmostEqual(frame_rate(probe), 29.97, places=2)
+        self.assertEqual(frame_rate(probe, '-c:v libx264 -r 25'), 25)
+        self.assertEqual(frame_rate(probe, '-r:v 50/2 -crf 23'), 25)
+        self.assertIsNone(frame_rate({'streams': [{'codec_type': 'video',
+                                                   'avg_frame_rate': '0/0'}]}))
+        self.assertIsNone(frame_rate({}))
+
+    def test_check_output(self):
+        probe = {'streams': [{'codec_type': 'video',
+                              'nb_read_packets': '250'}],
+                 'format': {'duration': '10.040000'}}
+        self.assertEqual(check_chunked_output(10000, probe, 25), [])
+        self.assertEqual(check_chunked_output(10040, probe, 25, 2), [])
+        # a segment which dropped 10 frames
+        self.assertEqual(len(check_chunked_output(10400, probe, 25, 2)), 1)
+        self.assertEqual(len(check_chunked_output(12000, probe, 25)), 2)
+        self.assertEqual(check_chunked_output(10000, probe, None), [])
+        self.assertEqual(check_chunked_output(1000, {}, 25),
+                         ['no video stream found in the output file'])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
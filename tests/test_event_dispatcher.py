@@ -0,0 +1,107 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the event_dispatcher.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import time
+import unittest
+from unittest import mock
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads import event_dispatcher
+    from videomass.vdms_threads.event_dispatcher import (EventDispatcher,
+                                                         is_droppable)
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestEventDispatcher(unittest.TestCase):
+    """Test case for the EventDispatcher class."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.disp = EventDispatcher(rate=20, maxpending=3)
+        self.sent = []
+
+    def send(self, topic, **kwargs):
+        """Replaces `pub.sendMessage`"""
+        self.sent.append((topic, kwargs))
+
+    def deliver(self):
+        """Deliver the pending messages as the GUI thread does"""
+        with mock.patch.object(event_dispatcher.pub, 'sendMessage',
+                               self.send):
+            self.disp.deliver(self.disp.take_batch())
+
+    def test_droppable(self):
+        self.assertTrue(is_droppable('UPDATE_EVT', {'status': 0}))
+        self.assertFalse(is_droppable('UPDATE_EVT', {'status': 1}))
+        self.assertFalse(is_droppable('COUNT_EVT', {}))
+        self.assertFalse(is_droppable('END_EVT', {'filetotrash': None}))
+
+    def test_merge(self):
+        self.disp.maxpending = 100
+        self.disp.enqueue('UPDATE_EVT', False, {'output': 'a', 'status': 0})
+        for num in range(5):
+            self.disp.enqueue('PROGRESS_EVT', True, {'time': num,
+                                                     'jobid': 1})
+        self.disp.enqueue('PROGRESS_EVT', True, {'time': 9, 'jobid': 2})
+        self.disp.enqueue('UPDATE_EVT', False, {'output': 'b', 'status': 0})
+        self.deliver()
+        self.assertEqual(self.sent,
+                         [('UPDATE_EVT', {'output': 'a', 'status': 0}),
+                          ('PROGRESS_EVT', {'time': 4, 'jobid': 1}),
+                          ('PROGRESS_EVT', {'time': 9, 'jobid': 2}),
+                          ('UPDATE_EVT', {'output': 'b', 'status': 0})])
+        stats = self.disp.stats()
+        self.assertEqual((stats['posted'], stats['merged'],
+                          stats['delivered'], stats['batches']),
+                         (8, 4, 4, 1))
+
+    def test_drop_policy(self):
+        for num in range(5):
+            self.disp.enqueue('UPDATE_EVT', False, {'output': num,
+                                                    'status': 0})
+        self.disp.enqueue('UPDATE_EVT', False, {'output': 'FAILED',
+                                                'status': 1})
+        self.disp.enqueue('COUNT_EVT', False, {'count': '', 'end': 'DONE'})
+        self.disp.enqueue('END_EVT', False, {'filetotrash': None})
+        self.deliver()
+        self.assertEqual([kw.get('output') for _, kw in self.sent],
+                         [0, 1, 2, 'FAILED', None, None])
+        self.assertEqual([topic for topic, _ in self.sent][-2:],
+                         ['COUNT_EVT', 'END_EVT'])
+        self.assertEqual(self.disp.stats()['dropped'], 2)
+
+    def test_rate_limit(self):
+        with mock.patch.object(event_dispatcher.wx, 'CallAfter',
+                               lambda func, *args: func(*args)):
+            with mock.patch.object(event_dispatcher.pub, 'sendMessage',
+                                   self.send):
+                start = time.time()
+                for num in range(40):
+                    self.disp.post('UPDATE_EVT', merge=True, output=num,
+                                   status=0)
+                    time.sleep(0.01)
+                self.disp.post('END_EVT', filetotrash=None)
+                while self.sent[-1:] != [('END_EVT', {'filetotrash': None})]:
+                    time.sleep(0.01)
+                elapsed = time.time() - start
+        stats = self.disp.stats()
+        self.assertLessEqual(stats['batches'], elapsed * 20 + 1)
+        self.assertLess(stats['batches'], 41)
+        self.assertEqual(self.sent[-2], ('UPDATE_EVT', {'output': 39,
+                                                        'status': 0}))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the file_store.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import time
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.file_store import FileStore, shared_store
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestFileStore(unittest.TestCase):
+    """Test case for the FileStore class."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = FileStore(os.path.join(self.tmpdir.name, 'store'),
+                               '.bin', maxsize=20)
+        self.source = os.path.join(self.tmpdir.name, 'source.mkv')
+        with open(self.source, 'wb') as fout:
+            fout.write(b'0' * 100)
+
+    def tearDown(self):
+        """Method called after each test"""
+        self.tmpdir.cleanup()
+
+    def test_make_key(self):
+        key = self.store.make_key(self.source, 1, 'a')
+        self.assertEqual(key, self.store.make_key(self.source, 1, 'a'))
+        self.assertNotEqual(key, self.store.make_key(self.source, 2, 'a'))
+        self.assertNotEqual(key, self.store.make_key(self.source, 1, 'a',
+                                                     cmd=sys.executable))
+        self.assertIsNone(self.store.make_key(self.source, cmd='/not/exists'))
+        self.assertIsNone(self.store.make_key(self.source + '.none'))
+
+    def test_write_evict(self):
+        keys = [self.store.make_key(self.source, num) for num in range(3)]
+        for num, key in enumerate(keys):
+            self.assertTrue(self.store.write(key, b'ab', b'c' * 6))
+            past = time.time() - 10 + num
+            os.utime(self.store.path(key), (past, past))
+        self.assertEqual(self.store.total, 16)
+        self.assertFalse(os.path.exists(self.store.path(keys[0])))
+        with open(self.store.path(keys[2]), 'rb') as fin:
+            self.assertEqual(fin.read(), b'abcccccc')
+        self.assertTrue(self.store.touch(keys[1]))
+        self.assertFalse(self.store.touch(keys[0]))
+
+    def test_write_files(self):
+        name = os.path.join(self.tmpdir.name, 'stats.log')
+        with open(name, 'w', encoding='utf-8') as fout:
+            fout.write('stats')
+        store = FileStore(os.path.join(self.tmpdir.name, 'dirs'), maxage=60)
+        key = store.make_key(self.source)
+        self.assertTrue(store.write_files(key, [name]))
+        self.assertFalse(store.write_files(key, [name]))  # already stored
+        self.assertEqual(os.listdir(store.path(key)), ['stats.log'])
+        self.assertEqual(store.total, 5)
+        past = time.time() - 120
+        os.utime(store.path(key), (past, past))
+        store.evict()  # expired
+        self.assertFalse(os.path.exists(store.path(key)))
+        store.clear()
+        self.assertFalse(os.path.exists(store.dirname))
+
+    def test_shared(self):
+        self.assertIs(shared_store(FileStore, self.store.dirname),
+                      shared_store(FileStore, self.store.dirname))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the frame_cache.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.frame_cache import FrameCache
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestFrameCache(unittest.TestCase):
+    """Test case for the FrameCache class."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dirname = os.path.join(self.tmpdir.name, 'frames')
+        self.cache = FrameCache(self.dirname, maxmemory=30, maxdisk=50)
+        self.source = os.path.join(self.tmpdir.name, 'source.mkv')
+        with open(self.source, 'wb') as fout:
+            fout.write(b'0' * 100)
+
+    def tearDown(self):
+        """Method called after each test"""
+        self.tmpdir.cleanup()
+
+    def test_keys(self):
+        key = self.cache.make_key(self.source, 1000, 4, 2)
+        self.assertEqual(key, self.cache.make_key(self.source, 1000, 4, 2))
+        self.assertNotEqual(key, self.cache.make_key(self.source, 1040, 4, 2))
+        self.assertNotEqual(key, self.cache.make_key(self.source, 1000, 2, 1))
+        self.assertNotEqual(key, self.cache.make_key(self.source, 1000, 4, 2,
+                                                     'eq=gamma=2'))
+        self.assertIsNone(self.cache.make_key(self.source + '.x', 0, 4, 2))
+
+    def test_put_get(self):
+        key = self.cache.make_key(self.source, 1000, 4, 2)
+        self.assertIsNone(self.cache.get(key))
+        buf = bytearray(b'x' * 24)
+        self.assertEqual(self.cache.put(key, buf), b'x' * 24)
+        buf[0] = 0  # the stored frame is a copy
+        self.assertEqual(self.cache.get(key), b'x' * 24)
+
+    def test_memory_limit(self):
+        keys = [self.cache.make_key(self.source, msec, 4, 1)
+                for msec in (0, 40, 80)]
+        for num, key in enumerate(keys):
+            self.cache.put(key, bytes([num]) * 12)
+        self.assertEqual(list(self.cache.frames), keys[1:])
+        self.assertEqual(self.cache.size, 24)
+
+    def test_disk_reload(self):
+        key = self.cache.make_key(self.source, 1000, 4, 1)
+        self.cache.put(key, b'y' * 12)
+        self.assertIsNone(FrameCache(self.dirname).get(key))  # memory only
+        self.assertTrue(self.cache.persist(key))
+        other = FrameCache(self.dirname)
+        self.assertEqual(other.get(key), b'y' * 12)
+        self.assertIn(key, other.frames)
+
+    def test_disk_limit(self):
+        keys = [self.cache.make_key(self.source, msec, 4, 2)
+                for msec in (0, 40, 80)]
+        for key in keys:
+            self.cache.put(key, b'z' * 24)
+            self.cache.persist(key)
+        names = [name for name in os.listdir(self.dirname)
+                 if name.endswith('.rgb')]
+        self.assertEqual(len(names), 2)
+
+    def test_clear(self):
+        key = self.cache.make_key(self.source, 1000, 4, 1)
+        self.cache.put(key, b'y' * 12)
+        self.cache.persist(key)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(key))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
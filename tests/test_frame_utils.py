@@ -0,0 +1,93 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the frame_utils.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import io
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.frame_utils import (frame_size,
+                                                  frame_offset,
+                                                  decoder_args,
+                                                  filter_args,
+                                                  read_frame,
+                                                  )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestFrameUtils(unittest.TestCase):
+    """Test case for the raw frames helpers."""
+
+    def test_frame_size(self):
+        self.assertEqual(frame_size(350, 197), 350 * 197 * 3)
+
+    def test_frame_offset(self):
+        self.assertEqual(frame_offset(10000, 10000, 25), 0)
+        self.assertEqual(frame_offset(10000, 11000, 25), 25)
+        self.assertEqual(frame_offset(10000, 10030, 25), 1)
+        self.assertIsNone(frame_offset(10000, 9000, 25))
+
+    def test_decoder_args(self):
+        args = decoder_args('/tmp/a b.mkv', 12500, 350, 197, 25)
+        self.assertEqual(args, '-ss 12.500 -i "/tmp/a b.mkv" -an -sn -dn '
+                         '-vf "fps=25,scale=350:197" -f rawvideo '
+                         '-pix_fmt rgb24 pipe:1')
+
+    def test_decoder_args_start(self):
+        args = decoder_args('a.mkv', 0, 270, 152, 25)
+        self.assertTrue(args.startswith('-i "a.mkv"'))
+
+    def test_filter_args(self):
+        args = filter_args(270, 152, 'eq=gamma=1.2')
+        self.assertEqual(args, '-f rawvideo -pix_fmt rgb24 -s 270x152 '
+                         '-i pipe:0 -vf "eq=gamma=1.2" -frames:v 1 '
+                         '-f rawvideo -pix_fmt rgb24 pipe:1')
+
+class ShortReads(io.RawIOBase):
+    """A raw stream returning at most 5 bytes for each read."""
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        return self.data.readinto(memoryview(buf)[:5])
+
+
+class TestReadFrame(unittest.TestCase):
+    """Test case for the read_frame function."""
+
+    def test_whole_frames(self):
+        stream = io.BytesIO(bytes(range(12)))
+        buf = bytearray(frame_size(2, 1))
+        self.assertTrue(read_frame(stream, buf))
+        self.assertEqual(buf, bytes(range(6)))
+        self.assertTrue(read_frame(stream, buf))
+        self.assertEqual(buf, bytes(range(6, 12)))
+        self.assertFalse(read_frame(stream, buf))
+
+    def test_short_reads(self):
+        buf = bytearray(12)
+        self.assertTrue(read_frame(ShortReads(bytes(range(12))), buf))
+        self.assertEqual(buf, bytes(range(12)))
+
+    def test_incomplete_frame(self):
+        buf = bytearray(12)
+        self.assertFalse(read_frame(io.BytesIO(bytes(8)), buf))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the job_journal.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.make_filelog import flush_logs, close_logs
+    from videomass.vdms_io.job_journal import (JobJournal,
+                                               read_journal,
+                                               remaining_items,
+                                               interrupted_outputs,
+                                               cleanup_interrupted,
+                                               resume_journal,
+                                               RUNNING, DONE, FAILED,
+                                               )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestJobJournal(unittest.TestCase):
+    """Test case for the JobJournal class and its functions."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'queue.journal')
+        self.journal = JobJournal(self.path)
+        self.queue = [{'destination': os.path.join(self.tmpdir.name,
+                                                   f'out{num}.mkv')}
+                      for num in range(4)]
+
+    def tearDown(self):
+        """Method called after each test"""
+        self.journal.close()
+        self.tmpdir.cleanup()
+
+    def test_states(self):
+        self.journal.start(self.queue)
+        self.journal.mark(1, RUNNING)
+        self.journal.mark(1, DONE, 0)
+        self.journal.mark(2, RUNNING)
+        self.journal.mark(2, FAILED, 1)
+        self.journal.mark(3, RUNNING)
+        journal = read_journal(self.path)
+        self.assertEqual(journal['queue'], self.queue)
+        self.assertEqual(journal['states'][2]['exit'], 1)
+        self.assertEqual(remaining_items(journal), self.queue[1:])
+        self.assertEqual(interrupted_outputs(journal),
+                         [self.queue[2]['destination']])
+
+    def test_truncated(self):
+        self.journal.start(self.queue)
+        self.journal.mark(1, DONE, 0)
+        with open(self.path, 'a', encoding='utf-8') as fout:
+            fout.write('{"id": 2, "sta')  # crash while writing
+        journal = read_journal(self.path)
+        self.assertEqual(list(journal['states']), [1])
+
+    def test_close(self):
+        self.journal.start(self.queue)
+        self.journal.close()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(read_journal(self.path))
+
+    def test_cleanup(self):
+        outputs = [{'destination': os.path.join(self.tmpdir.name, name)}
+                   for name in ('a.mp4', 'b.mp4')]
+        self.journal.start([{'destination': outputs[0]['destination'],
+                             'outputs': outputs}])
+        self.journal.mark(1, RUNNING)
+        jobdir = os.path.join(self.tmpdir.name, 'tmp', 'job-1')
+        os.makedirs(jobdir)
+        with open(outputs[1]['destination'], 'w', encoding='utf-8') as fout:
+            fout.write('half')
+        removed = cleanup_interrupted(read_journal(self.path),
+                                      self.tmpdir.name)
+        self.assertEqual(removed, [outputs[1]['destination']])
+        self.assertFalse(os.path.exists(jobdir))
+
+    def test_resume_half_written(self):
+        for item in self.queue:
+            with open(item['destination'], 'w', encoding='utf-8') as fout:
+                fout.write('data')
+        self.journal.start(self.queue)
+        self.journal.mark(1, RUNNING)
+        self.journal.mark(1, DONE, 0)
+        self.journal.mark(2, RUNNING)
+        self.journal.mark(3, RUNNING)
+        self.journal.handle.close()  # crash: a record is half-written
+        self.journal.handle = None
+        with open(self.path, 'a', encoding='utf-8') as fout:
+            fout.write('{"id": 3, "state": "do')
+        journal = read_journal(self.path)
+        self.assertEqual(resume_journal(journal, self.tmpdir.name),
+                         self.queue[1:])
+        exists = [os.path.exists(item['destination'])
+                  for item in self.queue]
+        self.assertEqual(exists, [True, False, False, True])
+
+    def test_journal_error(self):
+        logfile = os.path.join(self.tmpdir.name, 'queue.log')
+        journal = JobJournal(os.path.join(self.tmpdir.name, 'no', 'dir'),
+                             logfile)
+        journal.start(self.queue)
+        journal.mark(1, RUNNING)
+        self.assertTrue(journal.failed)
+        flush_logs(logfile)
+        close_logs(logfile)
+        with open(logfile, 'r', encoding='utf-8') as log:
+            self.assertEqual(log.read().count('Queue journal error'), 1)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
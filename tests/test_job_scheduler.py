@@ -0,0 +1,99 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the job_scheduler.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.job_scheduler import (JobScheduler,
+                                                    estimate_cost,
+                                                    video_size,
+                                                    BASEMEM,
+                                                    )
+except ImportError as error:
+    sys.exit(error)
+
+GIB = 1024 ** 3
+PROBE = {'streams': [{'codec_type': 'audio'},
+                     {'codec_type': 'video', 'width': 3840, 'height': 2160}]}
+
+
+class TestEstimateCost(unittest.TestCase):
+    """Test case for the estimate_cost function."""
+
+    def test_video_size(self):
+        self.assertEqual(video_size(PROBE), 3840 * 2160)
+        self.assertIsNone(video_size({'streams': []}))
+        self.assertIsNone(video_size(None))
+
+    def test_codecs(self):
+        kwa = {'args': ['-c:v libaom-av1 -c:a aac', '']}
+        av1 = estimate_cost(kwa)
+        self.assertEqual(av1['cpu'], 8)
+        x264 = estimate_cost({'args': ['-c:v libx264', '']})
+        self.assertLess(x264['cpu'], av1['cpu'])
+        self.assertLess(x264['mem'], av1['mem'])
+        audio = estimate_cost({'args': ['-vn -c:a libopus', '']})
+        self.assertEqual(audio['mem'], BASEMEM)
+
+    def test_resolution_segments(self):
+        kwa = {'args': ['-pass 1 -c:v libx264', '-pass 2 -c:v libx264']}
+        uhd = estimate_cost(kwa, PROBE)
+        self.assertEqual(uhd['cpu'], 12)
+        self.assertEqual(estimate_cost(kwa, PROBE, segments=2)['cpu'], 24)
+
+    def test_multi_output(self):
+        kwa = {'args': ['', ''],
+               'outputs': [{'args': '-c:v libx264'},
+                           {'args': '-c:v h264_nvenc'}]}
+        self.assertEqual(estimate_cost(kwa)['cpu'], 3.5)
+
+
+class TestJobScheduler(unittest.TestCase):
+    """Test case for the JobScheduler class."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.load = [None, None]
+        self.sched = JobScheduler(3, cpus=8, memory=10 * GIB,
+                                  sysload=lambda: tuple(self.load))
+
+    def test_budget(self):
+        big = {'cpu': 12, 'mem': GIB}
+        self.assertEqual(self.sched.admit(1, big), (True, 'no jobs running'))
+        self.assertEqual(self.sched.admit(2, {'cpu': 1, 'mem': GIB}),
+                         (False, 'CPU budget exceeded'))
+        self.sched.release(1)
+        self.assertTrue(self.sched.admit(2, {'cpu': 6, 'mem': GIB})[0])
+        self.assertEqual(self.sched.admit(3, {'cpu': 1, 'mem': 9 * GIB}),
+                         (False, 'memory budget exceeded'))
+        self.assertTrue(self.sched.admit(3, {'cpu': 1, 'mem': GIB})[0])
+        self.assertTrue(self.sched.admit(4, {'cpu': 1, 'mem': GIB})[0])
+        self.assertEqual(self.sched.admit(5, {'cpu': 0, 'mem': 0}),
+                         (False, 'max jobs running'))
+
+    def test_live_load(self):
+        self.sched.admit(1, {'cpu': 1, 'mem': GIB})
+        self.load[:] = [11.0, None]
+        self.assertEqual(self.sched.admit(2, {'cpu': 1, 'mem': GIB}),
+                         (False, 'system overloaded'))
+        self.load[:] = [1.0, GIB]
+        self.assertEqual(self.sched.admit(2, {'cpu': 1, 'mem': GIB}),
+                         (False, 'low available memory'))
+        self.load[:] = [1.0, 4 * GIB]
+        self.assertTrue(self.sched.admit(2, {'cpu': 1, 'mem': GIB})[0])
+        self.assertIn('running 2', self.sched.status())
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the keyframe_index.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+from unittest import mock
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io import keyframe_index
+    from videomass.vdms_io.keyframe_index import (KeyframeIndex,
+                                                  KeyframeIndexer,
+                                                  )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestKeyframeIndex(unittest.TestCase):
+    """Test case for the KeyframeIndex class."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.index = KeyframeIndex([4.004, 0.0, 2.002, 10.5])
+
+    def test_before_after(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.before(3.5), 2.002)
+        self.assertEqual(self.index.before(2.002), 2.002)
+        self.assertEqual(self.index.before(100), 10.5)
+        self.assertEqual(self.index.after(4.1), 10.5)
+        self.assertIsNone(self.index.after(11))
+        self.assertIsNone(KeyframeIndex([1.0]).before(0.5))
+
+    def test_text(self):
+        index = KeyframeIndex.from_text(self.index.to_text())
+        self.assertEqual(list(index.times), [0.0, 2.002, 4.004, 10.5])
+
+
+class TestKeyframeIndexer(unittest.TestCase):
+    """Test case for the KeyframeIndexer class."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.media = os.path.join(self.tmpdir.name, 'media.mkv')
+        with open(self.media, 'wb') as fout:
+            fout.write(b'0' * 100)
+        self.indexer = KeyframeIndexer(os.path.join(self.tmpdir.name,
+                                                    'test.db'))
+
+    def tearDown(self):
+        """Method called after each test"""
+        if self.indexer.cache.conn is not None:
+            self.indexer.cache.conn.close()
+        self.tmpdir.cleanup()
+
+    def test_stored_index(self):
+        key = self.indexer.cache.make_key(self.media, sys.executable,
+                                          'keyframes')
+        self.indexer.cache.put(key, KeyframeIndex([0.0, 5.0]).to_text())
+        index = self.indexer.get(self.media, sys.executable, wait=False)
+        self.assertEqual(list(index.times), [0.0, 5.0])
+        self.assertIs(self.indexer.get(self.media, sys.executable), index)
+
+    def test_missing_file(self):
+        self.assertIsNone(self.indexer.get('/not/exists', sys.executable))
+
+    def test_not_indexable(self):
+        calls = []
+
+        def probe(*args):
+            calls.append(args)
+            return None, 'ffprobe: no video stream'
+
+        with mock.patch.object(keyframe_index, 'ffprobe_keyframes', probe):
+            self.assertIsNone(self.indexer.get(self.media, sys.executable))
+            self.assertIsNone(self.indexer.get(self.media, sys.executable))
+            self.indexer.indexes.clear()  # from the database
+            self.assertIsNone(self.indexer.get(self.media, sys.executable,
+                                               wait=False))
+        self.assertEqual(len(calls), 1)
+
+    def test_probe_oserror(self):
+        with mock.patch.object(keyframe_index, 'ffprobe_keyframes',
+                               lambda *args: (None, OSError('no ffprobe'))):
+            self.assertIsNone(self.indexer.get(self.media, sys.executable))
+        key = self.indexer.cache.make_key(self.media, sys.executable,
+                                          'keyframes')
+        self.assertIsNone(self.indexer.cache.get(key))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
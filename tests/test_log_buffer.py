@@ -0,0 +1,65 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the log_buffer.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.log_buffer import LogBuffer
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestLogBuffer(unittest.TestCase):
+    """Test case for the LogBuffer class."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.buf = LogBuffer(capacity=3)
+
+    def lines(self):
+        return [self.buf[i] for i in range(len(self.buf))]
+
+    def test_split_lines(self):
+        self.buf.write('TXT0', '\nfile 1\n')
+        self.assertEqual(self.lines(), [('TXT0', ''), ('TXT0', 'file 1')])
+
+    def test_continued_line(self):
+        self.buf.write('INFO', 'frame=1 ')
+        self.buf.write('WARN', 'speed=1x\n')
+        self.buf.write('ERR0', 'next\n')
+        self.assertEqual(self.lines(), [('INFO', 'frame=1 speed=1x'),
+                                        ('ERR0', 'next')])
+
+    def test_capacity(self):
+        for num in range(10):
+            self.buf.write('TXT3', f'line {num}\n')
+        self.assertEqual(len(self.buf), 3)
+        self.assertEqual(self.buf.discarded, 7)
+        self.assertEqual(self.lines(), [('TXT3', 'line 7'),
+                                        ('TXT3', 'line 8'),
+                                        ('TXT3', 'line 9')])
+        self.assertEqual(self.buf[-1], ('TXT3', 'line 9'))
+        with self.assertRaises(IndexError):
+            self.buf[3]
+
+    def test_clear(self):
+        self.buf.write('TXT3', 'text')
+        self.buf.clear()
+        self.assertEqual(len(self.buf), 0)
+        self.buf.write('TXT0', 'new\n')
+        self.assertEqual(self.lines(), [('TXT0', 'new')])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the loudness_store.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.loudness_store import (LoudnessStore,
+                                                  loudnorm_measured,
+                                                  valid_measured,
+                                                  measured_filter,
+                                                  loudnorm_args,
+                                                  loudnorm_targets,
+                                                  loudnorm_retarget,
+                                                  )
+except ImportError as error:
+    sys.exit(error)
+
+TSEQ = ('-ss 00:00:10.000', '-t 00:01:00.000')
+
+
+class TestLoudnessStore(unittest.TestCase):
+    """Test case for the LoudnessStore class."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.media = os.path.join(self.tmpdir.name, 'media.mkv')
+        with open(self.media, 'wb') as fout:
+            fout.write(b'0' * 100)
+        self.store = LoudnessStore(os.path.join(self.tmpdir.name, 'test.db'))
+
+    def tearDown(self):
+        """Method called after each test"""
+        if self.store.cache.conn is not None:
+            self.store.cache.conn.close()
+        self.tmpdir.cleanup()
+
+    def test_put_get(self):
+        values = {'max_volume': '-1.5 dB', 'mean_volume': '-20.1 dB'}
+        args = (self.media, sys.executable, 'volumedetect', TSEQ,
+                '-map 0:a:0')
+        self.assertIsNone(self.store.get(*args))
+        self.store.put(*args, values)
+        self.assertEqual(self.store.get(*args), values)
+        # extra whitespaces in args do not matter
+        self.assertEqual(self.store.get(self.media, sys.executable,
+                                        'volumedetect', TSEQ,
+                                        ' -map  0:a:0 '), values)
+
+    def test_key_params(self):
+        self.store.put(self.media, sys.executable, 'volumedetect', TSEQ,
+                       '-map 0:a:0', {'max_volume': '0 dB'})
+        self.assertIsNone(self.store.get(self.media, sys.executable,
+                                         'volumedetect', TSEQ, '-map 0:a:1'))
+        self.assertIsNone(self.store.get(self.media, sys.executable,
+                                         'volumedetect', ('', ''),
+                                         '-map 0:a:0'))
+        self.assertIsNone(self.store.get(self.media, sys.executable,
+                                         'loudnorm', TSEQ, '-map 0:a:0'))
+
+
+class TestMeasured(unittest.TestCase):
+    """Test case for the loudnorm measurements functions."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.summary = {'Input Integrated:': '-23.0',
+                        'Input True Peak:': '-2.0',
+                        'Input LRA:': '5.0',
+                        'Input Threshold:': '-33.0',
+                        'Output Integrated:': '-16.0',
+                        'Target Offset:': '0.3',
+                        }
+
+    def test_summary(self):
+        measured = loudnorm_measured(self.summary)
+        self.assertEqual(measured, {'measured_I': '-23.0',
+                                    'measured_LRA': '5.0',
+                                    'measured_TP': '-2.0',
+                                    'measured_thresh': '-33.0',
+                                    'offset': '0.3'})
+        self.assertEqual(measured_filter(measured),
+                         ':measured_I=-23.0:measured_LRA=5.0'
+                         ':measured_TP=-2.0:measured_thresh=-33.0'
+                         ':offset=0.3')
+        self.summary['Target Offset:'] = None
+        self.assertIsNone(loudnorm_measured(self.summary))
+
+    def test_valid(self):
+        self.assertFalse(valid_measured(None))
+        self.assertFalse(valid_measured({'measured_I': '-23.0'}))
+        measured = loudnorm_measured(self.summary)
+        self.assertTrue(valid_measured(measured))
+        measured['offset'] = 'inf dB'
+        self.assertFalse(valid_measured(measured))
+
+    def test_args(self):
+        kwa = {'source': 'a.mkv', 'start-time': '', 'end-time': '',
+               'args': ['-filter:a: loudnorm -f null', '']}
+        self.assertEqual(loudnorm_args(kwa, 'ffmpeg')[2:],
+                         ('loudnorm', ('', ''), kwa['args'][0]))
+        kwa['args'][0] = '-filter:v vidstabdetect ' + kwa['args'][0]
+        self.assertIsNone(loudnorm_args(kwa, 'ffmpeg'))
+
+    def test_targets(self):
+        self.assertEqual(loudnorm_targets('loudnorm=I=-16:tp=-1.5:LRA=11:'
+                                          'print_format=summary'),
+                         {'I': -16.0, 'TP': -1.5, 'LRA': 11.0})
+        self.assertEqual(loudnorm_targets('loudnorm'),
+                         {'I': -24.0, 'TP': -2.0, 'LRA': 7.0})
+
+    def test_key_without_targets(self):
+        kwa = {'source': 'a.mkv', 'start-time': '', 'end-time': '',
+               'args': ['-filter:a: aresample=48000,loudnorm=I=-16:TP=-1.5'
+                        ':LRA=11:print_format=summary -f null', '']}
+        other = {**kwa, 'args': ['-filter:a: aresample=48000,loudnorm=I=-23'
+                                 ':TP=-2:LRA=7:print_format=summary '
+                                 '-f null', '']}
+        self.assertEqual(loudnorm_args(kwa, 'ffmpeg'),
+                         loudnorm_args(other, 'ffmpeg'))
+        self.assertEqual(loudnorm_args(kwa, 'ffmpeg')[4],
+                         '-filter:a: aresample=48000,loudnorm -f null')
+        other['args'] = ['-filter:a: aresample=44100,loudnorm=I=-16 '
+                         '-f null', '']
+        self.assertNotEqual(loudnorm_args(kwa, 'ffmpeg'),
+                            loudnorm_args(other, 'ffmpeg'))
+
+    def test_retarget(self):
+        measured = loudnorm_measured(self.summary)
+        # -16 LUFS needs +7 dB, over the -1.5 dBTP true peak limit
+        self.assertIsNone(loudnorm_retarget(measured, 'loudnorm=I=-16:'
+                                            'TP=-1.5:LRA=11'))
+        # the offset measured for the same targets is kept
+        stored = {**measured, 'targets': {'I': -16.0, 'TP': -1.5,
+                                          'LRA': 11.0}}
+        self.assertEqual(loudnorm_retarget(stored, 'loudnorm=I=-16:'
+                                           'TP=-1.5:LRA=11'), measured)
+        # -23 LUFS needs +0 dB, within the limits: linear gain
+        low = loudnorm_retarget(stored, 'loudnorm=I=-23:TP=-2:LRA=7')
+        self.assertEqual(low, {**measured, 'offset': '0.00'})
+        # LRA over the target LRA: dynamic mode
+        self.assertIsNone(loudnorm_retarget(stored, 'loudnorm=I=-23:'
+                                            'TP=-2:LRA=4'))
+        self.assertIsNone(loudnorm_retarget(None, 'loudnorm'))
+
+
+class TestReuse(unittest.TestCase):
+    """Test case for the reuse of stored loudnorm measurements."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.media = os.path.join(self.tmpdir.name, 'media.mkv')
+        with open(self.media, 'wb') as fout:
+            fout.write(b'0' * 100)
+        self.store = LoudnessStore(os.path.join(self.tmpdir.name, 'test.db'))
+
+    def tearDown(self):
+        """Method called after each test"""
+        if self.store.cache.conn is not None:
+            self.store.cache.conn.close()
+        self.tmpdir.cleanup()
+
+    def item(self, ebu):
+        """Returns a 'Two pass EBU' item with the given filter"""
+        return {'source': self.media, 'start-time': '', 'end-time': '',
+                'EBU': ebu, 'args': [f'-map 0:a:0 -filter:a: {ebu} '
+                                     f'-vn -sn -dn -f null', '']}
+
+    def test_other_target(self):
+        measured = {'measured_I': '-30.0', 'measured_LRA': '6.0',
+                    'measured_TP': '-10.0', 'measured_thresh': '-40.0',
+                    'offset': '0.10'}
+        first = self.item('loudnorm=I=-23:TP=-2:LRA=7:print_format=summary')
+        self.store.put(*loudnorm_args(first, sys.executable),
+                       {**measured, 'targets': loudnorm_targets(first['EBU'])})
+        for ebu, offset in (('loudnorm=I=-23:TP=-2:LRA=7:'
+                             'print_format=summary', '0.10'),
+                            ('loudnorm=I=-24:TP=-2:LRA=20:'
+                             'print_format=summary', '0.00'),
+                            ('loudnorm=I=-16:TP=-1.5:LRA=11:'
+                             'print_format=summary', None)):
+            item = self.item(ebu)
+            stored = self.store.get(*loudnorm_args(item, sys.executable))
+            reused = loudnorm_retarget(stored, item['EBU'])
+            if offset is None:  # the first pass is needed
+                self.assertIsNone(reused)
+                continue
+            self.assertTrue(valid_measured(reused))
+            self.assertEqual(reused['measured_I'], '-30.0')
+            self.assertEqual(reused['measured_TP'], '-10.0')
+            self.assertEqual(reused['offset'], offset)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the buffered log writer of
+#          the make_filelog.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.make_filelog import (log_sink,
+                                                logwrite,
+                                                flush_logs,
+                                                close_logs,
+                                                make_log_template,
+                                                )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestLogSink(unittest.TestCase):
+    """Test case for the buffered log writer."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.logfile = make_log_template('test.log', self.tmpdir.name,
+                                         mode='w')
+
+    def tearDown(self):
+        """Method called after each test"""
+        close_logs(self.logfile)
+        self.tmpdir.cleanup()
+
+    def read(self):
+        with open(self.logfile, 'r', encoding='utf-8') as log:
+            return log.read()
+
+    def test_shared_instance(self):
+        self.assertIs(log_sink(self.logfile), log_sink(self.logfile))
+
+    def test_write_order(self):
+        logwrite('ffmpeg -i input output', '', self.logfile)
+        for num in range(100):
+            log_sink(self.logfile).write(f'line {num}\n')
+        flush_logs(self.logfile)
+        data = self.read()
+        self.assertIn('ffmpeg -i input output', data)
+        lines = [x for x in data.splitlines() if x.startswith('line')]
+        self.assertEqual(lines, [f'line {num}' for num in range(100)])
+
+    def test_truncate_template(self):
+        log_sink(self.logfile).write('old data\n')
+        make_log_template('test.log', self.tmpdir.name, mode='w')
+        self.assertNotIn('old data', self.read())
+
+    def test_write_failure(self):
+        logdir = os.path.join(self.tmpdir.name, 'logs')
+        os.makedirs(logdir)
+        logfile = make_log_template('retry.log', logdir, mode='w')
+        os.remove(logfile)
+        os.rmdir(logdir)
+        sink = log_sink(logfile)
+        sink.write('kept data\n')
+        flush_logs(logfile)  # failures are not raised
+        self.assertIsInstance(sink.error, OSError)
+        flush_logs()
+        sink.write('more data\n')
+        os.makedirs(logdir)
+        flush_logs(logfile)
+        self.assertIsNone(sink.error)
+        close_logs(logfile)
+        with open(logfile, 'r', encoding='utf-8') as log:
+            lines = log.read().splitlines()
+        self.assertEqual(lines[0], 'kept data')
+        self.assertEqual(lines[2][:30], '[VIDEOMASS]: Log write error: ')
+        self.assertEqual(lines[3:], ['more data'])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the multiout_utils.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.multiout_utils import (split_args,
+                                                     split_output,
+                                                     multi_output_args,
+                                                     valid_outputs,
+                                                     )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestSplitOutput(unittest.TestCase):
+    """Test case for the split_args and split_output functions."""
+
+    def test_split_args(self):
+        self.assertEqual(split_args('-vf "scale=-2:720, fps=30" C:\\out'),
+                         ['-vf', 'scale=-2:720, fps=30', 'C:\\out'])
+
+    def test_video_maps(self):
+        filters, tokens = split_output(split_args(
+            '-map 0:v? -map 0:a? -map 0:s? -c:v libx264 -vf yadif'), 'v0')
+        self.assertEqual(filters, 'yadif')
+        self.assertEqual(tokens, ['-map', '[v0]', '-map', '0:a?', '-map',
+                                  '0:s?', '-c:v', 'libx264'])
+
+    def test_all_streams(self):
+        filters, tokens = split_output(['-map', '0', '-c:v', 'libx265'],
+                                       'v1')
+        self.assertEqual(filters, 'null')
+        self.assertEqual(tokens, ['-map', '[v1]', '-map', '0', '-map',
+                                  '-0:v', '-c:v', 'libx265'])
+
+    def test_default_selection(self):
+        self.assertEqual(split_output(['-c:v', 'libx264'], 'v0')[1],
+                         ['-map', '[v0]', '-map', '0:a:0?', '-c:v',
+                          'libx264'])
+
+    def test_no_video(self):
+        self.assertEqual(split_output(['-vn', '-c:a', 'aac'], 'v0'),
+                         (None, ['-vn', '-c:a', 'aac']))
+        self.assertEqual(split_output(['-c', 'copy'], 'v0'),
+                         (None, ['-c', 'copy']))
+
+    def test_not_splittable(self):
+        self.assertIsNone(split_output(['-map', '0:1', '-c:v', 'x'], 'v0'))
+        self.assertIsNone(split_output(['-filter_complex', 'x'], 'v0'))
+
+
+class TestMultiOutputArgs(unittest.TestCase):
+    """Test case for the multi_output_args function."""
+
+    def test_split_graph(self):
+        outputs = [{'args': '-c:v libx264 -vf scale=-2:720 -c:a aac',
+                    'destination': '/out/720.mp4'},
+                   {'args': '-c:v libx264 -vf "scale=-2:360"',
+                    'destination': '/out/360.mp4'},
+                   {'args': '-vn -c:a libopus', 'destination': '/out/a.ogg'},
+                   ]
+        self.assertEqual(multi_output_args(outputs),
+                         '-filter_complex "[0:v:0]split=2[s0][s1];'
+                         '[s0]scale=-2:720[v0];[s1]scale=-2:360[v1]" '
+                         '-map "[v0]" -map 0:a:0? -c:v libx264 -c:a aac '
+                         '"/out/720.mp4" -map "[v1]" -map 0:a:0? -c:v '
+                         'libx264 "/out/360.mp4" -vn -c:a libopus '
+                         '"/out/a.ogg"')
+
+    def test_plain(self):
+        outputs = [{'args': '-map 0:1 -c:v libx264', 'destination': 'a'},
+                   {'args': '-c:v libx264', 'destination': 'b'}]
+        self.assertEqual(multi_output_args(outputs),
+                         '-map 0:1 -c:v libx264 "a" -c:v libx264 "b"')
+        self.assertEqual(multi_output_args(outputs[1:]),
+                         '-c:v libx264 "b"')
+
+    def test_valid_outputs(self):
+        self.assertTrue(valid_outputs([{'args': '', 'destination': 'a'}]))
+        self.assertFalse(valid_outputs([]))
+        self.assertFalse(valid_outputs([{'args': ''}]))
+        self.assertFalse(valid_outputs([{'args': '', 'destination': 'a'},
+                                        {'args': '', 'destination': 'a'}]))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the pass_stats.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import time
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.pass_stats import PassStats, stats_files
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestPassStats(unittest.TestCase):
+    """Test case for the PassStats class."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.workdir = os.path.join(self.tmpdir.name, 'work')
+        os.mkdir(self.workdir)
+        self.stats = PassStats(os.path.join(self.tmpdir.name, 'stats'))
+        source = os.path.join(self.tmpdir.name, 'source.mkv')
+        with open(source, 'wb') as fout:
+            fout.write(b'0' * 100)
+        self.kwa = {'source': source, 'start-time': '', 'end-time': '',
+                    'args': ['-pass 1 -c:v libx264 -b:v 1M', '-pass 2']}
+
+    def tearDown(self):
+        """Method called after each test"""
+        self.tmpdir.cleanup()
+
+    def write_stats(self, data):
+        for name in ('ffmpeg2pass-0.log', 'ffmpeg2pass-0.log.mbtree'):
+            with open(os.path.join(self.workdir, name), 'w') as fout:
+                fout.write(data)
+
+    def test_make_key(self):
+        key = self.stats.make_key(self.kwa, sys.executable)
+        spaces = {**self.kwa, 'args': [' -pass 1  -c:v libx264 -b:v 1M',
+                                       '-pass 2 -c:a aac']}
+        self.assertEqual(self.stats.make_key(spaces, sys.executable), key)
+        other = {**self.kwa, 'start-time': '-ss 00:00:10.000'}
+        self.assertNotEqual(self.stats.make_key(other, sys.executable), key)
+        self.assertIsNone(self.stats.make_key(self.kwa, '/not/exists'))
+
+    def test_store_restore(self):
+        key = self.stats.make_key(self.kwa, sys.executable)
+        self.assertFalse(self.stats.restore(key, self.workdir))
+        self.assertFalse(self.stats.store(key, self.workdir))
+        self.write_stats('stats')
+        with open(os.path.join(self.workdir, 'other.log'), 'w') as fout:
+            fout.write('other')
+        self.assertTrue(self.stats.store(key, self.workdir))
+        self.assertFalse(self.stats.store(key, self.workdir))  # stored
+        for name in stats_files(self.workdir):
+            os.remove(name)
+        self.assertTrue(self.stats.restore(key, self.workdir))
+        self.assertEqual(len(stats_files(self.workdir)), 2)
+
+    def test_since(self):
+        self.write_stats('stats')
+        self.assertEqual(stats_files(self.workdir, time.time() + 60), [])
+
+    def test_evict(self):
+        self.stats.maxsize = 15
+        self.write_stats('stats')  # 10 bytes per entry
+        key1 = self.stats.make_key(self.kwa, sys.executable)
+        self.stats.store(key1, self.workdir)
+        kwa = {**self.kwa, 'end-time': '-t 00:00:10.000'}
+        key2 = self.stats.make_key(kwa, sys.executable)
+        os.utime(os.path.join(self.stats.dirname, key1),
+                 (time.time() - 10, time.time() - 10))
+        self.stats.store(key2, self.workdir)
+        self.assertEqual(os.listdir(self.stats.dirname), [key2])
+        self.stats.clear()
+        self.assertFalse(os.path.exists(self.stats.dirname))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the probe_cache.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import sqlite3
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.probe_cache import ProbeCache
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestProbeCache(unittest.TestCase):
+    """Test case for the ProbeCache class."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.media = os.path.join(self.tmpdir.name, 'media.mkv')
+        with open(self.media, 'wb') as fout:
+            fout.write(b'0' * 100)
+        self.cache = ProbeCache(os.path.join(self.tmpdir.name, 'test.db'),
+                                maxsize=1000)
+
+    def tearDown(self):
+        """Method called after each test"""
+        if self.cache.conn is not None:
+            self.cache.conn.close()
+        self.tmpdir.cleanup()
+
+    def test_put_get(self):
+        key = self.cache.make_key(self.media, sys.executable, '-pretty')
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, '{"format": {}}')
+        self.assertEqual(self.cache.get(key), '{"format": {}}')
+
+    def test_key_identity(self):
+        key = self.cache.make_key(self.media, sys.executable)
+        self.assertNotEqual(key, self.cache.make_key(self.media,
+                                                     sys.executable,
+                                                     '-pretty'))
+        with open(self.media, 'ab') as fout:
+            fout.write(b'1')
+        self.assertNotEqual(key, self.cache.make_key(self.media,
+                                                     sys.executable))
+
+    def test_missing_file_or_binary(self):
+        self.assertIsNone(self.cache.make_key('/not/exists', sys.executable))
+        self.assertIsNone(self.cache.make_key(self.media, '/not/exists'))
+
+    def test_lru_eviction(self):
+        for num in range(5):
+            self.cache.put(f'key{num}', 'x' * 200)
+        self.cache.get('key0')  # recently used
+        self.cache.put('key5', 'x' * 200)
+        self.assertIsNotNone(self.cache.get('key0'))
+        self.assertIsNotNone(self.cache.get('key5'))
+        self.assertIsNone(self.cache.get('key1'))
+
+    def test_disabled(self):
+        cache = ProbeCache(os.path.join(self.tmpdir.name, 'none', 'test.db'))
+        cache.put('key', 'data')
+        self.assertIsNone(cache.get('key'))
+        self.assertTrue(cache.disabled)
+        self.assertIsInstance(cache.error, sqlite3.Error)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the progress_utils.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.progress_utils import (progress_blocks,
+                                                     progress_labels,
+                                                     )
+except ImportError as error:
+    sys.exit(error)
+
+OUTPUT = """frame=120
+fps=59.88
+stream_0_0_q=28.0
+bitrate= 512.3kbits/s
+total_size=262192
+out_time_us=4000000
+out_time_ms=4000000
+out_time=00:00:04.000000
+dup_frames=0
+drop_frames=0
+speed=1.99x
+progress=continue
+frame=240
+fps=N/A
+stream_0_0_q=-1.0
+bitrate=N/A
+total_size=N/A
+out_time_us=N/A
+out_time_ms=N/A
+out_time=N/A
+dup_frames=0
+drop_frames=0
+speed=N/A
+progress=end
+"""
+
+
+class TestProgressBlocks(unittest.TestCase):
+    """Test case for the progress_blocks function."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.records = list(progress_blocks(OUTPUT.splitlines(True)))
+
+    def test_blocks_count(self):
+        self.assertEqual(len(self.records), 2)
+
+    def test_record_values(self):
+        rec = self.records[0]
+        self.assertEqual(rec['time'], 4000)
+        self.assertEqual(rec['frame'], 120)
+        self.assertEqual(rec['fps'], 59.88)
+        self.assertEqual(rec['size'], 262192)
+        self.assertEqual(rec['bitrate'], '512.3kbits/s')
+        self.assertEqual(rec['speed'], 1.99)
+        self.assertFalse(rec['end'])
+
+    def test_record_not_available(self):
+        rec = self.records[1]
+        self.assertEqual(rec['time'], 0)
+        self.assertEqual(rec['frame'], 240)
+        self.assertIsNone(rec['fps'])
+        self.assertIsNone(rec['size'])
+        self.assertIsNone(rec['speed'])
+        self.assertTrue(rec['end'])
+
+    def test_incomplete_block(self):
+        self.assertEqual(list(progress_blocks(['frame=1\n', 'fps=2\n'])), [])
+
+
+class TestProgressLabels(unittest.TestCase):
+    """Test case for the progress_labels function."""
+
+    def test_labels(self):
+        rec = next(progress_blocks(OUTPUT.splitlines(True)))
+        self.assertEqual(progress_labels(rec),
+                         ['frame: 120', 'fps: 59.88', 'size: 256KiB',
+                          'bitrate: 512.3kbits/s', 'speed: 1.99x'])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the slideshow_utils.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import platform
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.slideshow_utils import (normalize_image,
+                                                      stream_preinput)
+except ImportError as error:
+    sys.exit(error)
+
+FAKE_FFMPEG = '''import sys
+args = sys.argv[1:]
+name = args[args.index('-i') + 1]
+if 'broken' in name:
+    sys.stderr.write(name + ': Invalid data found')
+    sys.exit(1)
+sys.stdout.write('P6 ' + ' '.join(args[args.index(name) + 1:]))
+'''
+
+
+class TestStreamPreinput(unittest.TestCase):
+    """Test case for the stream_preinput function."""
+
+    def test_no_loop(self):
+        self.assertEqual(stream_preinput('-framerate 1/5'),
+                         ('-framerate 1/5', False))
+        self.assertEqual(stream_preinput(''), ('', False))
+        self.assertEqual(stream_preinput('-loop 0 -framerate 2'),
+                         ('-framerate 2', False))
+
+    def test_loop(self):
+        self.assertEqual(stream_preinput('-loop 1 -framerate 1/5'),
+                         ('-framerate 1/5', True))
+        self.assertEqual(stream_preinput('-loop 1'),
+                         ('-framerate 1', True))
+
+
+@unittest.skipIf(platform.system() == 'Windows', 'needs a script shebang')
+class TestNormalizeImage(unittest.TestCase):
+    """Test case for the normalize_image function."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmp = tempfile.TemporaryDirectory()
+        ffmpeg = os.path.join(self.tmp.name, 'ffmpeg')
+        with open(ffmpeg, 'w', encoding='utf-8') as fake:
+            fake.write(f'#!{sys.executable}\n{FAKE_FFMPEG}')
+        os.chmod(ffmpeg, 0o755)
+        self.appdata = {'ffmpeg_cmd': ffmpeg,
+                        'ffmpeg_loglev': '-loglevel error',
+                        'encoding': 'utf-8',
+                        }
+
+    def tearDown(self):
+        """Method called after the test"""
+        self.tmp.cleanup()
+
+    def test_image(self):
+        data, error = normalize_image('my image.png', '-vf "scale=2:2"',
+                                      **self.appdata)
+        self.assertIsNone(error)
+        self.assertEqual(data, (b'P6 -vf scale=2:2 -frames:v 1 -f '
+                                b'image2pipe -c:v ppm -pix_fmt rgb24 '
+                                b'pipe:1'))
+
+    def test_broken_image(self):
+        data, error = normalize_image('broken.png', '', **self.appdata)
+        self.assertIsNone(data)
+        self.assertEqual(error, 'broken.png: Invalid data found')
+
+    def test_missing_ffmpeg(self):
+        self.appdata['ffmpeg_cmd'] = os.path.join(self.tmp.name, 'none')
+        data, error = normalize_image('image.png', '', **self.appdata)
+        self.assertIsNone(data)
+        self.assertIsInstance(error, OSError)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
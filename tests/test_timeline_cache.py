@@ -0,0 +1,122 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the timeline_cache.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import struct
+import io
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.timeline_cache import (TimelineCache,
+                                                  audio_peaks,
+                                                  peaks_rate,
+                                                  showinfo_times,
+                                                  thumbnail_at,
+                                                  )
+except ImportError as error:
+    sys.exit(error)
+
+SHOWINFO = """[Parsed_showinfo_3 @ 0x5581] config in time_base: 1/1000
+[Parsed_showinfo_3 @ 0x5581] n:   0 pts:      0 pts_time:0       duration:40
+[Parsed_showinfo_3 @ 0x5581] n:   1 pts:  10010 pts_time:10.01   duration:40
+[Parsed_showinfo_3 @ 0x5581] n:   2 pts:  20020 pts_time:20.02   duration:40
+"""
+
+
+def samples(values):
+    """Returns the s16le bytes of the given samples"""
+    return struct.pack(f'<{len(values)}h', *values)
+
+
+class TestStripHelpers(unittest.TestCase):
+    """Test case for the timeline strip helpers."""
+
+    def test_showinfo_times(self):
+        self.assertEqual(showinfo_times(SHOWINFO), [0.0, 10.01, 20.02])
+        mpegts = (SHOWINFO.replace('pts_time:0 ', 'pts_time:1.4 ')
+                  .replace('pts_time:10.01', 'pts_time:11.41')
+                  .replace('pts_time:20.02', 'pts_time:21.42'))
+        self.assertEqual(showinfo_times(mpegts), [0.0, 10.01, 20.02])
+        self.assertEqual(showinfo_times('no frames'), [])
+
+    def test_thumbnail_at(self):
+        times = [0.0, 10.01, 20.02]
+        self.assertEqual(thumbnail_at(times, 0), 0)
+        self.assertEqual(thumbnail_at(times, 15), 1)
+        self.assertEqual(thumbnail_at(times, 99), 2)
+        self.assertEqual(thumbnail_at([5.0], 1), 0)
+
+    def test_peaks_rate(self):
+        self.assertEqual(peaks_rate(3600000, npeaks=2048), 100)
+        self.assertEqual(peaks_rate(1000, npeaks=2048), 8000)
+        self.assertEqual(peaks_rate(60000, npeaks=2048), 274)
+
+    def test_audio_peaks(self):
+        data = samples([0, 16384, -32768, 0, 100, -200, 0, 0])
+        peaks = audio_peaks(io.BytesIO(data), 8, npeaks=4)
+        self.assertEqual(peaks, [0.5, 1.0, 200 / 32768, 0.0])
+
+    def test_audio_peaks_overflow(self):
+        data = samples([0, 0, 0, 0, 16384, 0])
+        peaks = audio_peaks(io.BytesIO(data), 4, npeaks=2)
+        self.assertEqual(peaks, [0.0, 0.5])
+
+
+class TestTimelineCache(unittest.TestCase):
+    """Test case for the TimelineCache class."""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = TimelineCache(os.path.join(self.tmpdir.name, 'tl'))
+        self.source = os.path.join(self.tmpdir.name, 'source.mkv')
+        with open(self.source, 'wb') as fout:
+            fout.write(b'0' * 100)
+        self.strip = {'times': [0.0, 2.5], 'width': 2, 'height': 1,
+                      'atlas': bytes(range(12)), 'peaks': [0.5, 0.25, 1.0]}
+
+    def tearDown(self):
+        """Method called after each test"""
+        self.tmpdir.cleanup()
+
+    def test_store_load(self):
+        key = self.cache.make_key(self.source)
+        self.assertIsNone(self.cache.load(key))
+        self.assertTrue(self.cache.store(key, self.strip))
+        self.assertEqual(self.cache.load(key), self.strip)
+
+    def test_changed_source(self):
+        key = self.cache.make_key(self.source)
+        with open(self.source, 'ab') as fout:
+            fout.write(b'1')
+        self.assertNotEqual(self.cache.make_key(self.source), key)
+        self.assertIsNone(self.cache.make_key(self.source + '.none'))
+
+    def test_truncated_file(self):
+        key = self.cache.make_key(self.source)
+        self.cache.store(key, self.strip)
+        path = os.path.join(self.cache.dirname, key + '.strip')
+        with open(path, 'r+b') as fout:
+            fout.truncate(os.path.getsize(path) - 1)
+        self.assertIsNone(self.cache.load(key))
+
+    def test_evict(self):
+        self.cache.maxsize = 0
+        key = self.cache.make_key(self.source)
+        self.cache.store(key, self.strip)
+        self.assertIsNone(self.cache.load(key))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,7 @@
 
 import sys
 import os.path
+import tempfile
 import unittest
 
 PATH = os.path.realpath(os.path.abspath(__file__))
@@ -15,6 +16,7 @@ try:
                                             to_bytes,
                                             time_to_integer,
                                             integer_to_time,
+                                            clockset,
                                             )
 except ImportError as error:
     sys.exit(error)
@@ -99,6 +101,23 @@ class TestTimeHuman(unittest.TestCase):
                                          mills=False), '02:30:50')
 
 
+class TestClockSet(unittest.TestCase):
+    """ Test case for the clockset function"""
+
+    def test_clock_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            fileclock = os.path.join(tmp, 'ColorEQ.clock')
+            self.assertEqual(clockset('00:01:10.50', fileclock),
+                             {'duration': '00:00:00', 'millis': 70000})
+            for clock in ('00:00:05', '00:00:05.250'):
+                with open(fileclock, "w", encoding='utf-8') as atime:
+                    atime.write(clock)
+                self.assertEqual(clockset('00:01:10.50', fileclock),
+                                 {'duration': clock, 'millis': 70000})
+            self.assertEqual(clockset('00:00:04.00', fileclock),
+                             {'duration': '00:00:04', 'millis': 4000})
+
+
 def main():
     unittest.main()
 
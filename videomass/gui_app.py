@@ -37,6 +37,7 @@ from videomass.vdms_sys.argparser import arguments
 from videomass.vdms_sys.configurator import DataSource
 from videomass.vdms_sys import app_const as appC
 from videomass.vdms_utils.utils import del_filecontents
+from videomass.vdms_io.make_filelog import close_logs
 from videomass.vdms_sys.external_package import importer_init_file
 
 # add translation macro to builtin similar to what gettext does
@@ -217,6 +218,8 @@ class Videomass(wx.App):
                     elif os.path.isdir:
                         rmtree(fcache)
 
+        close_logs()  # write pending log data and close the log files
+
         if self.appset['clearlogfiles']:
             logdir = self.appset['logdir']
             if os.path.exists(logdir):
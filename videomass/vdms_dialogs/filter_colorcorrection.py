@@ -30,7 +30,7 @@ from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_utils.utils import clockset
 from videomass.vdms_io.make_filelog import make_log_template
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.frame_server import FrameServer
 
 
 class ColorEQ(wx.Dialog):
@@ -45,10 +45,7 @@ class ColorEQ(wx.Dialog):
     OS = get.appset['ostype']
     LOGDIR = get.appset['logdir']
     TMPROOT = os.path.join(get.appset['cachedir'], 'tmp', 'ColorEQ')
-    TMPSRC = os.path.join(TMPROOT, 'tmpsrc')
-    TMPEDIT = os.path.join(TMPROOT, 'tmpedit')
-    os.makedirs(TMPSRC, mode=0o777, exist_ok=True)
-    os.makedirs(TMPEDIT, mode=0o777, exist_ok=True)
+    os.makedirs(TMPROOT, mode=0o777, exist_ok=True)
     # BACKGROUND = '#1b0413'
 
     def __init__(self, parent, colorset, iconreset, **kwa):
@@ -62,8 +59,6 @@ class ColorEQ(wx.Dialog):
         """
         self.filename = kwa['filename']
         name = os.path.splitext(os.path.basename(self.filename))[0]
-        self.framesrc = os.path.join(ColorEQ.TMPSRC, f'{name}.png')
-        self.frameedit = os.path.join(ColorEQ.TMPEDIT, f'{name}.png')
         self.fileclock = os.path.join(ColorEQ.TMPROOT, f'{name}.clock')
         # resizing values preserving aspect ratio for monitors
         thr = 150 if kwa['height'] > kwa['width'] else 270
@@ -87,6 +82,10 @@ class ColorEQ(wx.Dialog):
         self.panel_img2 = wx.Panel(self, wx.ID_ANY,
                                    size=(self.w_ratio, self.h_ratio))
         sizerpanels.Add(self.panel_img2, 0, wx.ALL | wx.CENTER, 5)
+        self.bmp_src = wx.StaticBitmap(self.panel_img1, wx.ID_ANY,
+                                       wx.Bitmap(self.w_ratio, self.h_ratio))
+        self.bmp_edit = wx.StaticBitmap(self.panel_img2, wx.ID_ANY,
+                                        wx.Bitmap(self.w_ratio, self.h_ratio))
         lab_imgsrc = wx.StaticText(self, wx.ID_ANY,
                                    label=_("Before"),
                                    style=wx.ST_NO_AUTORESIZE
@@ -255,53 +254,41 @@ class ColorEQ(wx.Dialog):
 
         if colorset:  # previus values
             self.set_default(colorset)
-        self.process(self.framesrc)
-        self.loader_initial_source()
+        logfile = make_log_template('generic_task.log',
+                                    ColorEQ.LOGDIR,
+                                    mode="w",
+                                    )
+        self.server = FrameServer(self.filename, self.w_ratio,
+                                  self.h_ratio, logfile)
+        self.server.request(time_to_integer(self.clock), self.on_frame_src)
         self.equalize_image(self.concat_filter())
     # -----------------------------------------------------------------------#
 
-    def process(self, pathtosave, equalizer=''):
+    def on_frame(self, frame, error, staticbmp):
         """
-        Generate a new frame at the clock position using
-        ffmpeg `eq` filter.
+        Displays the raw RGB `frame` served by the frame
+        server on the given `staticbmp` widget.
         """
-        logfile = make_log_template('generic_task.log',
-                                    ColorEQ.LOGDIR,
-                                    mode="w",
-                                    )
-        if not self.mills:
-            sseg = ''
-        else:
-            sseg = f'-ss {self.clock}'
-        eql = '' if not equalizer else f'-vf "{equalizer}"'
-        arg = (f'{sseg} -i "{self.filename}" -f image2 '
-               f'-update 1 -frames:v 1 {eql} "{pathtosave}"')
-        thread = FFmpegGenericTask(arg, 'ColorEQ', logfile)
-        thread.join()  # wait end thread
-        error = thread.status
         if error:
-            return error
-        return None
+            wx.MessageBox(f'{error}', _('Videomass - Error!'),
+                          wx.ICON_ERROR, self)
+            return
+        staticbmp.SetBitmap(wx.Bitmap.FromBuffer(self.w_ratio,
+                                                 self.h_ratio, frame))
     # -----------------------------------------------------------------------#
 
-    def loader_initial_source(self):
+    def on_frame_src(self, msec, frame, error):
         """
-        Loads initial StaticBitmaps on panels 1 (source).
+        Frame server callback, loads the frame on panel 1 (source).
         """
-        img = wx.Image(self.framesrc, wx.BITMAP_TYPE_ANY)
-        img = img.Scale(self.w_ratio, self.h_ratio, wx.IMAGE_QUALITY_NORMAL)
-        bitmap = img.ConvertToBitmap()
-        wx.StaticBitmap(self.panel_img1, wx.ID_ANY, bitmap)
+        self.on_frame(frame, error, self.bmp_src)
     # -----------------------------------------------------------------------#
 
-    def loader_initial_edit(self):
+    def on_frame_edit(self, msec, frame, error):
         """
-        Loads initial StaticBitmaps on panels 2 (edit)
+        Frame server callback, loads the frame on panel 2 (edit)
         """
-        img = wx.Image(self.frameedit, wx.BITMAP_TYPE_ANY)
-        img = img.Scale(self.w_ratio, self.h_ratio, wx.IMAGE_QUALITY_NORMAL)
-        bitmap = img.ConvertToBitmap()
-        wx.StaticBitmap(self.panel_img2, wx.ID_ANY, bitmap)
+        self.on_frame(frame, error, self.bmp_edit)
     # -----------------------------------------------------------------------#
 
     def set_default(self, colorset):
@@ -336,14 +323,13 @@ class ColorEQ(wx.Dialog):
 
     def equalize_image(self, equalizer=''):
         """
-        Sends the equalization values to the process
+        Sends the equalization values to the frame server
         """
-        error = self.process(self.frameedit, equalizer=equalizer)
-        if error:
-            wx.MessageBox(f'{error}', _('Videomass - Error!'),
-                          wx.ICON_ERROR, self)
-            return
-        self.loader_initial_edit()
+        self.server.request(time_to_integer(self.clock),
+                            self.on_frame_edit,
+                            vfilter=equalizer,
+                            tag='edit',
+                            )
     # -----------------------------------------------------------------------#
 
     def concat_filter(self):
@@ -377,20 +363,10 @@ class ColorEQ(wx.Dialog):
         Reloads all images frame at a given time clock point
         """
         seek = self.sld_time.GetValue()
-        self.clock = integer_to_time(seek, False)  # to 24-hour
-        error = self.process(self.framesrc)
-        if error:
-            wx.MessageBox(f'{error}', _('Videomass - Error!'),
-                          wx.ICON_ERROR, self)
-            return
-        self.loader_initial_source()
-
-        error = self.process(self.frameedit, self.concat_filter())
-        if error:
-            wx.MessageBox(f'{error}', _('Videomass - Error!'),
-                          wx.ICON_ERROR, self)
-            return
-        self.loader_initial_edit()
+        self.clock = integer_to_time(seek)  # to 24-hour with ms
+        self.txttime.SetLabel(self.clock)
+        self.server.request(seek, self.on_frame_src)
+        self.equalize_image(self.concat_filter())
 
         with open(self.fileclock, "w", encoding='utf-8') as atime:
             atime.write(self.clock)
@@ -461,6 +437,7 @@ class ColorEQ(wx.Dialog):
         Close this dialog without saving anything.
         Don't use self.Destroy() here, it is used by the caller
         """
+        self.server.stop()
         event.Skip()
     # -----------------------------------------------------------------------#
 
@@ -469,6 +446,7 @@ class ColorEQ(wx.Dialog):
         Before destroying the dialog getvalue() will be called.
         Don't use self.Destroy() here, it is used by the caller
         """
+        self.server.stop()
         event.Skip()
     # -----------------------------------------------------------------------#
 
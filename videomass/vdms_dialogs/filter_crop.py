@@ -29,23 +29,20 @@ import wx
 import wx.lib.statbmp
 import wx.lib.colourselect as csel
 from pubsub import pub
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.frame_server import FrameServer
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_utils.utils import clockset
 from videomass.vdms_io.make_filelog import make_log_template
 
 
-def make_bitmap(width, height, fname):
+def make_bitmap(width, height, frame):
     """
-    Resize the image to the given size and convert it to a
-    bitmap object.
+    Convert the given raw RGB `frame` buffer of `width` x `height`
+    pixels to a bitmap object, without intermediate wx.Image.
     Returns a wx.Bitmap object
     """
-    img = wx.Image(fname)
-    img = img.Scale(int(width), int(height), wx.IMAGE_QUALITY_NORMAL)
-    bmp = img.ConvertToBitmap()
-    return bmp
+    return wx.Bitmap.FromBuffer(int(width), int(height), frame)
 
 
 class Actor(wx.lib.statbmp.GenStaticBitmap):
@@ -178,8 +175,7 @@ class Crop(wx.Dialog):
     OS = get.appset['ostype']
     LOGDIR = get.appset['logdir']
     TMPROOT = os.path.join(get.appset['cachedir'], 'tmp', 'Crop')
-    TMPSRC = os.path.join(TMPROOT, 'tmpsrc')
-    os.makedirs(TMPSRC, mode=0o777, exist_ok=True)
+    os.makedirs(TMPROOT, mode=0o777, exist_ok=True)
     BACKGROUND = '#1b0413'
 
     def __init__(self, parent, *args, **kwa):
@@ -212,7 +208,6 @@ class Crop(wx.Dialog):
         self.w_scaled = round((self.width / self.height) * self.h_scaled)
         self.filename = kwa['filename']  # selected filename on file list
         name = os.path.splitext(os.path.basename(self.filename))[0]
-        self.frame = os.path.join(f'{Crop.TMPSRC}', f'{name}.png')  # image
         self.fileclock = os.path.join(Crop.TMPROOT, f'{name}.clock')
         tcheck = clockset(kwa['duration'], self.fileclock)
         self.clock = tcheck['duration']
@@ -312,14 +307,14 @@ class Crop(wx.Dialog):
         gridexit.Add(btn_ok, 0, wx.LEFT, 5)
         gridBtn.Add(gridexit, 0, wx.ALL | wx.ALIGN_RIGHT | wx.RIGHT, border=5)
         sizerBase.Add(gridBtn, 0, wx.EXPAND)
-        # instance to Actor widget
-        if os.path.exists(self.frame):
-            bmp = make_bitmap(self.w_scaled, self.h_scaled, self.frame)
-            self.bob = Actor(self.panelrect, bmp, 1, "")
-        else:  # make a temporary empty bitmap
-            bmp = wx.Bitmap(self.w_scaled, self.h_scaled)
-            self.bob = Actor(self.panelrect, bmp, 1, "")
-            self.make_frame_from_file(None)
+        # instance to Actor widget, with an empty bitmap until
+        # the first frame is served
+        bmp = wx.Bitmap(self.w_scaled, self.h_scaled)
+        self.bob = Actor(self.panelrect, bmp, 1, "")
+        logfile = make_log_template('generic_task.log', Crop.LOGDIR, mode="w")
+        self.server = FrameServer(self.filename, self.w_scaled,
+                                  self.h_scaled, logfile)
+        self.server.request(time_to_integer(self.clock), self.on_frame)
 
         self.SetSizer(sizerBase)
         sizerBase.Fit(self)
@@ -382,45 +377,45 @@ class Crop(wx.Dialog):
 
     def on_Seek(self, event):
         """
-        Slider event on seek time position.
+        Slider event on seek time position, shows a preview of
+        the frame while seeking.
         """
         seek = self.sld_time.GetValue()
         clock = integer_to_time(seek, False)  # to 24-hour
         self.txttime.SetLabel(clock)  # update StaticText
+        self.server.request(seek, self.on_frame)
         if not self.btn_load.IsEnabled():
             self.btn_load.Enable()
     # ------------------------------------------------------------------#
 
     def make_frame_from_file(self, event):
         """
-        This method is responsible for making available a
-        new frame from a given time position of a video file,
-        converting it into a bitmap object and displaying it
-        by the `bob` actor. Note, milliseconds must not be
-        greater than the max time nor less than the min time
-        (see the `seek` callback above)
+        This method is responsible for requesting a new frame
+        from a given time position of a video file to the frame
+        server and for saving the time position, the frame is
+        then displayed by the `on_frame` callback. Note,
+        milliseconds must not be greater than the max time nor
+        less than the min time (see the `seek` callback above)
+        """
+        seek = self.sld_time.GetValue()
+        self.clock = integer_to_time(seek)  # to 24-HH with ms
+        self.txttime.SetLabel(self.clock)
+        self.server.request(seek, self.on_frame)
+        with open(self.fileclock, "w", encoding='utf-8') as atime:
+            atime.write(self.clock)
+        self.btn_load.Disable()
+    # ------------------------------------------------------------------#
+
+    def on_frame(self, msec, frame, error):
+        """
+        Callback of the frame server, converts the served
+        frame into a bitmap object and displays it by the
+        `bob` actor.
         """
-        logfile = make_log_template('generic_task.log', Crop.LOGDIR, mode="w")
-        if not self.mills:
-            sseg = ''
-        else:
-            seek = self.sld_time.GetValue()
-            self.clock = integer_to_time(seek, False)  # to 24-HH
-            sseg = f'-ss {self.clock}'
-
-        arg = (f'{sseg} -i "{self.filename}" -f image2 '
-               f'-update 1 -frames:v 1 "{self.frame}"')
-        thread = FFmpegGenericTask(arg, 'Crop', logfile)
-        thread.join()  # wait end thread
-        error = thread.status
         if error:
             wx.MessageBox(f'{error}', _('Videomass - Error!'), wx.ICON_ERROR)
             return
-        if sseg:
-            with open(self.fileclock, "w", encoding='utf-8') as atime:
-                atime.write(self.clock)
-        self.btn_load.Disable()
-        bmp = make_bitmap(self.w_scaled, self.h_scaled, self.frame)
+        bmp = make_bitmap(self.w_scaled, self.h_scaled, frame)
         self.bob.setbitmap(bmp)
     # ------------------------------------------------------------------#
 
@@ -522,6 +517,7 @@ class Crop(wx.Dialog):
         """
         Close this dialog without saving anything
         """
+        self.server.stop()
         event.Skip()
     # ------------------------------------------------------------------#
 
@@ -529,6 +525,7 @@ class Crop(wx.Dialog):
         """
         Don't use self.Destroy() in this dialog
         """
+        self.server.stop()
         event.Skip()
     # ------------------------------------------------------------------#
 
@@ -24,12 +24,10 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
-import os
 from math import pi as pigreco
 import wx
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.frame_server import FrameServer
 from videomass.vdms_utils.utils import time_to_integer
-from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_io.make_filelog import make_log_template
 
 
@@ -41,9 +39,6 @@ class Transpose(wx.Dialog):
     get = wx.GetApp()
     appdata = get.appset
     LOGDIR = appdata['logdir']
-    TMPROOT = os.path.join(get.appset['cachedir'], 'tmp', 'Transpose')
-    TMPSRC = os.path.join(TMPROOT, 'tmpsrc')
-    os.makedirs(TMPSRC, mode=0o777, exist_ok=True)
     BACKGROUND = '#1b0413'
 
     def __init__(self, parent, *args, **kwa):
@@ -66,10 +61,9 @@ class Transpose(wx.Dialog):
         self.center = (int((self.w_ratio / 2)), int((self.h_ratio / 2)))
         self.transpose = {'degrees': ['', 0]}
         self.video = kwa['filename']
-        name = os.path.splitext(os.path.basename(self.video))[0]
-        self.frame = os.path.join(Transpose.TMPSRC, f'{name}.png')
         self.stbitmap = None
         self.bmp = None
+        self.server = None
         self.mills = time_to_integer(kwa['duration'].split('.')[0])
 
         wx.Dialog.__init__(self, parent, -1, style=wx.DEFAULT_DIALOG_STYLE)
@@ -148,48 +142,36 @@ class Transpose(wx.Dialog):
         self.Bind(wx.EVT_BUTTON, self.on_reset, btn_reset)
     # ------------------------------------------------------------------#
 
-    def process(self):
+    def image_loader(self):
         """
-        Generate a new frame. Note that the trim start point
-        on this process is set to the total length of the
-        movie divided by two.
+        Loads initial StaticBitmap on panel and requests the
+        frame to the frame server. Note that the frame position
+        is set to the total length of the movie divided by two.
         """
+        self.stbitmap = wx.StaticBitmap(self.panelimg, wx.ID_ANY,
+                                        wx.Bitmap(self.w_ratio, self.h_ratio))
+        self.panelimg.Layout()
         logfile = make_log_template('generic_task.log',
                                     Transpose.LOGDIR,
                                     mode="w",
                                     )
-        if not self.mills:
-            sseg = ''
-        else:
-            stime = integer_to_time(int(self.mills / 2), False)
-            sseg = f'-ss {stime}'
-        arg = (f'{sseg} -i "{self.video}" -f image2 '
-               f'-update 1 -frames:v 1 "{self.frame}"')
-        thread = FFmpegGenericTask(arg, 'Transpose', logfile)
-        thread.join()  # wait end thread
-        error = thread.status
-        if error:
-            return error
-        return None
-    # ------------------------------------------------------------------------#
+        self.server = FrameServer(self.video, self.w_ratio,
+                                  self.h_ratio, logfile)
+        self.server.request(int(self.mills / 2), self.on_frame)
+        self.on_reset(self)  # make default position
+    # ------------------------------------------------------------------#
 
-    def image_loader(self):
+    def on_frame(self, msec, frame, error):
         """
-        Loads initial StaticBitmap on panel
+        Callback of the frame server, displays the frame
+        at the current rotation.
         """
-        error = self.process()
         if error:
             wx.MessageBox(f'{error}', _('Videomass - Error!'),
                           wx.ICON_ERROR, self)
             return
-
-        bitmap = wx.Bitmap(self.frame)
-        img = bitmap.ConvertToImage()
-        img = img.Scale(self.w_ratio, self.h_ratio, wx.IMAGE_QUALITY_NORMAL)
-        self.bmp = img.ConvertToBitmap()
-        self.stbitmap = wx.StaticBitmap(self.panelimg, wx.ID_ANY, self.bmp)
-        self.panelimg.Layout()
-        self.on_reset(self)  # make default position
+        self.bmp = wx.Bitmap.FromBuffer(self.w_ratio, self.h_ratio, frame)
+        self.rotate90(0)
     # ------------------------------------------------------------------#
 
     def rotate90(self, degrees):
@@ -197,12 +179,11 @@ class Transpose(wx.Dialog):
         Rotates image to a specified `degrees`
         """
         self.current_angle += degrees
+        if not self.bmp:
+            return  # the frame will be rotated once served
         # neg. value rot. clockwise:
         val = float(self.current_angle * -pigreco / 180)
         image = self.bmp.ConvertToImage()
-        image = image.Scale(self.w_ratio, self.h_ratio,
-                            wx.IMAGE_QUALITY_NORMAL
-                            )
         image = image.Rotate(val, self.center)
         self.stbitmap.SetBitmap(wx.Bitmap(image))
         self.panelimg.Layout()
@@ -298,6 +279,7 @@ class Transpose(wx.Dialog):
         """
         Close this dialog without saving anything
         """
+        self.server.stop()
         event.Skip()
     # ------------------------------------------------------------------#
 
@@ -305,6 +287,7 @@ class Transpose(wx.Dialog):
         """
         Don't use self.Destroy() in this dialog
         """
+        self.server.stop()
         event.Skip()
     # ------------------------------------------------------------------#
 
@@ -181,6 +181,38 @@ class SetUp(wx.Dialog):
         sizerFFmpeg.Add(gridFFplay, 0, wx.EXPAND)
         gridFFplay.Add(self.txtctrl_ffplay, 1, wx.ALL, 5)
         gridFFplay.Add(self.btn_ffplay, 0, wx.RIGHT | wx.CENTER, 5)
+        sizerFFmpeg.Add((0, 20))
+        labjobs = wx.StaticText(tabTwo, wx.ID_ANY, _('Parallel processing'))
+        sizerFFmpeg.Add(labjobs, 0, wx.ALL | wx.EXPAND, 5)
+        msg = _("Process batch and queue items in parallel")
+        self.ckbx_jobs = wx.CheckBox(tabTwo, wx.ID_ANY, (msg))
+        sizerFFmpeg.Add(self.ckbx_jobs, 0, wx.LEFT, 5)
+        msg = _("Split single video encodings into segments encoded "
+                "in parallel")
+        self.ckbx_chunks = wx.CheckBox(tabTwo, wx.ID_ANY, (msg))
+        sizerFFmpeg.Add(self.ckbx_chunks, 0, wx.LEFT | wx.TOP, 5)
+        sizerjobs = wx.BoxSizer(wx.HORIZONTAL)
+        sizerFFmpeg.Add(sizerjobs, 0, wx.EXPAND)
+        msg = _("Max simultaneous jobs (0 = number of CPU cores):")
+        self.labmaxjobs = wx.StaticText(tabTwo, wx.ID_ANY, msg)
+        sizerjobs.Add(self.labmaxjobs, 0, wx.LEFT | wx.ALIGN_CENTER, 5)
+        self.spin_jobs = wx.SpinCtrl(tabTwo, wx.ID_ANY,
+                                     f"{self.appdata['max_parallel_jobs']}",
+                                     min=0, max=256, size=(-1, -1),
+                                     style=wx.TE_PROCESS_ENTER
+                                     )
+        sizerjobs.Add(self.spin_jobs, 0, wx.ALL, 5)
+        sizerprobe = wx.BoxSizer(wx.HORIZONTAL)
+        sizerFFmpeg.Add(sizerprobe, 0, wx.EXPAND)
+        msg = _("Files probed at once when adding files:")
+        labprobe = wx.StaticText(tabTwo, wx.ID_ANY, msg)
+        sizerprobe.Add(labprobe, 0, wx.LEFT | wx.ALIGN_CENTER, 5)
+        self.spin_probe = wx.SpinCtrl(tabTwo, wx.ID_ANY,
+                                      f"{self.appdata['ffprobe_workers']}",
+                                      min=1, max=64, size=(-1, -1),
+                                      style=wx.TE_PROCESS_ENTER
+                                      )
+        sizerprobe.Add(self.spin_probe, 0, wx.ALL, 5)
         tabTwo.SetSizer(sizerFFmpeg)
         notebook.AddPage(tabTwo, _("FFmpeg"))
 
@@ -545,6 +577,10 @@ class SetUp(wx.Dialog):
         self.Bind(wx.EVT_CHECKBOX, self.on_shutdown_after, self.ckbx_turnoff)
         self.Bind(wx.EVT_CHECKBOX, self.exit_warn, self.ckbx_exitconfirm)
         self.Bind(wx.EVT_CHECKBOX, self.clear_Cache, self.ckbx_cacheclr)
+        self.Bind(wx.EVT_CHECKBOX, self.on_parallel_jobs, self.ckbx_jobs)
+        self.Bind(wx.EVT_CHECKBOX, self.on_chunked_encoding, self.ckbx_chunks)
+        self.Bind(wx.EVT_SPINCTRL, self.on_max_jobs, self.spin_jobs)
+        self.Bind(wx.EVT_SPINCTRL, self.on_probe_workers, self.spin_probe)
         self.Bind(wx.EVT_CHECKBOX, self.clear_logs, self.ckbx_logclr)
         self.Bind(wx.EVT_TEXT, self.on_char_encoding, self.txtctrl_charenc)
         self.Bind(wx.EVT_BUTTON, self.on_help, btn_help)
@@ -596,6 +632,12 @@ class SetUp(wx.Dialog):
             self.txtctrl_trash.Disable()
             self.btn_trash.Disable()
 
+        self.ckbx_jobs.SetValue(self.settings['parallel_jobs'])
+        self.ckbx_chunks.SetValue(self.settings['chunked_encoding'])
+        if not (self.settings['parallel_jobs']
+                or self.settings['chunked_encoding']):
+            self.labmaxjobs.Disable(), self.spin_jobs.Disable()
+
         for strs in range(self.rdbFFplay.GetCount()):
             if (self.appdata['ffplay_loglev'].split()[1] in
                self.rdbFFplay.GetString(strs).split()[0]):
@@ -900,6 +942,39 @@ class SetUp(wx.Dialog):
                     self.settings['ffplay_cmd'] = getpath
     # ---------------------------------------------------------------------#
 
+    def on_parallel_jobs(self, event):
+        """
+        Enable/disable parallel processing of FFmpeg jobs
+        """
+        self.settings['parallel_jobs'] = self.ckbx_jobs.GetValue()
+        if self.ckbx_jobs.GetValue() or self.ckbx_chunks.GetValue():
+            self.labmaxjobs.Enable(), self.spin_jobs.Enable()
+        else:
+            self.labmaxjobs.Disable(), self.spin_jobs.Disable()
+    # --------------------------------------------------------------------#
+
+    def on_chunked_encoding(self, event):
+        """
+        Enable/disable the segment-parallel encoding of videos
+        """
+        self.settings['chunked_encoding'] = self.ckbx_chunks.GetValue()
+        self.on_parallel_jobs(None)
+    # --------------------------------------------------------------------#
+
+    def on_max_jobs(self, event):
+        """
+        Set the max number of parallel FFmpeg jobs
+        """
+        self.settings['max_parallel_jobs'] = self.spin_jobs.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_probe_workers(self, event):
+        """
+        Set the number of files probed at once
+        """
+        self.settings['ffprobe_workers'] = self.spin_probe.GetValue()
+    # --------------------------------------------------------------------#
+
     def on_ytdlp_pref(self, event):
         """
         set yt-dlp preferences
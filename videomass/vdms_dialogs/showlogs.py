@@ -27,6 +27,7 @@ This file is part of Videomass.
 import os
 import wx
 from pubsub import pub
+from videomass.vdms_io.make_filelog import flush_logs, close_logs
 
 
 class ShowLogs(wx.Dialog):
@@ -170,6 +171,7 @@ class ShowLogs(wx.Dialog):
                          | wx.CANCEL | wx.YES_NO, self) != wx.YES:
             return
 
+        close_logs(os.path.join(self.dirlog, name))
         with open(os.path.join(self.dirlog, name),
                   'w', encoding='utf-8') as log:
             log.write('')
@@ -185,6 +187,7 @@ class ShowLogs(wx.Dialog):
         sel = self.log_select.GetFocusedItem()
         selitem = sel if sel != -1 else 0
 
+        flush_logs()  # read the pending log data too
         self.logdata.clear()
         self.log_select.DeleteAllItems()
         index = 0
@@ -25,9 +25,11 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import os
 import wx
 import wx.adv
 from pubsub import pub
+from videomass.vdms_utils.log_buffer import LogBuffer
 
 
 class NormalTransientPopup(wx.PopupTransientWindow):
@@ -159,6 +161,98 @@ class PopupDialog(wx.Dialog):
         self.EndModal(1)
 
 
+class ProgressListDialog(wx.Dialog):
+    """
+    A modal dialog that shows the progress of a process working
+    on a list of items (e.g. files) in parallel, one row per item
+    with its own state, and an overall gauge.
+    The running `thread` must have the `stop` method, it sends
+    the state of each item by the "ITEM_PROGRESS_EVT" pubsub
+    message and the end of the process by the "RESULT_EVT"
+    message (See `VolumeDetectThread` class as example model).
+
+    Usage:
+            dlg = ProgressListDialog(parent, caption, items, thread)
+            dlg.ShowModal()
+            dlg.Destroy()
+    """
+    STATES = {'RUNNING': _('Running'),
+              'DONE': _('Done'),
+              'ERROR': _('Error'),
+              'STOP': _('Stopped'),
+              'SKIPPED': _('Skipped'),
+              }
+    FINAL = ('DONE', 'ERROR', 'STOP', 'SKIPPED')
+
+    def __init__(self, parent, caption, items, thread):
+        # Create a dialog
+        wx.Dialog.__init__(self, parent, -1, caption, size=(650, 350),
+                           style=wx.CAPTION | wx.RESIZE_BORDER)
+        self.thread = thread
+        self.finished = set()
+        boxv = wx.BoxSizer(wx.VERTICAL)
+        self.lctrl = wx.ListCtrl(self, wx.ID_ANY,
+                                 style=wx.LC_REPORT | wx.SUNKEN_BORDER,
+                                 )
+        self.lctrl.InsertColumn(0, _('File'), width=350)
+        self.lctrl.InsertColumn(1, _('State'), width=100)
+        self.lctrl.InsertColumn(2, _('Result'), width=180)
+        for index, item in enumerate(items):
+            self.lctrl.InsertItem(index, os.path.basename(item))
+            self.lctrl.SetItem(index, 1, _('Waiting'))
+        boxv.Add(self.lctrl, 1, wx.EXPAND | wx.ALL, 5)
+        self.gauge = wx.Gauge(self, wx.ID_ANY, range=max(1, len(items)))
+        boxv.Add(self.gauge, 0, wx.EXPAND | wx.ALL, 5)
+        gridbtn = wx.GridSizer(1, 1, 0, 0)
+        boxv.Add(gridbtn, flag=wx.ALIGN_RIGHT | wx.RIGHT, border=0)
+        self.button_stop = wx.Button(self, wx.ID_ANY, _("Stop"))
+        gridbtn.Add(self.button_stop, 1, wx.ALL, 5)
+        self.Bind(wx.EVT_BUTTON, self.on_stop, self.button_stop)
+
+        # Handle layout
+        self.SetSizer(boxv)
+        self.Layout()
+
+        pub.subscribe(self.update_item, "ITEM_PROGRESS_EVT")
+        pub.subscribe(self.getMessage, "RESULT_EVT")
+    # ----------------------------------------------------------#
+
+    def on_stop(self, event):
+        """
+        Call the thread stop method.
+        """
+        self.button_stop.Disable()
+        self.thread.stop()
+    # ----------------------------------------------------------#
+
+    def update_item(self, jobid, state, info):
+        """
+        Update the row of the item `jobid`, this method
+        is called using pub/sub protocol.
+        """
+        if jobid >= self.lctrl.GetItemCount():
+            return
+        self.lctrl.SetItem(jobid, 1, self.STATES.get(state, state))
+        self.lctrl.SetItem(jobid, 2, info)
+        if state == 'RUNNING' and not info:
+            self.lctrl.EnsureVisible(jobid)
+        if state in self.FINAL:
+            self.finished.add(jobid)
+            self.gauge.SetValue(len(self.finished))
+    # ----------------------------------------------------------#
+
+    def getMessage(self, status):
+        """
+        Process terminated, this method is called using
+        pub/sub protocol. Remember to call Destroy() after
+        ShowModal() in the caller (see `PopupDialog`).
+        """
+        pub.unsubscribe(self.update_item, "ITEM_PROGRESS_EVT")
+        pub.unsubscribe(self.getMessage, "RESULT_EVT")
+        self.EndModal(1)
+# ------------------------------------------------------------------------#
+
+
 class CountDownDlg(wx.Dialog):
     """
     This dialog notifies the user that something will happen
@@ -244,3 +338,142 @@ class CountDownDlg(wx.Dialog):
         self.msgtxt.SetLabel(self.message.format(self.timeout))
         if self.timeout <= 0:
             self.EndModal(wx.ID_OK)
+
+
+class LogConsole(wx.ListCtrl):
+    """
+    Virtual read-only console to display the output messages of
+    the running processes. The lines are kept in a fixed-capacity
+    ring buffer of (severity, text) records (see `LogBuffer`) and
+    only the visible rows are drawn, so that the memory usage and
+    the redrawing cost remain constant even on long processing.
+    Note that the full history is written to the log files only.
+
+    The `severity` of each record is a key of the `colorscheme`
+    dict which sets the text color of the line. The selected lines
+    can be copied to the clipboard with Ctrl+C.
+
+    Usage:
+        console = LogConsole(self, appdata['colorscheme'])
+        console.write('INFO', 'some text\n')
+        console.clear()
+    """
+    def __init__(self, parent, colorscheme, capacity=LogBuffer.CAPACITY):
+        """
+        colorscheme: dict of color strings, see configurator
+        capacity: max number of lines
+        """
+        self.buffer = LogBuffer(capacity)
+        self.longest = ''  # longest text line to set column width
+        self.pending = False  # True when a view update is scheduled
+        self.attrs = {}
+        wx.ListCtrl.__init__(self, parent, wx.ID_ANY,
+                             style=wx.LC_REPORT
+                             | wx.LC_VIRTUAL
+                             | wx.LC_NO_HEADER
+                             )
+        self.InsertColumn(0, '')
+        for key, color in colorscheme.items():
+            self.attrs[key] = wx.ItemAttr(wx.Colour(color),
+                                          wx.Colour(colorscheme['BACKGRD']),
+                                          self.GetFont())
+        self.SetBackgroundColour(colorscheme['BACKGRD'])
+
+        self.Bind(wx.EVT_SIZE, self.on_size)
+        self.Bind(wx.EVT_KEY_DOWN, self.on_key_down)
+    # ------------------------------------------------------------------#
+
+    def OnGetItemText(self, item, column):
+        """
+        Returns the text of the given line, called
+        for the visible rows only.
+        """
+        return self.buffer[item][1]
+    # ------------------------------------------------------------------#
+
+    def OnGetItemAttr(self, item):
+        """
+        Returns the color attribute of the given line
+        """
+        return self.attrs.get(self.buffer[item][0])
+    # ------------------------------------------------------------------#
+
+    def write(self, severity, text):
+        """
+        Append the given `text` string (which can contain
+        several lines) using the color of the given
+        `severity` key, like `wx.TextCtrl.AppendText`.
+        """
+        self.buffer.write(severity, text)
+        for line in text.split('\n'):
+            if len(line) > len(self.longest):
+                self.longest = line
+        if not self.pending:
+            self.pending = True
+            wx.CallAfter(self.update_view)
+    # ------------------------------------------------------------------#
+
+    def clear(self):
+        """
+        Delete all lines
+        """
+        self.buffer.clear()
+        self.longest = ''
+        self.SetItemCount(0)
+        self.set_column_width()
+    # ------------------------------------------------------------------#
+
+    def update_view(self):
+        """
+        Update the number of rows and redraw the visible ones.
+        The view follows the last line unless the user has
+        scrolled up.
+        """
+        self.pending = False
+        if not self:  # the console has been destroyed
+            return
+        count = len(self.buffer)
+        top, page = self.GetTopItem(), self.GetCountPerPage()
+        follow = top + page >= self.GetItemCount()
+        if count != self.GetItemCount():
+            self.SetItemCount(count)
+            self.set_column_width()
+        if count:
+            if follow:
+                self.EnsureVisible(count - 1)
+                top = self.GetTopItem()
+            self.RefreshItems(top, min(top + page, count - 1))
+    # ------------------------------------------------------------------#
+
+    def set_column_width(self):
+        """
+        Fit the column to the longest line or
+        to the window width.
+        """
+        width = self.GetTextExtent(self.longest)[0] + 20
+        self.SetColumnWidth(0, max(width, self.GetClientSize()[0]))
+    # ------------------------------------------------------------------#
+
+    def on_size(self, event):
+        """
+        Adjust the column width on resizing
+        """
+        self.set_column_width()
+        event.Skip()
+    # ------------------------------------------------------------------#
+
+    def on_key_down(self, event):
+        """
+        Copy the selected lines to the clipboard with Ctrl+C
+        """
+        if event.ControlDown() and event.GetKeyCode() == ord('C'):
+            lines = []
+            item = self.GetFirstSelected()
+            while item != -1:
+                lines.append(self.buffer[item][1])
+                item = self.GetNextSelected(item)
+            if lines and wx.TheClipboard.Open():
+                wx.TheClipboard.SetData(wx.TextDataObject('\n'.join(lines)))
+                wx.TheClipboard.Close()
+            return
+        event.Skip()
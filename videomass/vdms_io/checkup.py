@@ -80,22 +80,18 @@ def check_inout(file_sources, file_dest):
 # ------------------------------------------------------------------------#
 
 
-def check_files(file_sources,
-                dir_destin,
-                same_destin,
-                suffix,
-                extout,
-                outputnames
-                ):
+def output_pathnames(file_sources,
+                     dir_destin,
+                     same_destin,
+                     suffix,
+                     extout,
+                     outputnames
+                     ):
     """
     Build the full path filename for output files.
-    return ([file_sources], [file_dest])
-    None otherwise.
+    return [file_dest]
 
     """
-    if not file_sources:
-        return None
-
     file_dest = []  # output path names (not files)
 
     for path, fname in zip(file_sources, outputnames):
@@ -119,4 +115,27 @@ def check_files(file_sources,
                 pathname = os.path.join(dir_destin, f'{fname}.{extout}')
                 file_dest.append(pathname)
 
+    return file_dest
+# ------------------------------------------------------------------------#
+
+
+def check_files(file_sources,
+                dir_destin,
+                same_destin,
+                suffix,
+                extout,
+                outputnames
+                ):
+    """
+    Build the full path filename for output files.
+    return ([file_sources], [file_dest])
+    None otherwise.
+
+    """
+    if not file_sources:
+        return None
+
+    file_dest = output_pathnames(file_sources, dir_destin, same_destin,
+                                 suffix, extout, outputnames)
+
     return check_inout(file_sources, file_dest)
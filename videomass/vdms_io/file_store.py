@@ -0,0 +1,240 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: file_store.py
+Porpose: disk LRU store of the cache files
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Lock
+import tempfile
+import hashlib
+import shutil
+import json
+import time
+import os
+from videomass.vdms_io.probe_cache import binary_identity, file_identity
+
+
+class FileStore:
+    """
+    Directory of cache entries, each a file (or a directory
+    of files) named by its key followed by `suffix`. The
+    entries older than `maxage` seconds, if given, then the
+    least recently used ones exceeding `maxsize` total bytes
+    are removed. Entries are written atomically, so readers
+    never see a partial entry.
+
+    This is the base class of the cache files of Videomass,
+    which add the format of their entries, see `FrameCache`,
+    `TimelineCache` and `PassStats`.
+    """
+    MAXSIZE = 64 * 1024 * 1024  # default max bytes of stored entries
+
+    def __init__(self, dirname, suffix='', maxsize=MAXSIZE, maxage=None):
+        """
+        Attributes defined here:
+        self.dirname: directory of the entries
+        self.binaries: {cmd: identity} of the executables
+        self.total: total bytes of the entries, None if not
+                    yet known, so that the directory is scanned
+                    only when the limits could be exceeded
+        """
+        self.dirname = dirname
+        self.suffix = suffix
+        self.maxsize = maxsize
+        self.maxage = maxage
+        self.lock = Lock()
+        self.binaries = {}
+        self.total = None
+
+    def make_key(self, filename, *params, cmd=None):
+        """
+        Returns the key of an entry made from the media file
+        `filename` (see `file_identity`), optionally by the
+        executable `cmd` (see `binary_identity`), with the
+        given JSON serializable `params`. Returns None if the
+        file or the executable cannot be identified.
+        """
+        ident = file_identity(filename)
+        if ident is None:
+            return None
+        if cmd is not None:
+            if cmd not in self.binaries:
+                self.binaries[cmd] = binary_identity(cmd)
+            if self.binaries[cmd] is None:
+                return None
+            ident.append(self.binaries[cmd])
+        ident = json.dumps(ident + list(params))
+        return hashlib.sha256(ident.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        """
+        Returns the pathname of the entry of the given key
+        """
+        return os.path.join(self.dirname, key + self.suffix)
+
+    def touch(self, key):
+        """
+        Mark the entry of the given key as recently used.
+        Returns False if not found.
+        """
+        try:
+            os.utime(self.path(key))
+        except OSError:
+            return False
+        return True
+
+    def write(self, key, *chunks):
+        """
+        Write the given bytes-like `chunks` as the file entry
+        of the given key. Returns True if done.
+        """
+        try:
+            os.makedirs(self.dirname, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix='.tmp-', dir=self.dirname)
+        except OSError:
+            return False
+        try:
+            with os.fdopen(fd, 'wb') as fout:
+                for chunk in chunks:
+                    fout.write(chunk)
+            os.replace(tmp, self.path(key))
+        except OSError:
+            self.remove(tmp)
+            return False
+        self.added(sum(len(chunk) for chunk in chunks))
+        return True
+
+    def write_files(self, key, files):
+        """
+        Copy the given `files` into the directory entry of
+        the given key. Returns True if done, False on errors
+        or if the entry already exists.
+        """
+        try:
+            os.makedirs(self.dirname, exist_ok=True)
+            tmp = tempfile.mkdtemp(prefix='.tmp-', dir=self.dirname)
+        except OSError:
+            return False
+        try:
+            for name in files:
+                shutil.copy(name, tmp)
+            os.replace(tmp, self.path(key))
+        except OSError:
+            self.remove(tmp)
+            return False
+        self.added(sum(os.path.getsize(name) for name in files))
+        return True
+
+    def added(self, size):
+        """
+        Account for a new entry of `size` bytes, evicting
+        the old entries if the limits could be exceeded.
+        """
+        with self.lock:
+            if self.total is not None:
+                self.total += size
+            full = (self.total is None or self.total > self.maxsize
+                    or self.maxage is not None)
+        if full:
+            self.evict()
+
+    def entries(self):
+        """
+        Returns the list of (mtime, size, path) of the entries.
+        Raise: `OSError`
+        """
+        entries = []
+        for entry in os.scandir(self.dirname):
+            if (entry.name.endswith(self.suffix)
+                    and not entry.name.startswith('.')):
+                if entry.is_dir():
+                    size = sum(item.stat().st_size for item
+                               in os.scandir(entry.path) if item.is_file())
+                else:
+                    size = entry.stat().st_size
+                entries.append((entry.stat().st_mtime, size, entry.path))
+        return entries
+
+    def evict(self):
+        """
+        Remove the expired entries, then the least recently
+        used ones exceeding the max total size.
+        """
+        with self.lock:
+            try:
+                entries = self.entries()
+            except OSError:
+                return
+            total = sum(size for mtime, size, path in entries)
+            expired = time.time() - self.maxage if self.maxage else 0
+            for mtime, size, path in sorted(entries):
+                if mtime >= expired and total <= self.maxsize:
+                    break
+                if self.remove(path):
+                    total -= size
+            self.total = total
+
+    def remove(self, path):
+        """
+        Remove the given file or directory.
+        Returns True if done.
+        """
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except OSError:
+            return False
+        return True
+
+    def clear(self):
+        """
+        Delete all entries
+        """
+        with self.lock:
+            try:
+                entries = self.entries()
+            except OSError:
+                return
+            for mtime, size, path in entries:
+                self.remove(path)
+            self.total = None
+            try:
+                os.rmdir(self.dirname)  # if empty
+            except OSError:
+                pass
+# ------------------------------------------------------------------------#
+
+
+STORES = {}
+
+
+def shared_store(cls, dirname):
+    """
+    Returns the instance of the `FileStore` subclass `cls`
+    of the given `dirname` shared by all threads.
+    """
+    if (cls, dirname) not in STORES:
+        STORES.setdefault((cls, dirname), cls(dirname))
+    return STORES[(cls, dirname)]
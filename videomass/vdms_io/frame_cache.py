@@ -0,0 +1,152 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: frame_cache.py
+Porpose: memory and disk LRU cache of the decoded preview frames
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Lock
+import os
+from videomass.vdms_io.file_store import FileStore, shared_store
+
+
+class FrameCache(FileStore):
+    """
+    Least recently used cache of the raw RGB preview frames
+    shared by all the filter dialogs, kept in memory up to
+    `maxmemory` bytes and on disk up to `maxdisk` bytes, so
+    that opening the dialogs one after another on the same
+    file and time position does not decode the frame again.
+
+    The frames are put in memory only, which is fast enough
+    for the frames served while dragging a slider; only the
+    frames shown when a dialog is closed are then written to
+    disk (see `persist`).
+
+    Each frame is keyed by the SHA-256 hash of the file
+    identity, of the time position in milliseconds, of the
+    frame size and of the filter chain applied to it ('' for
+    the unfiltered frames), see `FileStore.make_key`.
+
+    Usage:
+        >>> cache = frame_cache(cachedir)
+        >>> key = cache.make_key(filename, msec, width, height)
+        >>> frame = cache.get(key)  # None if not found
+        >>> cache.put(key, frame)
+        >>> cache.persist(key)
+    """
+    MAXMEMORY = 64 * 1024 * 1024  # default max bytes of frames in memory
+    MAXDISK = 256 * 1024 * 1024  # default max bytes of frames on disk
+
+    def __init__(self, dirname, maxmemory=MAXMEMORY, maxdisk=MAXDISK):
+        """
+        Attributes defined here:
+        self.frames: {key: frame} in memory, least recently
+                     used first
+        self.size: total bytes of the frames in memory
+        """
+        FileStore.__init__(self, dirname, '.rgb', maxdisk)
+        self.maxmemory = maxmemory
+        self.memlock = Lock()
+        self.frames = {}
+        self.size = 0
+
+    def make_key(self, filename, msec, width, height, vfilter=''):
+        """
+        Returns the cache key of the frame of the given media
+        file at `msec` milliseconds of `width` x `height` pixels
+        filtered by `vfilter`, None if the file cannot be
+        identified.
+        """
+        return FileStore.make_key(self, filename, int(msec), int(width),
+                                  int(height), vfilter)
+
+    def remember(self, key, frame):
+        """
+        Keep the given frame in memory, removing the least
+        recently used frames exceeding the max memory size.
+        """
+        with self.memlock:
+            old = self.frames.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self.frames[key] = frame
+            self.size += len(frame)
+            while self.size > self.maxmemory:
+                self.size -= len(self.frames.pop(next(iter(self.frames))))
+
+    def get(self, key):
+        """
+        Returns the frame (bytes) stored with the given key,
+        None if not found.
+        """
+        with self.memlock:
+            frame = self.frames.pop(key, None)
+            if frame is not None:
+                self.frames[key] = frame  # most recently used
+                return frame
+        try:
+            with open(self.path(key), 'rb') as fin:
+                frame = fin.read()
+        except OSError:
+            return None
+        self.touch(key)
+        self.remember(key, frame)
+        return frame
+
+    def put(self, key, frame):
+        """
+        Keep a copy of the given frame (any bytes-like object)
+        in memory with the given key. Returns the stored bytes.
+        """
+        frame = bytes(frame)
+        self.remember(key, frame)
+        return frame
+
+    def persist(self, key):
+        """
+        Write the frame of the given key kept in memory to
+        disk, if not already there. Returns True if stored.
+        """
+        with self.memlock:
+            frame = self.frames.get(key)
+        if frame is None:
+            return False
+        return self.touch(key) or self.write(key, frame)
+
+    def clear(self):
+        """
+        Delete all frames from memory and disk
+        """
+        with self.memlock:
+            self.frames.clear()
+            self.size = 0
+        FileStore.clear(self)
+# ------------------------------------------------------------------------#
+
+
+def frame_cache(cachedir):
+    """
+    Returns the preview frames cache instance of the
+    given `cachedir` shared by all threads.
+    """
+    return shared_store(FrameCache, os.path.join(cachedir, 'frames'))
@@ -35,7 +35,9 @@ from videomass.vdms_threads.check_bin import (ff_conf,
                                               ff_topics,
                                               )
 from videomass.vdms_utils.utils import open_default_application
-from videomass.vdms_dialogs.widget_utils import PopupDialog
+from videomass.vdms_dialogs.widget_utils import (PopupDialog,
+                                                 ProgressListDialog,
+                                                 )
 from videomass.vdms_ytdlp.ydl_extractinfo import YdlExtractInfo
 
 
@@ -84,24 +86,27 @@ def stream_play(filepath, timeseq, param, autoexit):
 # -----------------------------------------------------------------------#
 
 
-def volume_detect_process(filelist, timeseq, audiomap, parent=None):
+def volume_detect_process(filelist, timeseq, audiomap, parent=None,
+                          durations=None):
     """
     Run thread to get audio peak level data
-    showing a pop-up message dialog.
+    showing the analysis progress of each file.
+    `durations` is an optional list of the files
+    duration in milliseconds.
     """
     if timeseq:
         splseq = timeseq.split()
         tseq = f'{splseq[0]} {splseq[1]}', f'{splseq[2]} {splseq[3]}'
     else:
         tseq = '', ''
-    thread = VolumeDetectThread(tseq, filelist, audiomap)
-    dlgload = PopupDialog(parent,
-                          _("Videomass - Loading..."),
-                          _("Wait....\nAudio peak analysis."),
-                          thread,
-                          )
+    thread = VolumeDetectThread(tseq, filelist, audiomap, durations)
+    dlgload = ProgressListDialog(parent,
+                                 _("Videomass - Audio peak analysis"),
+                                 filelist,
+                                 thread,
+                                 )
     dlgload.ShowModal()
-    # thread.join()
+    thread.join()
     data = thread.data
     dlgload.Destroy()
 
@@ -0,0 +1,211 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: job_journal.py
+Porpose: crash-safe write-ahead journal of the queue processing
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Lock
+import shutil
+import json
+import time
+import os
+from videomass.vdms_io.make_filelog import logwrite
+
+# states of the queue items
+PENDING, RUNNING, DONE, FAILED = 'pending', 'running', 'done', 'failed'
+
+
+class JobJournal:
+    """
+    Write-ahead journal of the state of the items of a queue
+    processing, so that an interrupted queue (e.g. the app or the
+    machine crashed) can be resumed from the items not completed.
+
+    The journal is a file of JSON lines: the first one holds the
+    whole queue, the others the state changes of its items, e.g.
+    {"id": 3, "state": "done", "time": 1700000000.0, "exit": 0}.
+    Each record is appended with a single write followed by a
+    fsync, so that a crash can only truncate the last line, which
+    is ignored by `read_journal`. When the processing ends (also
+    if stopped by the user) the journal is removed by `close`.
+
+    Usage:
+        >>> journal = JobJournal('/path/to/queue.journal', logfile)
+        >>> journal.start(queuelist)
+        >>> journal.mark(1, RUNNING)
+        >>> journal.mark(1, DONE, 0)
+        >>> journal.close()
+    """
+    def __init__(self, path, logfile=None):
+        """
+        Attributes defined here:
+        self.path: pathname of the journal file
+        self.logfile: the processing log file, if any
+        self.handle: file object opened in append mode, if any
+        self.failed: True once a journal error has been logged
+        """
+        self.path = path
+        self.logfile = logfile
+        self.lock = Lock()
+        self.handle = None
+        self.failed = False
+
+    def append(self, record):
+        """
+        Append the given record and flush it to the disk.
+        Journal errors never stop the processing, the first
+        one is written to the processing log.
+        """
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self.lock:
+            try:
+                if self.handle is None:
+                    self.handle = open(self.path, 'a', encoding='utf-8')
+                self.handle.write(line)
+                self.handle.flush()
+                os.fsync(self.handle.fileno())
+            except OSError as err:
+                if not self.failed and self.logfile:
+                    logwrite('', (f'[VIDEOMASS]: Queue journal error, the '
+                                  f'queue cannot be resumed if interrupted: '
+                                  f'{err}'), self.logfile)
+                self.failed = True
+
+    def start(self, items):
+        """
+        Start a new journal of the given list of queue items.
+        The item ids are their positions starting from 1.
+        """
+        self.close()
+        self.append({'queue': items, 'time': time.time()})
+
+    def mark(self, jobid, state, exitcode=None):
+        """
+        Record the new `state` of the item `jobid` and,
+        once ended, the exit status of its last process.
+        """
+        record = {'id': jobid, 'state': state, 'time': time.time()}
+        if exitcode is not None:
+            record['exit'] = exitcode
+        self.append(record)
+
+    def close(self):
+        """
+        Close and remove the journal
+        """
+        with self.lock:
+            if self.handle is not None:
+                self.handle.close()
+                self.handle = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+# ------------------------------------------------------------------------#
+
+
+def read_journal(path):
+    """
+    Read the journal at `path` left by an interrupted queue.
+    Returns None if not found or not valid, a dict otherwise:
+
+        'queue': (list) the queue items
+        'states': (dict) {id: last state record} of the items
+
+    Items with no records are pending.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as fin:
+            lines = fin.readlines()
+    except (OSError, UnicodeDecodeError):
+        return None
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:  # truncated by a crash
+            continue
+    if not records or not isinstance(records[0].get('queue'), list):
+        return None
+
+    states = {}
+    for rec in records[1:]:
+        if isinstance(rec, dict) and 'id' in rec:
+            states[rec['id']] = rec
+    return {'queue': records[0]['queue'], 'states': states}
+
+
+def remaining_items(journal):
+    """
+    Returns the list of the queue items of the given journal
+    (see `read_journal`) which were not successfully completed.
+    """
+    return [item for jobid, item in enumerate(journal['queue'], start=1)
+            if journal['states'].get(jobid, {}).get('state') != DONE]
+
+
+def interrupted_outputs(journal):
+    """
+    Returns the list of the output files of the items which
+    were running when the queue was interrupted, i.e. the
+    files possibly half-written.
+    """
+    outputs = []
+    for jobid, item in enumerate(journal['queue'], start=1):
+        if journal['states'].get(jobid, {}).get('state') == RUNNING:
+            outputs.extend(out['destination'] for out
+                           in item.get('outputs') or [item])
+    return outputs
+
+
+def cleanup_interrupted(journal, cachedir):
+    """
+    Remove the half-written output files of the interrupted
+    items and the temporary working directories of the jobs.
+    Returns the list of the removed files.
+    """
+    removed = []
+    for name in interrupted_outputs(journal):
+        try:
+            os.remove(name)
+            removed.append(name)
+        except OSError:
+            pass
+    tmpdir = os.path.join(cachedir, 'tmp')
+    if os.path.isdir(tmpdir):
+        for entry in os.listdir(tmpdir):
+            if entry.startswith(('job-', 'chunks-')):
+                shutil.rmtree(os.path.join(tmpdir, entry), ignore_errors=True)
+    return removed
+
+
+def resume_journal(journal, cachedir):
+    """
+    Prepare the resumption of the given interrupted queue
+    journal (see `read_journal`): the half-written outputs of
+    the items which were running are removed (see
+    `cleanup_interrupted`). Returns the list of the items
+    to process again (see `remaining_items`).
+    """
+    cleanup_interrupted(journal, cachedir)
+    return remaining_items(journal)
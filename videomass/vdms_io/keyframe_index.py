@@ -0,0 +1,187 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: keyframe_index.py
+Porpose: persistent index of the video key frames for seeking
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from threading import Thread, Lock
+import base64
+import os
+from videomass.vdms_io.probe_cache import ProbeCache
+from videomass.vdms_threads.ffprobe import ffprobe_keyframes
+
+
+class KeyframeIndex:
+    """
+    Sorted timestamps (in seconds, relative to the start time
+    of the file) of the key frames of a video stream, stored
+    compactly in an array of doubles.
+
+    Usage:
+        >>> index = KeyframeIndex([0.0, 2.002, 4.004])
+        >>> index.before(3.5)
+        2.002
+    """
+    def __init__(self, times=()):
+        """
+        self.times: array('d') of the key frames timestamps
+        """
+        self.times = array('d', sorted(times))
+
+    def __len__(self):
+        return len(self.times)
+
+    def before(self, sec):
+        """
+        Returns the timestamp of the nearest key frame at or
+        before `sec`, None if there is none.
+        """
+        idx = bisect_right(self.times, sec)
+        return self.times[idx - 1] if idx else None
+
+    def after(self, sec):
+        """
+        Returns the timestamp of the nearest key frame at or
+        after `sec`, None if there is none.
+        """
+        idx = bisect_left(self.times, sec)
+        return self.times[idx] if idx < len(self.times) else None
+
+    def to_text(self):
+        """
+        Returns the timestamps encoded as a base64 string
+        of the array bytes, for storing.
+        """
+        return base64.b64encode(self.times.tobytes()).decode('ascii')
+
+    @classmethod
+    def from_text(cls, text):
+        """
+        Returns a new index from a string of `to_text`
+        """
+        index = cls()
+        index.times.frombytes(base64.b64decode(text))
+        return index
+# ------------------------------------------------------------------------#
+
+
+class KeyframeIndexer:
+    """
+    Builds the key frames index of the video files (see
+    `ffprobe_keyframes`) once, keeping it in memory and in
+    a persistent database next to the ffprobe cache, keyed
+    by the file identity (see `ProbeCache.make_key`).
+
+    Do not instantiate this class directly, use the
+    `keyframe_indexer` function instead.
+
+    Usage:
+        >>> indexer = keyframe_indexer(cachedir)
+        >>> index = indexer.get(filename, ffprobe_cmd)  # blocking
+        >>> index = indexer.get(filename, ffprobe_cmd, wait=False)
+    """
+    MAXMEMORY = 32  # max indexes kept in memory
+
+    def __init__(self, dbpath):
+        """
+        self.indexes: {key: KeyframeIndex} recently used
+        self.building: keys of the indexes being built
+        """
+        self.cache = ProbeCache(dbpath, maxsize=32 * 1024 * 1024)
+        self.lock = Lock()
+        self.indexes = {}
+        self.building = set()
+
+    def remember(self, key, index):
+        """
+        Keep the given index in memory
+        """
+        with self.lock:
+            self.indexes.pop(key, None)
+            self.indexes[key] = index
+            while len(self.indexes) > KeyframeIndexer.MAXMEMORY:
+                del self.indexes[next(iter(self.indexes))]
+
+    def get(self, filename, cmd='ffprobe', txtenc='utf-8', wait=True):
+        """
+        Returns the `KeyframeIndex` of the given file, None if it
+        cannot be built (e.g. the file has no video). If `wait` is
+        False and the index is not yet available, returns None at
+        once, building it in background for the next calls. The
+        files which cannot be indexed are stored as an empty index,
+        so they are not probed again.
+        """
+        key = self.cache.make_key(filename, cmd, 'keyframes')
+        if key is None:
+            return None
+        with self.lock:
+            if key in self.indexes:
+                return self.indexes[key] or None
+        text = self.cache.get(key)
+        if text is not None:
+            index = KeyframeIndex.from_text(text)
+            self.remember(key, index)
+            return index or None
+        if wait:
+            return self.build(key, filename, cmd, txtenc)
+
+        with self.lock:
+            if key in self.building:
+                return None
+            self.building.add(key)
+        Thread(target=self.build, args=(key, filename, cmd, txtenc),
+               daemon=True).start()
+        return None
+
+    def build(self, key, filename, cmd, txtenc):
+        """
+        Build and store the index of the given file
+        """
+        try:
+            data, error = ffprobe_keyframes(filename, cmd, txtenc)
+            if isinstance(error, OSError):  # e.g. no ffprobe, not stored
+                return None
+            index = KeyframeIndex(() if error else data or ())
+            self.cache.put(key, index.to_text())
+            self.remember(key, index)
+            return index or None
+        finally:
+            with self.lock:
+                self.building.discard(key)
+# ------------------------------------------------------------------------#
+
+
+INDEXERS = {}
+
+
+def keyframe_indexer(cachedir):
+    """
+    Returns the key frames indexer instance of the given
+    `cachedir` shared by all threads.
+    """
+    dbpath = os.path.join(cachedir, 'keyframe_index.db')
+    if dbpath not in INDEXERS:
+        INDEXERS.setdefault(dbpath, KeyframeIndexer(dbpath))
+    return INDEXERS[dbpath]
@@ -0,0 +1,239 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: loudness_store.py
+Porpose: persistent store of the audio loudness/volume measurements
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+import os
+import re
+from videomass.vdms_io.probe_cache import ProbeCache
+
+# loudnorm measurement options and the corresponding summary keys
+# printed by the first pass, see `one_pass_ebu`
+MEASURED_OPTIONS = (('measured_I', 'Input Integrated:'),
+                    ('measured_LRA', 'Input LRA:'),
+                    ('measured_TP', 'Input True Peak:'),
+                    ('measured_thresh', 'Input Threshold:'),
+                    ('offset', 'Target Offset:'),
+                    )
+
+
+def loudnorm_measured(summary):
+    """
+    Given the loudnorm `summary` dict parsed from the output
+    of the first pass, returns the dict of the loudnorm
+    measurement options, e.g. {'measured_I': '-23.0', ...}.
+    Returns None if any value is missing.
+    """
+    measured = {opt: summary.get(key) for opt, key in MEASURED_OPTIONS}
+    return measured if valid_measured(measured) else None
+
+
+def valid_measured(measured):
+    """
+    Returns True if the given `measured` object is a dict
+    containing a numeric value of each loudnorm measurement
+    option, False otherwise.
+    """
+    if not isinstance(measured, dict):
+        return False
+    try:
+        for opt, _key in MEASURED_OPTIONS:
+            float(measured[opt])
+    except (KeyError, TypeError, ValueError):
+        return False
+    return True
+
+
+# loudnorm target options and their default values
+TARGETS = (('I', -24.0), ('TP', -2.0), ('LRA', 7.0))
+
+
+def loudnorm_targets(ebu):
+    """
+    Returns the dict of the target options (I, TP and LRA)
+    of the given loudnorm filter string `ebu`, e.g.
+    'loudnorm=I=-16:TP=-1.5:LRA=11' -> {'I': -16.0, ...}.
+    The default value is given to a missing option.
+    """
+    found = re.search(r'loudnorm=([^\s,;\[\]]*)', ebu)
+    opts = {}
+    for opt in found.group(1).split(':') if found else ():
+        if '=' in opt:
+            name, value = opt.split('=', 1)
+            opts[name.upper()] = value
+    targets = {}
+    for name, default in TARGETS:
+        try:
+            targets[name] = float(opts.get(name, default))
+        except ValueError:
+            targets[name] = default
+    return targets
+
+
+def loudnorm_retarget(measured, ebu):
+    """
+    Returns the stored loudnorm `measured` options for the
+    targets of the loudnorm filter `ebu`, None if not valid
+    or not usable for these targets.
+
+    The input values do not depend on the targets, while the
+    target offset does: it is kept if it was measured for the
+    same targets (the optional 'targets' key of the stored
+    values, see `loudnorm_targets`); if the targets can be
+    reached by a linear gain within the true peak and LRA
+    limits, loudnorm replaces the offset by that gain, so it
+    is given as 0; otherwise it can only be measured by the
+    first pass (which always runs in dynamic mode).
+    """
+    if not valid_measured(measured):
+        return None
+    targets = loudnorm_targets(ebu)
+    same = measured.get('targets') == targets
+    measured = {opt: measured[opt] for opt, _key in MEASURED_OPTIONS}
+    if same:
+        return measured
+    gain = targets['I'] - float(measured['measured_I'])
+    if (float(measured['measured_TP']) + gain <= targets['TP']
+            and float(measured['measured_LRA']) <= targets['LRA']):
+        measured['offset'] = '0.00'
+        return measured
+    return None
+
+
+def loudnorm_key_args(args):
+    """
+    Returns the given args of the first pass with the
+    target options of the loudnorm filter removed, since
+    the measured input values do not depend on them.
+    """
+    return re.sub(r'loudnorm=[^\s,;\[\]]*', 'loudnorm', args)
+
+
+def measured_filter(measured):
+    """
+    Returns the loudnorm options string of the
+    given `measured` dict for the second pass.
+    """
+    return ''.join(f':{opt}={measured[opt]}' for opt, _key
+                   in MEASURED_OPTIONS)
+
+
+class LoudnessStore:
+    """
+    Persistent store of the audio measurements made by FFmpeg
+    (e.g. the max/mean volume of the volumedetect filter and the
+    input values of the loudnorm filter), so that re-processing
+    the same files with different target levels does not need
+    to decode them again.
+
+    Each entry is keyed by the identity of the source file and of
+    the ffmpeg executable (see `ProbeCache.make_key`), by the kind
+    of measurement, by the time segment and by the arguments which
+    select the audio stream and the filters applied before the
+    measurement, but not by the loudnorm target levels (see
+    `loudnorm_args` and `loudnorm_retarget`).
+
+    Do not instantiate this class directly, use the
+    `loudness_store` function instead.
+
+    Usage:
+        >>> store = loudness_store(cachedir)
+        >>> store.get(filename, ffmpeg, 'volumedetect', tseq, '-map 0:a:0')
+        >>> store.put(filename, ffmpeg, 'volumedetect', tseq, '-map 0:a:0',
+                      {'max_volume': '-1.5 dB', 'mean_volume': '-20 dB'})
+    """
+    def __init__(self, dbpath):
+        """
+        The data are stored as JSON strings by a `ProbeCache`
+        instance, which provides the file identity and the
+        eviction of the least recently used entries.
+        """
+        self.cache = ProbeCache(dbpath, maxsize=8 * 1024 * 1024)
+
+    def make_key(self, filename, cmd, kind, timeseq, args):
+        """
+        Returns the key of the given measurement, None if
+        the file or the executable cannot be identified.
+        `timeseq` is a (start, end) pair of ffmpeg time args,
+        e.g. ('-ss 00:00:10.000', '-t 00:01:00.000').
+        """
+        params = json.dumps([kind, list(timeseq), ' '.join(args.split())])
+        return self.cache.make_key(filename, cmd, params)
+
+    def get(self, filename, cmd, kind, timeseq, args):
+        """
+        Returns the dict of the stored measurement values,
+        None if not found.
+        """
+        data = self.cache.get(self.make_key(filename, cmd, kind,
+                                            timeseq, args))
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def put(self, filename, cmd, kind, timeseq, args, values):
+        """
+        Store the given dict of measurement values.
+        """
+        self.cache.put(self.make_key(filename, cmd, kind, timeseq, args),
+                       json.dumps(values))
+
+    def clear(self):
+        """
+        Delete all measurements
+        """
+        self.cache.clear()
+# ------------------------------------------------------------------------#
+
+
+STORES = {}
+
+
+def loudnorm_args(kwa, cmd):
+    """
+    Returns the args of the `LoudnessStore` methods for the
+    loudnorm measurements of the given 'Two pass EBU' item,
+    None if its first pass cannot be skipped because it
+    also runs the vidstabdetect filter.
+    """
+    if 'vidstabdetect' in kwa['args'][0]:
+        return None
+    return (kwa['source'], cmd, 'loudnorm',
+            (kwa['start-time'], kwa['end-time']),
+            loudnorm_key_args(kwa['args'][0]))
+
+
+def loudness_store(cachedir):
+    """
+    Returns the measurements store instance of the given
+    `cachedir` shared by all threads.
+    """
+    dbpath = os.path.join(cachedir, 'loudness_store.db')
+    if dbpath not in STORES:
+        STORES.setdefault(dbpath, LoudnessStore(dbpath))
+    return STORES[dbpath]
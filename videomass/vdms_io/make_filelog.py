@@ -25,10 +25,218 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from threading import Thread, Lock, Event
+import atexit
 import time
 import os
 
 
+class LogSink:
+    """
+    Buffered writer of a single log file. The text written
+    by any thread is collected in memory and appended to the
+    log file by a background thread (see `LogFlusher`) when the
+    buffered data exceeds `FLUSH_SIZE` or at least every
+    `FLUSH_INTERVAL` seconds, using a single open file handle.
+    Call `flush` to force writing the buffered data, e.g. at
+    the end of a job or on errors.
+
+    Do not instantiate this class directly, use `log_sink`
+    function to get the instance shared by all threads instead.
+
+    """
+    FLUSH_SIZE = 65536  # max buffered chars before flushing
+    FLUSH_INTERVAL = 1.0  # max seconds between flushes
+
+    def __init__(self, logfile, txtenc="utf-8"):
+        """
+        Attributes defined here:
+        self.logfile: pathname of the log file
+        self.buffer: list of text strings not yet written
+        self.size: number of buffered chars
+        self.handle: file object opened in append mode, if any
+        self.error: the last write error, None if the last
+                    flush succeeded
+        """
+        self.logfile = logfile
+        self.txtenc = txtenc
+        self.lock = Lock()
+        self.buffer = []
+        self.size = 0
+        self.handle = None
+        self.error = None
+
+    def write(self, text):
+        """
+        Append the given text string to the buffer. Never
+        writes to disk by itself.
+        """
+        with self.lock:
+            self.buffer.append(text)
+            self.size += len(text)
+            full = self.size >= LogSink.FLUSH_SIZE
+        if full:
+            FLUSHER.wake()
+
+    def flush(self):
+        """
+        Write all buffered data to the log file. If writing
+        fails the data is kept buffered and written again on
+        the next flush, the error is never raised but noted
+        once into the log (see `self.error`).
+        Returns True if the data has been written.
+        """
+        with self.lock:
+            if not self.buffer:
+                return True
+            data = ''.join(self.buffer)
+            try:
+                if self.handle is None:
+                    self.handle = open(self.logfile, "a",
+                                       encoding=self.txtenc)
+                self.handle.write(data)
+                self.handle.flush()
+            except OSError as err:
+                self.close_handle()  # reopened on the next flush
+                if self.error is None:
+                    self.error = err
+                    note = f'\n[VIDEOMASS]: Log write error: {err}\n'
+                    self.buffer.append(note)
+                    self.size += len(note)
+                return False
+            self.buffer.clear()
+            self.size = 0
+            self.error = None
+            return True
+
+    def close_handle(self):
+        """
+        Close the file handle, if any, ignoring errors.
+        """
+        if self.handle is not None:
+            try:
+                self.handle.close()
+            except OSError:
+                pass
+            self.handle = None
+
+    def close(self):
+        """
+        Flush the buffered data and close the file handle.
+        """
+        self.flush()
+        with self.lock:
+            self.close_handle()
+# ------------------------------------------------------------------------#
+
+
+class LogFlusher(Thread):
+    """
+    Background daemon thread that periodically flushes
+    all the log sinks.
+    """
+    def __init__(self):
+        """
+        self.sinks: {logfile: LogSink} the shared instances
+        """
+        self.sinks = {}
+        self.lock = Lock()
+        self.event = Event()
+        Thread.__init__(self, daemon=True)
+
+    def run(self):
+        """
+        Flushing loop
+        """
+        while True:
+            self.event.wait(LogSink.FLUSH_INTERVAL)
+            self.event.clear()
+            self.flush_all()
+
+    def wake(self):
+        """
+        Wakes up the thread to flush immediately.
+        """
+        self.event.set()
+
+    def flush_all(self, close=False):
+        """
+        Flush (and optionally close) all the log sinks.
+        """
+        with self.lock:
+            sinks = list(self.sinks.values())
+        for sink in sinks:  # failures are retried on the next flush
+            if close:
+                sink.close()
+            else:
+                sink.flush()
+
+    def get_sink(self, logfile, txtenc):
+        """
+        Returns the shared LogSink instance of the given
+        logfile, creating it if it does not exist yet.
+        """
+        key = os.path.abspath(logfile)
+        with self.lock:
+            if key not in self.sinks:
+                self.sinks[key] = LogSink(logfile, txtenc)
+                if not self.is_alive():
+                    self.start()
+            return self.sinks[key]
+
+    def pop_sink(self, logfile):
+        """
+        Remove the LogSink of the given logfile, if any
+        """
+        with self.lock:
+            return self.sinks.pop(os.path.abspath(logfile), None)
+# ------------------------------------------------------------------------#
+
+
+FLUSHER = LogFlusher()
+
+
+def log_sink(logfile, txtenc="utf-8"):
+    """
+    Returns the buffered writer (see `LogSink`) of the given
+    `logfile` shared by all threads.
+
+    Usage:
+        >>> log_sink('/path/to/file.log').write('some text')
+        >>> flush_logs('/path/to/file.log')  # at the end of job
+    """
+    return FLUSHER.get_sink(logfile, txtenc)
+
+
+def flush_logs(logfile=None):
+    """
+    Force writing the buffered data of the given `logfile`,
+    or of all log files if `logfile` is None. Write errors
+    are not raised: the data is kept buffered (see `LogSink`).
+    """
+    if logfile is None:
+        FLUSHER.flush_all()
+    else:
+        log_sink(logfile).flush()
+
+
+def close_logs(logfile=None):
+    """
+    Flush and close the file handle of the given `logfile`,
+    or of all log files if `logfile` is None. This must be
+    called before truncating, deleting or rewriting a log file.
+    """
+    if logfile is None:
+        FLUSHER.flush_all(close=True)
+    else:
+        sink = FLUSHER.pop_sink(logfile)
+        if sink is not None:
+            sink.close()
+
+
+atexit.register(close_logs)
+
+
 def logwrite(cmd, stderr, logfile, txtenc="utf-8"):
     """
     This function writes status messages
@@ -41,8 +249,7 @@ def logwrite(cmd, stderr, logfile, txtenc="utf-8"):
     else:
         apnd = f"{sep}{cmd}\n\n"
 
-    with open(logfile, "a", encoding=txtenc) as log:
-        log.write(apnd)
+    log_sink(logfile, txtenc).write(apnd)
 
 
 def make_log_template(logname, logdir, mode="a", txtenc="utf-8"):
@@ -58,6 +265,7 @@ def make_log_template(logname, logdir, mode="a", txtenc="utf-8"):
     """
     current_date = time.strftime("%c")  # date/time
     logfile = os.path.join(logdir, logname)
+    close_logs(logfile)  # write pending data before (re)writing
 
     with open(logfile, mode, encoding=txtenc) as log:
         log.write(f"""
@@ -0,0 +1,129 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: pass_stats.py
+Porpose: persistent cache of the FFmpeg two-pass statistics files
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from fnmatch import fnmatch
+import shutil
+import os
+from videomass.vdms_io.file_store import FileStore, shared_store
+
+# names of the statistics files written by the first pass in the
+# working directory: libx264, libvpx, libaom and libsvtav1 use the
+# ffmpeg `-passlogfile` default prefix, libx265 its own `stats`
+STATS_PATTERNS = ('ffmpeg2pass-*.log*', 'x265_2pass.log*')
+
+
+def stats_files(dirname, since=0):
+    """
+    Returns the list of the pathnames of the statistics files
+    in `dirname` modified since the `since` timestamp.
+    """
+    try:
+        entries = list(os.scandir(dirname))
+    except OSError:
+        return []
+    return [entry.path for entry in entries if entry.is_file()
+            and any(fnmatch(entry.name, pat) for pat in STATS_PATTERNS)
+            and entry.stat().st_mtime >= since]
+
+
+class PassStats(FileStore):
+    """
+    Content-addressed cache of the statistics files written by
+    the first pass of the two-pass encodings, so that encoding
+    again the same source with the same first pass arguments
+    (e.g. for other deliverables which only differ in the second
+    pass) can go straight to the second pass.
+
+    Each entry is a subdirectory named by the SHA-256 hash of the
+    identity of the source file and of the ffmpeg executable (see
+    `FileStore.make_key`), of the time segment and of the first
+    pass arguments with normalized white spaces. Entries older than
+    `maxage` seconds are removed, then the least recently used ones
+    until the total size is lower than `maxsize` bytes.
+
+    Usage:
+        >>> stats = pass_stats(cachedir)
+        >>> key = stats.make_key(kwa, ffmpeg)
+        >>> stats.restore(key, workdir)  # True if found
+        >>> stats.store(key, workdir, started)
+    """
+    MAXSIZE = 512 * 1024 * 1024  # default max bytes of stored files
+    MAXAGE = 30 * 24 * 3600  # default max age of the entries in seconds
+
+    def __init__(self, dirname, maxsize=MAXSIZE, maxage=MAXAGE):
+        """
+        See `FileStore`
+        """
+        FileStore.__init__(self, dirname, '', maxsize, maxage)
+
+    def make_key(self, kwa, cmd):
+        """
+        Returns the cache key of the first pass of the given
+        'Two pass' item for the executable `cmd`, None if the
+        source file or the executable cannot be identified.
+        """
+        args = [' '.join(kwa.get(opt, '').split()) for opt in
+                ('pre-input-1', 'start-time', 'end-time')]
+        args.append(' '.join(kwa['args'][0].split()))
+        return FileStore.make_key(self, kwa['source'], args, cmd=cmd)
+
+    def restore(self, key, workdir):
+        """
+        Copy the statistics files of the given key to `workdir`.
+        Returns True if done, False if not found or on error.
+        """
+        entry = self.path(key)
+        try:
+            names = os.listdir(entry)
+            if not names:
+                return False
+            for name in names:
+                shutil.copyfile(os.path.join(entry, name),
+                                os.path.join(workdir, name))
+            os.utime(entry)  # most recently used
+        except OSError:
+            return False
+        return True
+
+    def store(self, key, workdir, since=0):
+        """
+        Store the statistics files written in `workdir` since
+        the `since` timestamp (i.e. the start of the first pass)
+        with the given key. Returns True if done.
+        """
+        files = stats_files(workdir, since)
+        if not files:
+            return False
+        return self.write_files(key, files)
+# ------------------------------------------------------------------------#
+
+
+def pass_stats(cachedir):
+    """
+    Returns the two-pass statistics cache instance of
+    the given `cachedir` shared by all threads.
+    """
+    return shared_store(PassStats, os.path.join(cachedir, 'pass_stats'))
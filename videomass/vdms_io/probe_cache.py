@@ -0,0 +1,243 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: probe_cache.py
+Porpose: persistent cache of the ffprobe results
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Lock
+from shutil import which
+import sqlite3
+import json
+import time
+import os
+
+
+def binary_identity(cmd):
+    """
+    Returns a string which identifies the given executable
+    (pathname, size and modification time), so that the results
+    of an updated or different binary are not mixed up.
+    Returns None if the executable cannot be found.
+    """
+    path = which(cmd) or cmd
+    try:
+        path = os.path.realpath(path)
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f'{path}:{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def file_identity(filename):
+    """
+    Returns a list which identifies the given file (absolute
+    path, size and modification time in nanoseconds), so that
+    the results of a modified file are not mixed up. Returns
+    None if the file cannot be found.
+    """
+    try:
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return [path, stat.st_size, stat.st_mtime_ns]
+
+
+class ProbeCache:
+    """
+    Persistent key/value store of the media data results
+    (e.g. the ffprobe JSON output) in a SQLite database. Each entry
+    is keyed by the identity of the source file (absolute path,
+    size and modification time in nanoseconds), by the identity
+    of the program that produced it and by its arguments, so that
+    a modified file or an updated program automatically miss the
+    cache.
+
+    The least recently used entries are evicted when the total
+    size of the stored data exceeds `maxsize` bytes. Any database
+    error simply disables the cache for the current session.
+
+    Do not instantiate this class directly to access the ffprobe
+    cache, use the `probe_cache` function instead.
+
+    Usage:
+        >>> cache = ProbeCache('/path/to/probe_cache.db')
+        >>> key = cache.make_key('/path/to/file.mkv', 'ffprobe', args)
+        >>> data = cache.get(key)  # None if not found
+        >>> cache.put(key, jsonstring)
+    """
+    MAXSIZE = 64 * 1024 * 1024  # default max bytes of stored data
+
+    def __init__(self, dbpath, maxsize=MAXSIZE):
+        """
+        Attributes defined here:
+        self.dbpath: pathname of the database file
+        self.conn: sqlite3 connection, opened on first use
+        self.error: the database error which disabled the cache
+        self.binaries: {cmd: identity} of the executables
+        """
+        self.dbpath = dbpath
+        self.maxsize = maxsize
+        self.lock = Lock()
+        self.conn = None
+        self.disabled = False
+        self.error = None
+        self.binaries = {}
+
+    def connect(self):
+        """
+        Open the database and create the table if needed.
+        Returns the connection, None if the cache is disabled.
+        """
+        if self.conn is None and not self.disabled:
+            try:
+                self.conn = sqlite3.connect(self.dbpath,
+                                            check_same_thread=False)
+                self.conn.execute('CREATE TABLE IF NOT EXISTS cache '
+                                  '(key TEXT PRIMARY KEY, data TEXT, '
+                                  'size INTEGER, atime REAL)')
+                self.conn.execute('CREATE INDEX IF NOT EXISTS atime_idx '
+                                  'ON cache (atime)')
+                self.conn.commit()
+            except sqlite3.Error as err:
+                self.disable(err)
+        return self.conn
+
+    def disable(self, err):
+        """
+        Disable the cache on database errors, keeping the
+        error in `self.error`.
+        """
+        self.error = err
+        self.disabled = True
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def make_key(self, filename, cmd, args=''):
+        """
+        Returns the cache key of the given media `filename`
+        for the given executable `cmd` and its `args` string.
+        Returns None if the file or the executable cannot be
+        identified, i.e. the result must not be cached.
+        """
+        if cmd not in self.binaries:
+            self.binaries[cmd] = binary_identity(cmd)
+        if self.binaries[cmd] is None:
+            return None
+        ident = file_identity(filename)
+        if ident is None:
+            return None
+        return json.dumps(ident + [self.binaries[cmd], args])
+
+    def get(self, key):
+        """
+        Returns the data string stored with the given key,
+        None if not found. Marks the entry as recently used.
+        """
+        if key is None:
+            return None
+        with self.lock:
+            conn = self.connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute('SELECT data FROM cache WHERE key=?',
+                                   (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute('UPDATE cache SET atime=? WHERE key=?',
+                             (time.time(), key))
+                conn.commit()
+            except sqlite3.Error as err:
+                self.disable(err)
+                return None
+            return row[0]
+
+    def put(self, key, data):
+        """
+        Store the given data string with the given key,
+        then evicts the least recently used entries if
+        the size limit is exceeded.
+        """
+        if key is None:
+            return
+        with self.lock:
+            conn = self.connect()
+            if conn is None:
+                return
+            try:
+                conn.execute('INSERT OR REPLACE INTO cache '
+                             'VALUES (?, ?, ?, ?)',
+                             (key, data, len(data), time.time()))
+                total = conn.execute('SELECT TOTAL(size) '
+                                     'FROM cache').fetchone()[0]
+                if total > self.maxsize:
+                    self.evict(conn, total)
+                conn.commit()
+            except sqlite3.Error as err:
+                self.disable(err)
+
+    def evict(self, conn, total):
+        """
+        Delete the least recently used entries until the
+        total size is below 3/4 of `maxsize`.
+        """
+        rows = conn.execute('SELECT key, size FROM cache '
+                            'ORDER BY atime').fetchall()
+        target = self.maxsize * 3 // 4
+        oldest = []
+        for key, size in rows:
+            if total <= target:
+                break
+            oldest.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM cache WHERE key=?', oldest)
+
+    def clear(self):
+        """
+        Delete all entries
+        """
+        with self.lock:
+            conn = self.connect()
+            if conn is not None:
+                try:
+                    conn.execute('DELETE FROM cache')
+                    conn.commit()
+                except sqlite3.Error as err:
+                    self.disable(err)
+# ------------------------------------------------------------------------#
+
+
+CACHES = {}
+
+
+def probe_cache(cachedir):
+    """
+    Returns the ffprobe cache instance of the given
+    `cachedir` shared by all threads.
+    """
+    dbpath = os.path.join(cachedir, 'probe_cache.db')
+    if dbpath not in CACHES:
+        CACHES.setdefault(dbpath, ProbeCache(dbpath))
+    return CACHES[dbpath]
@@ -0,0 +1,198 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: timeline_cache.py
+Porpose: on-disk cache of the thumbnails strip and of the audio
+         peaks drawn by the timeline
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from array import array
+from bisect import bisect_right
+import struct
+import json
+import sys
+import re
+import os
+from videomass.vdms_io.file_store import FileStore, shared_store
+
+THUMB_WIDTH = 64  # width of the thumbnails in pixels
+THUMB_HEIGHT = 36  # height of the thumbnails in pixels
+NTHUMBS = 48  # max number of thumbnails of a strip
+NPEAKS = 2048  # number of audio peaks of a strip
+PEAKS_RATE = 8000  # max sample rate for the audio peaks
+STRIP_FORMAT = 2  # changed when the strips are made differently
+
+
+def peaks_rate(duration, npeaks=NPEAKS, maxrate=PEAKS_RATE):
+    """
+    Returns the audio sample rate to compute `npeaks` peaks
+    over a `duration` in milliseconds, so that each peak is
+    taken over at least 8 samples.
+    """
+    rate = -(-npeaks * 8 * 1000 // max(duration, 1))  # round up
+    return max(100, min(maxrate, rate))
+
+
+def audio_peaks(stream, nsamples, npeaks=NPEAKS):
+    """
+    Reads the mono signed 16-bit little-endian samples from the
+    binary `stream` and returns a list of `npeaks` peak values
+    (0.0 to 1.0), each the max absolute amplitude of the samples
+    of a slice of the expected `nsamples` samples. Samples
+    beyond `nsamples` are added to the last peak.
+    """
+    peaks = [0.0] * npeaks
+    nsamples = max(nsamples, 1)
+    pos, rest = 0, b''
+    while True:
+        data = stream.read(65536)
+        if not data:
+            break
+        data = rest + data
+        cut = len(data) - len(data) % 2
+        rest = data[cut:]
+        samples = array('h')
+        samples.frombytes(data[:cut])
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        start = 0
+        while start < len(samples):
+            num = min((pos + start) * npeaks // nsamples, npeaks - 1)
+            if num < npeaks - 1:
+                end = -(-(num + 1) * nsamples // npeaks)  # round up
+                stop = min(len(samples), end - pos)
+            else:
+                stop = len(samples)
+            chunk = samples[start:stop]
+            peak = max(max(chunk), -min(chunk)) / 32768
+            peaks[num] = max(peaks[num], peak)
+            start = stop
+        pos += len(samples)
+    return peaks
+
+
+def showinfo_times(text):
+    """
+    Returns the list of the `pts_time` values (in seconds) of
+    the frames logged by the FFmpeg `showinfo` filter in the
+    given `text`, relative to the first frame, since they may
+    start from the start time of the file (e.g. MPEG-TS).
+    """
+    times = [float(pts) for pts in
+             re.findall(r'Parsed_showinfo.*?pts_time:\s*(-?[\d.]+)', text)]
+    return [round(pts - times[0], 6) for pts in times]
+
+
+def thumbnail_at(times, sec):
+    """
+    Returns the index of the thumbnail shown at `sec` seconds
+    given the sorted `times` of the thumbnails, i.e. the last
+    one at or before `sec`, or the first one.
+    """
+    return max(bisect_right(times, sec) - 1, 0)
+
+
+class TimelineCache(FileStore):
+    """
+    On-disk cache of the timeline strips of the media files,
+    each stored once in a compact file named by the SHA-256
+    hash of the file identity (see `FileStore.make_key`),
+    holding a JSON header line with the times of the thumbnails,
+    the thumbnails atlas (raw RGB thumbnails of `THUMB_WIDTH` x
+    `THUMB_HEIGHT` pixels, one after the other) and the audio
+    peaks as float16 values. The least recently used strips
+    exceeding `maxsize` total bytes are removed.
+
+    A strip is a dict with the following keys:
+
+        'times': (list) times in seconds of the thumbnails
+        'width', 'height': (int) size of the thumbnails
+        'atlas': (bytes) raw RGB data of the thumbnails
+        'peaks': (list) audio peaks (0.0 to 1.0), may be empty
+
+    Usage:
+        >>> cache = timeline_cache(cachedir)
+        >>> key = cache.make_key(filename)
+        >>> strip = cache.load(key)  # None if not stored
+        >>> cache.store(key, strip)
+    """
+    MAXSIZE = 64 * 1024 * 1024  # default max bytes of stored strips
+
+    def __init__(self, dirname, maxsize=MAXSIZE):
+        """
+        See `FileStore`
+        """
+        FileStore.__init__(self, dirname, '.strip', maxsize)
+
+    def make_key(self, filename):
+        """
+        Returns the cache key of the given media file, None
+        if the file cannot be identified.
+        """
+        return FileStore.make_key(self, filename, THUMB_WIDTH, THUMB_HEIGHT,
+                                  NTHUMBS, NPEAKS, STRIP_FORMAT)
+
+    def load(self, key):
+        """
+        Returns the strip stored with the given key, None if
+        not found or unreadable.
+        """
+        try:
+            with open(self.path(key), 'rb') as fin:
+                head = json.loads(fin.readline())
+                size = len(head['times']) * head['width'] * head['height'] * 3
+                atlas = fin.read(size)
+                peaks = fin.read(head['npeaks'] * 2)
+            os.utime(self.path(key))  # most recently used
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if len(atlas) != size or len(peaks) != head['npeaks'] * 2:
+            return None
+        return {'times': head['times'],
+                'width': head['width'],
+                'height': head['height'],
+                'atlas': atlas,
+                'peaks': list(struct.unpack(f"<{head['npeaks']}e", peaks)),
+                }
+
+    def store(self, key, strip):
+        """
+        Store the given strip with the given key.
+        Returns True if done.
+        """
+        head = {'times': strip['times'],
+                'width': strip['width'],
+                'height': strip['height'],
+                'npeaks': len(strip['peaks']),
+                }
+        return self.write(key, json.dumps(head).encode('utf-8') + b'\n',
+                          strip['atlas'],
+                          struct.pack(f"<{head['npeaks']}e", *strip['peaks']))
+# ------------------------------------------------------------------------#
+
+
+def timeline_cache(cachedir):
+    """
+    Returns the timeline strips cache instance of the
+    given `cachedir` shared by all threads.
+    """
+    return shared_store(TimelineCache, os.path.join(cachedir, 'timeline'))
@@ -33,6 +33,10 @@ from videomass.vdms_utils.get_bmpfromsvg import get_bmp
 from videomass.vdms_utils.queue_utils import load_json_file_queue
 from videomass.vdms_utils.queue_utils import write_json_file_queue
 from videomass.vdms_utils.queue_utils import extend_data_queue
+from videomass.vdms_io.job_journal import (read_journal,
+                                           remaining_items,
+                                           resume_journal,
+                                           )
 from videomass.vdms_dialogs import preferences
 from videomass.vdms_dialogs import set_timestamp
 from videomass.vdms_dialogs import about_dialog
@@ -199,9 +203,19 @@ class MainFrame(wx.Frame):
         pub.subscribe(self.process_terminated, "PROCESS TERMINATED")
         pub.subscribe(self.end_queue_processing, "QUEUE PROCESS SUCCESSFULLY")
 
-        # this block need to initilizes queue.backup on startup
+        # initializes the queue on startup, once the frame is shown
+        wx.CallAfter(self.startup_queue)
+
+    # -------------------Status bar settings--------------------#
+
+    def startup_queue(self):
+        """
+        Resume an interrupted queue processing, if any, otherwise
+        offer to keep the items left by the last session in the
+        queue (queue.backup).
+        """
         fque = os.path.join(self.appdata["confdir"], 'queue.backup')
-        if os.path.exists(fque):
+        if not self.resume_queue_journal() and os.path.exists(fque):
             if wx.MessageBox(_('Not all items in the queue were completed.\n\n'
                                'Would you like to keep them in the queue?'),
                              _('Please confirm'), wx.ICON_QUESTION | wx.CANCEL
@@ -213,8 +227,56 @@ class MainFrame(wx.Frame):
                     self.queue_tool_counter()
             else:
                 os.remove(fque)
+    # ------------------------------------------------------------------#
 
-    # -------------------Status bar settings--------------------#
+    def resume_queue_journal(self):
+        """
+        Offer to resume the remaining items of a queue processing
+        interrupted by a crash, see `job_journal.JobJournal`. The
+        half-written output files of the items which were running
+        are removed both on resume and on refusal, then only the
+        remaining items are kept (queue.backup). The journal is
+        removed once the user has decided, so that it is offered
+        again if the user cancels or the application ends before.
+        Returns True if the queue has been resumed or the choice
+        has been postponed (Cancel), False otherwise.
+        """
+        fjournal = os.path.join(self.appdata["confdir"], 'queue.journal')
+        journal = read_journal(fjournal)
+        if journal is None:
+            return False
+        remaining = remaining_items(journal)
+        total = len(journal['queue'])
+        if not remaining:
+            answer = wx.NO
+        else:
+            answer = wx.MessageBox(_('The queue processing was interrupted, '
+                                     '{0} of {1} items were completed.\n\n'
+                                     'Would you like to resume the remaining '
+                                     'items?').format(total - len(remaining),
+                                                      total),
+                                   _('Please confirm'), wx.ICON_QUESTION
+                                   | wx.CANCEL | wx.YES_NO, self)
+        if answer not in (wx.YES, wx.NO):
+            return True  # ask again on next start
+
+        remaining = resume_journal(journal, self.appdata['cachedir'])
+        if remaining:
+            write_json_file_queue(remaining)
+        fque = os.path.join(self.appdata["confdir"], 'queue.backup')
+        for name in (fjournal, fque) if not remaining else (fjournal,):
+            try:
+                os.remove(name)
+            except OSError:
+                pass
+        if answer != wx.YES:
+            return False
+
+        self.queuelist = remaining
+        self.queue_tool_counter()
+        self.on_process_queue(None)
+        return True
+    # ------------------------------------------------------------------#
 
     def queue_tool_counter(self):
         """
@@ -719,9 +781,7 @@ class MainFrame(wx.Frame):
 
             self.switch_file_import(self)
             paths = filedlg.GetPaths()
-            for path in paths:
-                self.fileDnDTarget.flCtrl.dropUpdate(path)
-            self.fileDnDTarget.flCtrl.rejected_files()
+            self.fileDnDTarget.flCtrl.add_files(paths)
     # -------------------------------------------------------------------#
 
     def open_dest_encodings(self, event):
@@ -29,6 +29,9 @@ import wx.adv
 from pubsub import pub
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_utils.utils import time_to_integer
+from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_io.timeline_cache import thumbnail_at
+from videomass.vdms_threads.timeline_strip import TimelineStrip
 
 
 class Time_Selector(wx.Dialog):
@@ -156,12 +159,17 @@ class Float_TL(wx.MiniFrame):
     DELIMITER_COLOR = '#009DCB'  # Azure for margin selection
     TEXT_PEN_COLOR = '#020D0F'  # black for draw lines
     DURATION_START = '#E95420'  # Light orange for duration/start indicators
+    STRIP_BKGRD = '#1b0413'  # background for thumbnails and waveform
+    WAVEFORM = '#52EE7D'  # LGREEN for audio waveform
 
     # ruler and panel specifications constants
     RW = 900  # ruler width
     RM = 0  # ruler margin
     PW = 906  # panel width
-    PH = 60  # panel height
+    RH = 60  # ruler height
+    TH = 36  # thumbnails strip height
+    WH = 24  # audio waveform height
+    PH = RH + TH + WH  # panel height
 
     def __init__(self, parent):
         """
@@ -170,6 +178,11 @@ class Float_TL(wx.MiniFrame):
         self.duration: see parent attr.
         self.bar_w: pixel point val for END selection
         self.bar_x: pixel point val for START selection
+        self.stripfile: filename of the current timeline strip
+        self.striploading: filename of the strip being loaded
+        self.strip: timeline strip data (see `TimelineStrip`)
+        self.stripbmp: bitmap of thumbnails and waveform drawn
+                       from `self.strip`, made on first redraw
         """
         get = wx.GetApp()  # get data from bootstrap
         # colorscheme = get.appset['colorscheme']
@@ -187,6 +200,11 @@ class Float_TL(wx.MiniFrame):
         self.bar_x = 0
         self.pointpx = [0, 0]  # see `on_move()` `on_leftdown()`
         self.sourcedur = _('No source duration:')
+        self.stripfile = None
+        self.striploading = None
+        self.strip = None
+        self.stripbmp = None
+        self.thumbs = []
 
         wx.MiniFrame.__init__(self, parent, -1, style=wx.CAPTION | wx.CLOSE_BOX
                               | wx.SYSTEM_MENU | wx.FRAME_FLOAT_ON_PARENT
@@ -214,16 +232,16 @@ class Float_TL(wx.MiniFrame):
         sizer_base.Fit(self)
         self.Layout()
         if self.appdata['ostype'] == 'Linux':
-            self.SetSize((920, 115))
+            self.SetSize((920, 175))
             self.font_med = wx.Font(9, wx.DEFAULT, wx.NORMAL, wx.BOLD)
         elif self.appdata['ostype'] == 'Windows':
             self.font_med = wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD)
-            self.SetSize((935, 130))
+            self.SetSize((935, 190))
         elif self.appdata['ostype'] == 'Darwin':
-            self.SetSize((915, 110))
+            self.SetSize((915, 170))
             self.font_med = wx.Font(12, wx.DEFAULT, wx.NORMAL, wx.BOLD)
         else:
-            self.SetSize((930, 120))
+            self.SetSize((930, 180))
             self.font_med = wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD)
         self.CentreOnScreen()
         # print(self.GetSize())
@@ -235,6 +253,7 @@ class Float_TL(wx.MiniFrame):
         self.paneltime.Bind(wx.EVT_LEFT_DCLICK, self.on_set_pos)
         self.paneltime.Bind(wx.EVT_MOTION, self.on_move)
         self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.Bind(wx.EVT_SHOW, self.on_show)
         self.paneltime.Bind(wx.EVT_CONTEXT_MENU, self.onContext)
 
         pub.subscribe(self.set_values, "RESET_ON_CHANGED_LIST")
@@ -310,6 +329,7 @@ class Float_TL(wx.MiniFrame):
         removing imported files (see`filedrop.py`).
         """
         self.sourcedur = _('No source duration:')
+        self.stripfile = None
         if msg is None:
             self.milliseconds = 86399999
         else:
@@ -318,9 +338,44 @@ class Float_TL(wx.MiniFrame):
             else:
                 self.milliseconds = self.duration[msg]
                 self.sourcedur = _('Source duration:')
+                self.stripfile = self.parent.file_src[msg]
 
+        self.strip, self.stripbmp, self.thumbs = None, None, []
         self.overalltime = integer_to_time(self.milliseconds)
         self.on_trim_time_reset()
+        if self.IsShown():
+            self.load_strip()
+    # ------------------------------------------------------------------#
+
+    def load_strip(self):
+        """
+        Loads in background the thumbnails and the audio
+        peaks of the current source file, see `on_strip`.
+        """
+        if (not self.stripfile or self.strip is not None
+                or self.striploading == self.stripfile):
+            return
+        self.striploading = self.stripfile
+        logfile = make_log_template('timeline.log',
+                                    self.appdata['logdir'],
+                                    mode="w",
+                                    )
+        TimelineStrip(self.stripfile, self.milliseconds, logfile,
+                      self.on_strip)
+    # ------------------------------------------------------------------#
+
+    def on_strip(self, filename, strip):
+        """
+        Callback of `TimelineStrip`, drops the strips
+        of a no longer current source file.
+        """
+        if filename == self.striploading:
+            self.striploading = None
+        if filename != self.stripfile or not strip:
+            return
+        self.strip, self.stripbmp = strip, None
+        self.thumbs = [None] * len(strip['times'])
+        self.paneltime.Refresh()
     # ------------------------------------------------------------------#
 
     def set_time_seq(self, isset=True):
@@ -444,6 +499,59 @@ class Float_TL(wx.MiniFrame):
             self.set_coordinates()
     # ------------------------------------------------------------------#
 
+    def on_show(self, event):
+        """
+        Loads the strip of the current source file when
+        this frame is shown.
+        """
+        if event.IsShown():
+            self.load_strip()
+        event.Skip()
+    # ------------------------------------------------------------------#
+
+    def thumbnail(self, idx):
+        """
+        Returns the bitmap of the thumbnail `idx` of the strip,
+        made from the atlas on first use.
+        """
+        if self.thumbs[idx] is None:
+            width, height = self.strip['width'], self.strip['height']
+            size = width * height * 3
+            data = self.strip['atlas'][idx * size:(idx + 1) * size]
+            self.thumbs[idx] = wx.Bitmap.FromBuffer(width, height, data)
+        return self.thumbs[idx]
+    # ------------------------------------------------------------------#
+
+    def make_strip_bitmap(self, width):
+        """
+        Draws the thumbnails and the audio waveform of the strip
+        on a bitmap of the given `width`, so that redrawing the
+        timeline only needs to blit it.
+        """
+        bmp = wx.Bitmap(width, Float_TL.TH + Float_TL.WH)
+        mdc = wx.MemoryDC(bmp)
+        mdc.SetBackground(wx.Brush(Float_TL.STRIP_BKGRD))
+        mdc.Clear()
+        times = self.strip['times']
+        thumbw = self.strip['width']
+        if times:
+            for x in range(0, width, thumbw):
+                sec = (x + thumbw / 2) / width * self.milliseconds / 1000
+                mdc.DrawBitmap(self.thumbnail(thumbnail_at(times, sec)),
+                               x, (Float_TL.TH - self.strip['height']) // 2)
+        peaks = self.strip['peaks']
+        if peaks:
+            mdc.SetPen(wx.Pen(Float_TL.WAVEFORM, 1, wx.PENSTYLE_SOLID))
+            middle = Float_TL.TH + Float_TL.WH // 2
+            for x in range(width):
+                first = x * len(peaks) // width
+                last = max((x + 1) * len(peaks) // width, first + 1)
+                half = round(max(peaks[first:last]) * (Float_TL.WH // 2))
+                mdc.DrawLine(x, middle - half, x, middle + half + 1)
+        mdc.SelectObject(wx.NullBitmap)
+        return bmp
+    # ------------------------------------------------------------------#
+
     def OnPaint(self, event):
         """
         wx.PaintDC event
@@ -478,7 +586,7 @@ class Float_TL(wx.MiniFrame):
 
         bar_w, bar_x = round(self.bar_w), round(self.bar_x)
         dc.SetBrush(wx.Brush(selcolor, wx.BRUSHSTYLE_SOLID))
-        dc.DrawRectangle(bar_x, -8, bar_w - bar_x, 80)
+        dc.DrawRectangle(bar_x, -8, bar_w - bar_x, Float_TL.RH + 8)
         dc.SetPen(wx.Pen(Float_TL.TEXT_PEN_COLOR))
         dc.SetTextForeground(Float_TL.TEXT_PEN_COLOR)
 
@@ -520,6 +628,17 @@ class Float_TL(wx.MiniFrame):
         else:
             dc.DrawText(txt2, bar_w - w - 5, 31)
             dc.DrawRectangle(bar_w - 6, 49, 7, 10)
+
+        # thumbnails and waveform from the cached bitmap
+        if self.strip:
+            if (self.stripbmp is None
+                    or self.stripbmp.GetWidth() != Float_TL.RW):
+                self.stripbmp = self.make_strip_bitmap(Float_TL.RW)
+            dc.DrawBitmap(self.stripbmp, Float_TL.RM, Float_TL.RH)
+            if bar_w or bar_x:
+                dc.SetPen(wx.Pen(selcolor, 2, wx.PENSTYLE_SOLID))
+                dc.DrawLine(bar_x, Float_TL.RH, bar_x, Float_TL.PH)
+                dc.DrawLine(bar_w, Float_TL.RH, bar_w, Float_TL.PH)
     # ------------------------------------------------------------------#
 
     def statusbar_msg(self, msg, bcolor, fcolor=None):
@@ -791,6 +791,7 @@ class AudioEncoders(scrolled.ScrolledPanel):
                                      self.maindata.time_seq,  # from -ss to -t
                                      self.opt["AudioIndex"],
                                      parent=self.GetParent(),
+                                     durations=self.maindata.duration,
                                      )
         if data[1]:
             if data[1][0] == 'ERROR':
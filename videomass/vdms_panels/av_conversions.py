@@ -1057,6 +1057,18 @@ class AV_Conv(wx.Panel):
                       'volume': [vol[5] for vol in audnorm],
                       'preset name': 'A/V Conversions - Video standard.',
                       }
+        elif (self.opt["Passes"] == "Auto"
+              and self.appdata['chunked_encoding']):
+            cmd1 = f'{self.opt["CmdVideoParams"]} {self.opt["VFilters"]}'
+            cmd2 = (f'{self.opt["CmdAudioParams"]} {self.opt["EBU"][1]} '
+                    f'{self.opt["SubtitleMap"]} {self.opt["Chapters"]} '
+                    f'{self.opt["MetaData"]}'
+                    )
+            pass1, pass2 = " ".join(cmd1.split()), " ".join(cmd2.split())
+            kwargs = {'type': 'Chunked', 'args': [pass1, pass2],
+                      'volume': [vol[5] for vol in audnorm],
+                      'preset name': 'A/V Conversions - Video standard',
+                      }
         elif self.opt["Passes"] == "Auto":
             args = (f'{self.opt["CmdVideoParams"]} {self.opt["VFilters"]} '
                     f'{self.opt["CmdAudioParams"]} {self.opt["EBU"][1]} '
@@ -1199,6 +1211,8 @@ class AV_Conv(wx.Panel):
             dest = self.appdata['outputdir']
 
         passes = '1' if kwa["args"][1] == '' else '2'
+        if kwa['type'] == 'Chunked':
+            passes = _('1 (parallel video segments)')
 
         keys = (_("Batch processing items\nDestination\nAutomation/Preset"
                   "\nEncoding passes\nOutput Format"
@@ -29,7 +29,7 @@ import re
 import wx
 from pubsub import pub
 from videomass.vdms_io.io_tools import stream_play
-from videomass.vdms_threads.ffprobe import ffprobe
+from videomass.vdms_threads.file_ingestion import FileIngestion
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import to_bytes
 from videomass.vdms_dialogs.renamer import Renamer
@@ -98,59 +98,158 @@ def filename_sanitize(newname, outputnames):
 
 class MyListCtrl(wx.ListCtrl):
     """
-    This is the listControl widget.
+    This is the virtual listControl widget: only the visible rows
+    are drawn, getting their text from the model on demand (see
+    `OnGetItemText`). The model is made up of columns, that is
+    lists of the same length: `data`, `file_src`, `duration` and
+    `outputnames` (shared with the main frame) and `labels`, plus
+    the `pathindex` dict for fast lookup of duplicate files.
     Note that this wideget has DnDPanel parented.
+
+    The added files are probed in the background (see `add_files`),
+    the rows of the files being probed are placeholders appended
+    after the `len(self.data)` rows of the files already accepted.
     """
     def __init__(self, parent):
         """
         Constructor.
         WARNING to avoid segmentation error on removing items by
         listctrl, style must be wx.LC_SINGLE_SEL .
+
+        self.labels: (duration, media type, size) text of the rows
+        self.pathindex: {path: index} of the accepted files
+
+        Attributes for the files being probed:
+        self.ingest: {seq: entry} pending files, where entry is a
+                     dict with 'path', 'newname', 'probe', 'error',
+                     'labels' and 'done' keys
+        self.headseq: seq of the first pending file
+        self.nextseq: seq of the next added file
+        self.threads: running `FileIngestion` threads
         """
         get = wx.GetApp()
         self.appdata = get.appset
-        self.index = None
         self.parent = parent  # parent is DnDPanel class
         self.data = self.parent.data
         self.file_src = self.parent.file_src
         self.duration = self.parent.duration
         self.outputnames = self.parent.outputnames
+        self.labels = []
+        self.pathindex = {}
         self.errors = {}
+        self.ingest = {}
+        self.pendingpaths = set()
+        self.headseq = 0
+        self.nextseq = 0
+        self.threads = []
+        self.progress = [0, 0]  # [probed, total] files
         wx.ListCtrl.__init__(self,
                              parent,
                              style=wx.LC_REPORT
+                             | wx.LC_VIRTUAL
                              | wx.LC_SINGLE_SEL,
                              )
+        pub.subscribe(self.on_ingest, "INGEST_EVT")
+        pub.subscribe(self.on_ingest_end, "INGEST_END_EVT")
     # ----------------------------------------------------------------------#
 
-    def dropUpdate(self, path, newname=None):
-        """
-        Update list-control during drag and drop.
-        Note that the optional 'newname' argument is given by
-        the 'on_col_click' method in the 'FileDnD' class to preserve
-        the related renames in column 5 of wx.ListCtrl.
+    def OnGetItemText(self, item, column):
+        """
+        Returns the text of the given cell, it is
+        called for the visible rows only.
+        """
+        count = len(self.data)
+        if item < count:
+            if column == 0:
+                return str(item + 1)
+            if column == 1:
+                return self.file_src[item]
+            if column == 5:
+                return self.outputnames[item]
+            return self.labels[item][column - 2]
+
+        entry = self.ingest.get(self.headseq + item - count)
+        if entry is None:
+            return ''
+        if column == 1:
+            return entry['path']
+        if column in (2, 3, 4):
+            return entry['labels'][column - 2]
+        return ''
+    # ----------------------------------------------------------------------#
 
+    def refresh_view(self):
         """
-        self.index = self.GetItemCount()
-        warn = fullpathname_sanitize(path)  # check for fullname sanitize
-        if warn:
-            self.errors[f'"{path}"'] = warn
-            return
+        Update the number of rows and redraw the visible ones.
+        """
+        count = len(self.data) + self.nextseq - self.headseq
+        if count != self.GetItemCount():
+            self.SetItemCount(count)
+        self.Refresh()
+    # ----------------------------------------------------------------------#
 
-        if not [x for x in self.data if x['format']['filename'] == path]:
-            probe = ffprobe(path, cmd=self.appdata['ffprobe_cmd'],
-                            txtenc=self.appdata['encoding'],
-                            hide_banner=None, pretty=None)
-            if probe[1]:
-                self.errors[f'"{path}"'] = probe[1]
-                return
+    def add_files(self, paths, newnames=None):
+        """
+        Update list-control during drag and drop or files import.
+        A placeholder row is inserted at once for each valid file,
+        then the files are probed in the background and the rows
+        are filled in as the results arrive. The rejected files
+        are shown at the end.
+        The optional 'newnames' argument gives the destination
+        file names for the related paths.
+
+        """
+        items = []
+        for num, path in enumerate(paths):
+            warn = fullpathname_sanitize(path)  # check for fullname sanitize
+            if warn:
+                self.errors[f'"{path}"'] = warn
+                continue
+
+            if path in self.pendingpaths or path in self.pathindex:
+                mess = _("Duplicate file, it has already been added to "
+                         "the list.")
+                self.errors[f'"{path}"'] = mess
+                continue
+
+            self.ingest[self.nextseq] = {'path': path,
+                                         'newname': (newnames[num] if
+                                                     newnames else None),
+                                         'probe': None,
+                                         'error': None,
+                                         'labels': (_('Probing...'), '', ''),
+                                         'done': False,
+                                         }
+            self.pendingpaths.add(path)
+            items.append((self.nextseq, path))
+            self.nextseq += 1
+
+        if items:
+            self.refresh_view()
+            self.progress[1] += len(items)
+            self.parent.ingestion_progress(*self.progress)
+            self.threads.append(FileIngestion(items,
+                                              self.appdata['ffprobe_workers']
+                                              ))
+        elif not self.threads:
+            self.rejected_files()
+    # ----------------------------------------------------------------------#
 
-            probe = probe[0]
-            self.InsertItem(self.index, str(self.index + 1))
-            self.SetItem(self.index, 1, path)
+    def on_ingest(self, seq, probe, error):
+        """
+        Receives the probe result of a file from the
+        "INGEST_EVT" pubsub message.
+        """
+        entry = self.ingest.get(seq)
+        if entry is None:  # removed in the meantime
+            return
+        entry.update(probe=probe, error=error, done=True)
 
+        if error:
+            entry['labels'] = (_('Rejected'), '', '')
+        else:
             if 'duration' not in probe['format'].keys():
-                self.SetItem(self.index, 2, 'N/A')
+                tdur = 'N/A'
                 # NOTE these are my custom adds to probe data
                 probe['format']['time'] = '00:00:00.000'
                 probe['format']['duration'] = 0
@@ -159,31 +258,156 @@ class MyListCtrl(wx.ListCtrl):
                 tdur = probe['format']['duration'].split(':')
                 sec, msec = tdur[2].split('.')[0], tdur[2].split('.')[1]
                 tdur = f'{tdur[0]}h : {tdur[1]}m : {sec} : {msec}'
-                self.SetItem(self.index, 2, tdur)
                 probe['format']['time'] = probe.get('format').pop('duration')
                 time = time_to_integer(probe.get('format')['time'])
                 probe['format']['duration'] = time
 
             media = probe['streams'][0]['codec_type']
             formatname = probe['format']['format_long_name']
-            self.SetItem(self.index, 3, f'{media}: {formatname}')
-            self.SetItem(self.index, 4, probe['format']['size'])
-            if newname:
-                self.SetItem(self.index, 5, newname)
-                self.outputnames.append(newname)
+            entry['labels'] = (tdur, f'{media}: {formatname}',
+                               probe['format']['size'])
+
+        self.progress[0] += 1
+        self.parent.ingestion_progress(*self.progress)
+        self.commit_files()
+        self.refresh_view()
+    # ----------------------------------------------------------------------#
+
+    def on_ingest_end(self, thread):
+        """
+        Receives the "INGEST_END_EVT" pubsub message when
+        a `FileIngestion` thread is finished.
+        """
+        if thread in self.threads:
+            self.threads.remove(thread)
+        if not self.threads:
+            self.commit_files(final=True)
+            self.refresh_view()
+            self.progress = [0, 0]
+            self.parent.ingestion_progress(*self.progress)
+            self.rejected_files()
+    # ----------------------------------------------------------------------#
+
+    def commit_files(self, final=False):
+        """
+        Accept the probed files in the same order they were
+        added, up to the first file not probed yet. With
+        `final=True` all pending files are processed and the
+        files not probed (i.e. cancelled) are removed.
+        """
+        changed = False
+        while self.headseq < self.nextseq:
+            entry = self.ingest[self.headseq]
+            if not entry['done'] and not final:
+                break
+            del self.ingest[self.headseq]
+            self.headseq += 1
+            self.pendingpaths.discard(entry['path'])
+
+            if entry['error'] or not entry['done']:
+                if entry['error']:
+                    self.errors[f'"{entry["path"]}"'] = entry['error']
+                continue
+
+            path, probe = entry['path'], entry['probe']
+            if entry['newname']:
+                fname = entry['newname']
             else:
                 fname = os.path.splitext(os.path.basename(path))[0]
-                self.SetItem(self.index, 5, fname)
-                self.outputnames.append(fname)
-            self.index += 1
+            self.pathindex[path] = len(self.file_src)
+            self.outputnames.append(fname)
             self.data.append(probe)
             self.file_src.append(path)
             self.duration.append(probe['format']['duration'])
-            # self.parent.statusbar_msg('', None)
+            self.labels.append(entry['labels'])
+            changed = True
+
+        if changed:
             self.parent.changes_in_progress()
-        else:
-            mess = _("Duplicate file, it has already been added to the list.")
-            self.errors[f'"{path}"'] = mess
+    # ----------------------------------------------------------------------#
+
+    def sort_files(self, column, reverse=False):
+        """
+        Sort the accepted files by the given `column` number,
+        using typed sort keys (e.g. duration in milliseconds and
+        size in bytes) computed from the model. All the model
+        columns are reordered in place.
+        """
+        items = []
+        for index, probe in enumerate(self.data):
+            items.append({'path': self.file_src[index],
+                          'duration': self.duration[index],
+                          'size': to_bytes(''.join(self.labels[index][2]
+                                                   .split()), 'ffmpeg'),
+                          'media': self.labels[index][1],
+                          'outputname': self.outputnames[index],
+                          'probe': probe,
+                          'labels': self.labels[index],
+                          })
+        keys = {1: 'path', 2: 'duration', 3: 'media',
+                4: 'size', 5: 'outputname'}
+        items.sort(key=lambda item: item[keys[column]], reverse=reverse)
+
+        self.data[:] = [item['probe'] for item in items]
+        self.file_src[:] = [item['path'] for item in items]
+        self.duration[:] = [item['duration'] for item in items]
+        self.outputnames[:] = [item['outputname'] for item in items]
+        self.labels[:] = [item['labels'] for item in items]
+        self.pathindex = {path: i for i, path in enumerate(self.file_src)}
+        self.refresh_view()
+    # ----------------------------------------------------------------------#
+
+    def delete_files(self, indexes):
+        """
+        Remove the accepted files at the given indexes
+        """
+        for num in sorted(indexes, reverse=True):
+            self.data.pop(num)
+            self.outputnames.pop(num)
+            self.file_src.pop(num)
+            self.duration.pop(num)
+            self.labels.pop(num)
+        self.pathindex = {path: i for i, path in enumerate(self.file_src)}
+        self.refresh_view()
+    # ----------------------------------------------------------------------#
+
+    def clear_files(self):
+        """
+        Remove all files, including the pending ones
+        """
+        self.clear_ingestion()
+        del self.data[:]
+        del self.outputnames[:]
+        del self.file_src[:]
+        del self.duration[:]
+        del self.labels[:]
+        self.pathindex.clear()
+        self.refresh_view()
+    # ----------------------------------------------------------------------#
+
+    def is_busy(self):
+        """
+        Returns True while files are being probed
+        """
+        return bool(self.threads)
+    # ----------------------------------------------------------------------#
+
+    def stop_ingestion(self):
+        """
+        Cancel the probing of the pending files
+        """
+        for thread in self.threads:
+            thread.stop()
+    # ----------------------------------------------------------------------#
+
+    def clear_ingestion(self):
+        """
+        Forget the pending files, e.g. on clearing the list
+        """
+        self.stop_ingestion()
+        self.ingest.clear()
+        self.pendingpaths.clear()
+        self.headseq = self.nextseq
     # ----------------------------------------------------------------------#
 
     def rejected_files(self):
@@ -220,9 +444,7 @@ class FileDrop(wx.FileDropTarget):
         When files are dropped, write where they were dropped and then
         the file paths themselves
         """
-        for filepath in filenames:
-            self.window.dropUpdate(filepath)  # update list control
-        self.window.rejected_files()  # call parent.rejected_files at end
+        self.window.add_files(filenames)  # update list control
 
         return True
     # ----------------------------------------------------------------------#
@@ -277,6 +499,15 @@ class FileDnD(wx.Panel):
         sizer.Add(self.lbl_info, 0, wx.ALL | wx.EXPAND, 5)
         sizer.Add((0, 10))
         sizer.Add(self.flCtrl, 1, wx.EXPAND | wx.ALL, 2)
+        self.sizer_ingest = wx.BoxSizer(wx.HORIZONTAL)
+        self.lbl_ingest = wx.StaticText(self, wx.ID_ANY, label="")
+        self.sizer_ingest.Add(self.lbl_ingest, 0, wx.ALL | wx.CENTRE, 2)
+        self.bar_ingest = wx.Gauge(self, wx.ID_ANY, range=0)
+        self.sizer_ingest.Add(self.bar_ingest, 1, wx.ALL | wx.CENTRE, 2)
+        self.btn_ingest = wx.Button(self, wx.ID_ANY, _('Cancel'))
+        self.sizer_ingest.Add(self.btn_ingest, 0, wx.ALL | wx.CENTRE, 2)
+        sizer.Add(self.sizer_ingest, 0, wx.ALL | wx.EXPAND, 2)
+        sizer.Hide(self.sizer_ingest)
         sizer.Add((0, 10))
         sizer_outdir = wx.BoxSizer(wx.HORIZONTAL)
         lblsave = wx.StaticText(self, wx.ID_ANY, label=_("Save to:"))
@@ -306,12 +537,15 @@ class FileDnD(wx.Panel):
         self.btn_destpath.SetToolTip(_('Set a new destination folder for '
                                        'encodings'))
         self.text_path_save.SetToolTip(_("Encodings destination folder"))
+        self.btn_ingest.SetToolTip(_('Stop adding the files not yet '
+                                     'probed'))
 
         # ---- Binding (EVT)
         self.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_select, self.flCtrl)
         self.Bind(wx.EVT_LIST_ITEM_DESELECTED, self.on_deselect, self.flCtrl)
         self.Bind(wx.EVT_LIST_COL_CLICK, self.on_col_click, self.flCtrl)
         self.Bind(wx.EVT_CONTEXT_MENU, self.onContext)
+        self.Bind(wx.EVT_BUTTON, self.on_cancel_ingestion, self.btn_ingest)
 
         self.on_file_save(self.appdata['outputdir'])
         pub.subscribe(self.text_information, "SET_DRAG_AND_DROP_TOPIC")
@@ -393,46 +627,47 @@ class FileDnD(wx.Panel):
             self.lbl_info.SetLabel(_('Drag one or more Video files below'))
     # ----------------------------------------------------------------------
 
+    def ingestion_progress(self, done, total):
+        """
+        Show the progress of the files being probed by
+        the list control, hide it if `total` is zero.
+        """
+        if not total:
+            self.GetSizer().Hide(self.sizer_ingest)
+            self.btn_ingest.Enable()
+        else:
+            self.GetSizer().Show(self.sizer_ingest)
+            self.bar_ingest.SetRange(total)
+            self.bar_ingest.SetValue(done)
+            self.lbl_ingest.SetLabel(_('Probing files: {0}/{1}'
+                                       ).format(done, total))
+        self.Layout()
+    # ----------------------------------------------------------------------
+
+    def on_cancel_ingestion(self, event):
+        """
+        Cancel adding the files not yet probed
+        """
+        self.btn_ingest.Disable()
+        self.flCtrl.stop_ingestion()
+    # ----------------------------------------------------------------------
+
     def on_col_click(self, event):
         """
         Sort items by LEFT clicking on column headers
         (from ascending to descending and back to ascending).
-        For this feature is required to delete all items from
-        listctrl and data list before re-loading the same
-        items with the new sorted order using `dropUpdate` method.
+        The files are sorted in memory by the list control
+        (see `MyListCtrl.sort_files`), they are not probed again.
 
         if plane to use wx.EVT_LIST_COL_RIGHT_CLICK event:
             `if event.GetEventType() == wx.EVT_LIST_COL_RIGHT_CLICK.typeId:`
                 `curritems.reverse()`
         see: <https://discuss.wxpython.org/t/event-geteventtype/22860/4>
         """
-        count = self.flCtrl.GetItemCount()
-        curritems = []
-        if count > 1:
+        if len(self.data) > 1 and not self.flCtrl.is_busy():
             if event.GetColumn() in (0, -1):
                 return
 
-            for x in range(count):
-                curritems.append((self.flCtrl.GetItemText(x, col=1),
-                                  self.flCtrl.GetItemText(x, col=2),
-                                  self.flCtrl.GetItemText(x, col=3),
-                                  self.flCtrl.GetItemText(x, col=4),
-                                  self.flCtrl.GetItemText(x, col=5),
-                                  ))
-            if event.GetColumn() == 1:
-                curritems.sort(key=lambda item: item[0])
-            elif event.GetColumn() == 2:
-                curritems.sort(key=lambda item: item[1])
-            elif event.GetColumn() == 3:
-                curritems.sort(key=lambda item: item[2])
-            elif event.GetColumn() == 4:
-                curritems.sort(key=lambda item:
-                               to_bytes(''.join(item[3].split()), 'ffmpeg'))
-            elif event.GetColumn() == 5:
-                curritems.sort(key=lambda item: item[4])
-
-            self.delete_all(None, setstate=False)  # does not setstate here
-
             if self.sortingstate == 'descending':
                 self.sortingstate = 'ascending'
             elif self.sortingstate == 'ascending':
@@ -440,11 +675,9 @@ class FileDnD(wx.Panel):
             elif not self.sortingstate:
                 self.sortingstate = 'ascending'
 
-            if self.sortingstate == 'descending':
-                curritems.reverse()
-
-            for data in curritems:
-                self.flCtrl.dropUpdate(data[0], data[4])
+            self.flCtrl.sort_files(event.GetColumn(),
+                                   self.sortingstate == 'descending')
+            self.changes_in_progress()
     # ----------------------------------------------------------------------
 
     def changes_in_progress(self, setfocus=True):
@@ -491,6 +724,11 @@ class FileDnD(wx.Panel):
         """
         if self.flCtrl.GetFirstSelected() == -1:  # None
             return
+        if self.flCtrl.is_busy():
+            self.parent.statusbar_msg(_('Please wait, files are being '
+                                        'added...'), FileDnD.YELLOW,
+                                      FileDnD.BLACK)
+            return
 
         item, indexes = -1, []
         while 1:
@@ -506,18 +744,10 @@ class FileDnD(wx.Panel):
             self.delete_all(self)
             return
 
-        for num in sorted(indexes, reverse=True):
-            self.flCtrl.DeleteItem(num)  # remove selected items
-            self.data.pop(num)  # remove selected items
-            self.outputnames.pop(num)  # remove selected items
-            self.file_src.pop(num)
-            self.duration.pop(num)
-            self.flCtrl.Select(num - 1)  # select the previous one
+        self.flCtrl.delete_files(indexes)  # remove selected items
+        self.flCtrl.Select(max(min(indexes) - 1, 0))  # select the previous
         self.changes_in_progress(setfocus=False)  # reset timeline
         # self.on_deselect(self)  # deselect removed file
-
-        for x in range(self.flCtrl.GetItemCount()):
-            self.flCtrl.SetItem(x, 0, str(x + 1))  # re-load counter
         return
     # ----------------------------------------------------------------------
 
@@ -529,11 +759,7 @@ class FileDnD(wx.Panel):
         if self.flCtrl.GetItemCount() == 0:
             return
         # self.flCtrl.ClearAll()
-        self.flCtrl.DeleteAllItems()
-        del self.data[:]
-        del self.outputnames[:]
-        del self.file_src[:]
-        del self.duration[:]
+        self.flCtrl.clear_files()
         if event:
             self.changes_in_progress(setfocus=False)
             self.parent.rename.Enable(False)
@@ -550,6 +776,9 @@ class FileDnD(wx.Panel):
         Selecting line with mouse or up/down keyboard buttons
         """
         index = self.flCtrl.GetFocusedItem()
+        if index >= len(self.data):  # file being probed
+            self.on_deselect(None)
+            return
         item = self.flCtrl.GetItemText(index, 1)
         self.parent.filedropselected = item
         self.parent.rename.Enable(True)
@@ -590,6 +819,8 @@ class FileDnD(wx.Panel):
             return
 
         row_id = self.flCtrl.GetFocusedItem()  # Get the current row
+        if row_id >= len(self.outputnames):  # file being probed
+            return
         oldname = self.flCtrl.GetItemText(row_id, 5)  # Get current name
         newname = ''
         title = _('Rename the file destination')
@@ -615,8 +846,8 @@ class FileDnD(wx.Panel):
             self.parent.statusbar_msg(sanitize, FileDnD.YELLOW, FileDnD.BLACK)
             return
 
-        self.flCtrl.SetItem(row_id, 5, newname)
         self.outputnames[row_id] = newname
+        self.flCtrl.RefreshItem(row_id)
         self.parent.statusbar_msg(_('Add Files'), None)
 # -----------------------------------------------------------------------
 
@@ -645,7 +876,7 @@ class FileDnD(wx.Panel):
                 return
 
         for num, name in enumerate(newname):
-            self.flCtrl.SetItem(num, 5, name)
             self.outputnames[num] = name
+        self.flCtrl.Refresh()
 
         self.parent.statusbar_msg(_('Add Files'), None)
@@ -29,14 +29,23 @@ import os
 from shutil import move
 from pubsub import pub
 import wx
-from videomass.vdms_dialogs.widget_utils import notification_area
-from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_dialogs.widget_utils import (notification_area,
+                                                 LogConsole,
+                                                 )
+from videomass.vdms_io.make_filelog import (make_log_template,
+                                            logwrite,
+                                            log_sink,
+                                            flush_logs,
+                                            )
 from videomass.vdms_threads.ffmpeg import FFmpeg
 from videomass.vdms_threads.image_extractor import PicturesFromVideo
 from videomass.vdms_threads.concat_demuxer import ConcatDemuxer
 from videomass.vdms_threads.slideshow import SlideshowMaker
+from videomass.vdms_threads.event_dispatcher import DISPATCHER
 from videomass.vdms_utils.utils import (time_to_integer, integer_to_time)
+from videomass.vdms_utils.progress_utils import progress_labels
 from videomass.vdms_io import io_tools
+from videomass.vdms_io.job_journal import JobJournal
 
 
 def delete_file_source(flist, trashdir):
@@ -141,7 +150,9 @@ class LogOut(wx.Panel):
         self.logfile = None  # log pathname, None otherwise
         self.result = []  # result of the final process
         self.count = 0  # keeps track of the counts (see `update_count`)
-        self.maxrotate = 0  # max num text rotation (see `update_count`)
+        self.jobs = {}  # progress of running jobs in parallel mode
+        self.passes = [0, 0]  # [done, total] passes in parallel mode
+        self.jobpasses = {}  # {jobid: passes left} in parallel mode
         self.clr = self.appdata['colorscheme']
 
         wx.Panel.__init__(self, parent=parent)
@@ -153,11 +164,7 @@ class LogOut(wx.Panel):
         self.btn_viewlog = wx.Button(self, wx.ID_ANY, _("Current Log"),
                                      size=(-1, -1))
         self.btn_viewlog.Disable()
-        self.txtout = wx.TextCtrl(self, wx.ID_ANY, "",
-                                  style=wx.TE_MULTILINE
-                                  | wx.TE_READONLY
-                                  | wx.TE_RICH2
-                                  )
+        self.txtout = LogConsole(self, self.clr)
         self.barprog = wx.Gauge(self, wx.ID_ANY, range=0)
         self.labprog = wx.StaticText(self, label="")
         self.labffmpeg = wx.StaticText(self, label="")
@@ -175,12 +182,12 @@ class LogOut(wx.Panel):
                              )
         sizer.Add(line, 0, wx.ALL | wx.EXPAND, 5)
         # set_properties:
-        self.txtout.SetBackgroundColour(self.clr['BACKGRD'])
         self.SetSizerAndFit(sizer)
         # ------------------------------------------
         self.Bind(wx.EVT_BUTTON, self.view_log, self.btn_viewlog)
 
         pub.subscribe(self.update_display, "UPDATE_EVT")
+        pub.subscribe(self.update_progress, "PROGRESS_EVT")
         pub.subscribe(self.update_count, "COUNT_EVT")
         pub.subscribe(self.end_proc, "END_EVT")
     # ----------------------------------------------------------------------
@@ -191,6 +198,7 @@ class LogOut(wx.Panel):
         """
         if self.logfile:
             fname = str(self.logfile)
+            flush_logs(fname)
             if os.path.exists(fname) and os.path.isfile(fname):
                 io_tools.openpath(fname)
     # ----------------------------------------------------------------------
@@ -205,7 +213,7 @@ class LogOut(wx.Panel):
         if args[0] == 'View':
             return
 
-        self.txtout.Clear()
+        self.txtout.clear()
         self.labprog.SetLabel('')
         self.labffmpeg.SetLabel('')
         self.btn_viewlog.Disable()
@@ -214,20 +222,38 @@ class LogOut(wx.Panel):
                                          self.appdata['logdir'],
                                          mode,  # w or a
                                          )
+        DISPATCHER.reset_counters()
         if args[0] in ('One pass', 'Two pass', 'Two pass EBU',
-                       'Two pass VIDSTAB', 'Queue Processing'):
-            self.thread_type = FFmpeg(self.logfile, data)
+                       'Two pass VIDSTAB', 'Chunked', 'Multi output',
+                       'Queue Processing'):
+            njobs = 1
+            if self.appdata['parallel_jobs'] and len(data) > 1:
+                njobs = (self.appdata['max_parallel_jobs']
+                         or os.cpu_count() or 1)
+            if njobs > 1:
+                self.with_eta = False
+                self.jobpasses = {num: 2 if kw['args'][1] else 1
+                                  for num, kw in enumerate(data, 1)}
+                self.passes = [0, sum(self.jobpasses.values())]
+                self.barprog.SetRange(1000)
+                self.barprog.SetValue(0)
+            journal = None
+            if args[0] == 'Queue Processing':  # resumable if interrupted
+                journal = JobJournal(os.path.join(self.appdata['confdir'],
+                                                  'queue.journal'),
+                                     self.logfile)
+            self.thread_type = FFmpeg(self.logfile, data, njobs, journal)
 
         elif args[0] == 'video_to_sequence':
-            self.with_eta, self.maxrotate = False, None
+            self.with_eta = False
             self.thread_type = PicturesFromVideo(self.logfile, **data)
 
         elif args[0] == 'sequence_to_video':
-            self.with_eta, self.maxrotate = False, None
+            self.with_eta = False
             self.thread_type = SlideshowMaker(self.logfile, **data)
 
         elif args[0] == 'concat_demuxer':
-            self.with_eta, self.maxrotate = False, None
+            self.with_eta = False
             self.thread_type = ConcatDemuxer(self.logfile, **data)
     # ----------------------------------------------------------------------
 
@@ -237,90 +263,170 @@ class LogOut(wx.Panel):
         Since not all ffmpeg messages are errors, sometimes
         it happens to see more output marked with yellow color.
         """
-        with open(self.logfile, "a", encoding='utf-8') as logerr:
-            logerr.write(f"[FFMPEG]: {output}")
+        log_sink(self.logfile).write(f"[FFMPEG]: {output}")
 
         if [x for x in ('info', 'Info') if x in output]:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['INFO']))
-            self.txtout.AppendText(f'{output}')
+            severity = 'INFO'
 
         elif [x for x in ('Failed', 'failed', 'Error', 'error')
                 if x in output]:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ERR0']))
-            self.txtout.AppendText(f'{output}')
+            severity = 'ERR0'
 
         elif [x for x in ('warning', 'Warning', 'warn') if x in output]:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['WARN']))
-            self.txtout.AppendText(f'{output}')
+            severity = 'WARN'
+
+        else:
+            severity = 'TXT3'
+
+        self.txtout.write(severity, output)
+    # ----------------------------------------------------------------------
 
+    def update_parallel(self, jobid, msec=None, duration=0, last=False):
+        """
+        Update the progress of a given job running in parallel
+        mode and the overall progress of all jobs. With `msec=None`
+        the current pass of the job is considered ended and, if
+        `last` (the job has ended or failed), also all the passes
+        left of the job, e.g. the second pass of a 'Chunked' item
+        processed as a 'One pass' item.
+        """
+        if msec is None:
+            self.jobs.pop(jobid, None)
+            left = self.jobpasses.get(jobid, 1)
+            ended = left if last else min(left, 1)
+            self.jobpasses[jobid] = left - ended
+            self.passes[0] += ended
         else:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT3']))
-            self.txtout.AppendText(f'{output}')
+            self.jobs[jobid] = min(msec / duration, 1) if duration else 0
+
+        done, total = self.passes
+        overall = (done + sum(self.jobs.values())) / total if total else 1
+        self.barprog.SetValue(min(round(overall * 1000), 1000))
+        self.labprog.SetLabel(f'Processing: {int(overall * 100)}%   '
+                              f'(passes {done}/{total}, '
+                              f'running {len(self.jobs)})')
+        self.labffmpeg.SetLabel(' | '.join(f'Job {key}: {int(val * 100)}%'
+                                           for key, val in
+                                           sorted(self.jobs.items())))
     # ----------------------------------------------------------------------
 
-    def update_display(self, output, duration, status):
+    def update_display(self, output, duration, status, jobid=None):
         """
         Receive message from thread by pubsub UPDATE_EVT protocol.
         The received 'output' is parsed for calculate the bar
         progress value, percentage label and errors management.
         This method can be used even for non-loop threads.
+        The `jobid` arg is given by the threads running jobs
+        in parallel mode only.
         """
         if status != 0:  # error, exit status of the p.wait
             if output == 'STOP':
-                msg, color = LogOut.MSG_stop, self.clr['ABORT']
+                msg, severity = LogOut.MSG_stop, 'ABORT'
             else:
-                msg, color = LogOut.MSG_failed, self.clr['ERR1']
-            self.txtout.SetDefaultStyle(wx.TextAttr(color))
-            self.txtout.AppendText(f"\n\n{msg}")
+                msg, severity = LogOut.MSG_failed, 'ERR1'
+                if jobid is not None:
+                    self.update_parallel(jobid, last=True)
+            self.txtout.write(severity, f"\n\n{msg}")
             self.result.append('failed')
             return  # must be return here
 
+        if jobid is not None:
+            if 'time=' in output:
+                i = output.index('time=') + 5
+                msec = time_to_integer(output[i:].split()[0])
+                self.update_parallel(jobid, msec, duration)
+            else:
+                self.append_messages(f'[Job {jobid}] {output}')
+            return
+
         if 'time=' in output:  # ...in processing
             i = output.index('time=') + 5
             pos = output[i:].split()[0]
             msec = time_to_integer(pos)
-
-            if msec > duration:
-                self.barprog.SetValue(duration)
-            elif msec == 0:
-                self.barprog.SetValue(self.barprog.GetValue())
-            else:
-                self.barprog.SetValue(msec)
-
-            percentage = round((msec / duration) * 100 if
-                               duration != 0 else 100)
             out = [a for a in "=".join(output.split()).split('=') if a]
             ffprog = []
             for key, val in pairwise(out):
                 ffprog.append(f"{key}: {val}")
-
-            if self.with_eta:
-                if 'speed=' in output:
-                    speed = output.split('speed=')[-1].strip().split('x')[0]
-                    if speed in ('N/A', '0'):
-                        eta = "   ETA: N/A"
-                    else:  # is float
-                        rem = (duration - msec) / float(speed)
-                        remaining = integer_to_time(round(rem))
-                        eta = f"   ETA: {remaining}"
-                else:
-                    eta = "   ETA: N/A"
-            else:
-                eta = ""
-            self.labprog.SetLabel(f'Processing: {str(int(percentage))}% {eta}')
-            self.labffmpeg.SetLabel(' | '.join(ffprog))
+            speed = None
+            if 'speed=' in output:
+                speed = output.split('speed=')[-1].strip().split('x')[0]
+                speed = None if speed in ('N/A', '0') else float(speed)
+            self.set_progress(msec, duration, speed, ffprog)
 
         else:
             self.append_messages(output)
     # ----------------------------------------------------------------------
 
-    def update_count(self, count, duration, end):
+    def update_progress(self, progress, duration, jobid=None):
+        """
+        Receive a progress record from thread by pubsub PROGRESS_EVT
+        protocol, one for each FFmpeg progress block, see
+        `progress_utils.progress_record` for the record keys.
+        The `jobid` arg is given by the threads running jobs
+        in parallel mode only.
+        """
+        if jobid is not None:
+            self.update_parallel(jobid, progress['time'], duration)
+            return
+
+        ffprog = [f"time: {integer_to_time(progress['time'])}",
+                  *progress_labels(progress)]
+        self.set_progress(progress['time'], duration,
+                          progress['speed'] or None, ffprog)
+    # ----------------------------------------------------------------------
+
+    def set_progress(self, msec, duration, speed, ffprog):
+        """
+        Set the bar progress value, the percentage and ETA label
+        and the FFmpeg statistics label. `msec` is the current time
+        position in milliseconds, `speed` the encoding speed factor
+        (None if not available), `ffprog` a list of statistics.
+        """
+        if msec > duration:
+            self.barprog.SetValue(duration)
+        elif msec == 0:
+            self.barprog.SetValue(self.barprog.GetValue())
+        else:
+            self.barprog.SetValue(msec)
+
+        percentage = round((msec / duration) * 100 if
+                           duration != 0 else 100)
+        if self.with_eta:
+            if speed:
+                rem = (duration - msec) / speed
+                remaining = integer_to_time(max(round(rem), 0))
+                eta = f"   ETA: {remaining}"
+            else:
+                eta = "   ETA: N/A"
+        else:
+            eta = ""
+        self.labprog.SetLabel(f'Processing: {str(int(percentage))}% {eta}')
+        self.labffmpeg.SetLabel(' | '.join(ffprog))
+    # ----------------------------------------------------------------------
+
+    def update_count(self, count, duration, end, jobid=None):
         """
         Receive messages from file count, loop or non-loop thread.
+        The `jobid` arg is given by the threads running jobs
+        in parallel mode only, which also send `end='JOBEND'`
+        when a job has no more passes to run.
         """
+        if jobid is not None and end != 'ERROR':
+            if end == 'JOBEND':  # no more passes of the job
+                self.update_parallel(jobid, last=True)
+                return
+            if end == 'DONE':
+                self.txtout.write('SUCCESS',
+                                  f"\n[Job {jobid}] {LogOut.MSG_done}")
+                self.update_parallel(jobid)
+                return
+            self.txtout.write('TXT0', f'\n[Job {jobid}] {count}\n')
+            self.update_parallel(jobid, 0, duration)
+            self.count += 1
+            return
+
         if end == 'DONE':
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['SUCCESS']))
-            self.txtout.AppendText(f"\n{LogOut.MSG_done}")
+            self.txtout.write('SUCCESS', f"\n{LogOut.MSG_done}")
             # set end values for percentage and ETA
             if self.with_eta:
                 newlab = self.labprog.GetLabel().split()
@@ -334,19 +440,12 @@ class LogOut(wx.Panel):
             return
 
         if end == 'ERROR':
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ERR1']))
-            self.txtout.AppendText(f'\nERROR: {count}\n')
+            self.txtout.write('ERR1', f'\nERROR: {count}\n')
             self.error = True
         else:
-            if self.maxrotate is not None:
-                if self.maxrotate == 1:
-                    self.maxrotate = 0
-                    self.txtout.Clear()
-                self.maxrotate += 1
             self.barprog.SetRange(duration)  # set overall duration range
             self.barprog.SetValue(0)  # reset bar progress
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
-            self.txtout.AppendText(f'\n{count}\n')
+            self.txtout.write('TXT0', f'\n{count}\n')
         self.count += 1
     # ----------------------------------------------------------------------
 
@@ -355,17 +454,14 @@ class LogOut(wx.Panel):
         At the end of the process
         """
         if self.error:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
-            self.txtout.AppendText(f"{LogOut.MSG_fatalerror}")
+            self.txtout.write('TXT0', f"{LogOut.MSG_fatalerror}")
             notification_area(_("Fatal Error !"), LogOut.MSG_fatalerror,
                               wx.ICON_ERROR)
         elif self.abort:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ABORT']))
-            self.txtout.AppendText(f"\n{LogOut.MSG_interrupted}\n")
+            self.txtout.write('ABORT', f"\n{LogOut.MSG_interrupted}\n")
         else:
             if not self.result:
                 endmsg = LogOut.MSG_completed
-                self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
                 notification_area(endmsg, _("Get your files at the "
                                             "destination you specified"),
                                   wx.ICON_INFORMATION,
@@ -379,12 +475,11 @@ class LogOut(wx.Panel):
                 else:
                     endmsg = LogOut.MSG_unfinished
 
-                self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
                 notification_area(endmsg, _("For more details please read the "
                                             "Current Log."), wx.ICON_ERROR)
 
             self.parent.statusbar_msg(_('...Finished'), None)
-            self.txtout.AppendText(f"\n{endmsg}\n")
+            self.txtout.write('TXT0', f"\n{endmsg}\n")
             self.barprog.SetValue(0)
 
             if filetotrash:  # move processed files to Videomass trash folder
@@ -392,7 +487,13 @@ class LogOut(wx.Panel):
                     trashdir = self.appdata['trashdir_loc']
                     delete_file_source(filetotrash, trashdir)  # filelist, dir
 
-        self.txtout.AppendText('\n')
+        self.txtout.write('TXT0', '\n')
+        stats = DISPATCHER.stats()
+        logwrite('', (f"[VIDEOMASS]: UI events: {stats['posted']} posted, "
+                      f"{stats['delivered']} delivered in "
+                      f"{stats['batches']} batches, {stats['merged']} "
+                      f"merged, {stats['dropped']} dropped"), self.logfile)
+        flush_logs(self.logfile)  # write the whole log at the end of job
         self.reset_all()
         pub.sendMessage("PROCESS TERMINATED", msg='Terminated')
     # ----------------------------------------------------------------------
@@ -419,7 +520,9 @@ class LogOut(wx.Panel):
         self.error = False
         self.result.clear()
         self.count = 0
-        self.maxrotate = 0
+        self.jobs.clear()
+        self.passes = [0, 0]
+        self.jobpasses.clear()
         self.with_eta = True  # restoring time remaining display
         self.btn_viewlog.Enable()
     # ----------------------------------------------------------------------
@@ -26,6 +26,7 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import time
+import re
 import os
 import sys
 import wx
@@ -40,7 +41,10 @@ from videomass.vdms_utils.utils import copy_on
 from videomass.vdms_utils.utils import copydir_recursively
 from videomass.vdms_utils.utils import copy_missing_data
 from videomass.vdms_utils.utils import update_timeseq_duration
-from videomass.vdms_io.checkup import check_files
+from videomass.vdms_io.checkup import (check_files,
+                                       check_inout,
+                                       output_pathnames,
+                                       )
 from videomass.vdms_dialogs import setting_profiles
 from videomass.vdms_dialogs.epilogue import Formula
 
@@ -171,8 +175,7 @@ class PrstPan(wx.Panel):
         # --- listctrl
         self.lctrl = wx.ListCtrl(self, wx.ID_ANY,
                                  style=wx.LC_REPORT
-                                 | wx.SUNKEN_BORDER
-                                 | wx.LC_SINGLE_SEL,
+                                 | wx.SUNKEN_BORDER,
                                  )
         # --- profile buttons
         grid_profiles = wx.FlexGridSizer(0, 4, 0, 5)
@@ -252,6 +255,9 @@ class PrstPan(wx.Panel):
         tip = _("Reset all presets to default values")
         self.btn_restorealldefault.SetToolTip(tip)
         self.btn_refresh.SetToolTip(_("Refresh the presets list"))
+        tip = (_('Select multiple one-pass profiles to encode each file '
+                 'to all of them at once, decoding it only once.'))
+        self.lctrl.SetToolTip(tip)
         tip = _('FFmpeg arguments for one-pass encoding')
         self.txt_1cmd.SetToolTip(tip)
         tip = _('FFmpeg arguments for two-pass encoding')
@@ -442,6 +448,10 @@ class PrstPan(wx.Panel):
         Event when deselecting a line by clicking
         in an empty space in the control list
         """
+        if cleardata and self.lctrl.GetSelectedItemCount():
+            self.load_profile(self.lctrl.GetItemText(
+                self.lctrl.GetFirstSelected()))
+            return
         if cleardata:
             self.txt_1cmd.SetValue("")
             self.txt_2cmd.SetValue("")
@@ -459,11 +469,20 @@ class PrstPan(wx.Panel):
         Event when selecting a profile in the lctrl,
         this update the request data of the objects.
         """
+        self.load_profile(event.GetText())  # event.GetText is a Name Profile
+    # ------------------------------------------------------------------#
+
+    def load_profile(self, selected):
+        """
+        Load the data of the `selected` profile name. The profile
+        buttons are only enabled with a single selected profile,
+        while multiple selected profiles are processed as a group
+        (see `get_group_args`).
+        """
         tofile = os.path.join(self.user_prst,
                               self.cmbx_prst.GetValue() + '.json'
                               )
         collections = json_data(tofile)
-        selected = event.GetText()  # event.GetText is a Name Profile
         self.txt_1cmd.SetValue("")
         self.txt_2cmd.SetValue("")
         self.pass_1_pre.SetValue("")
@@ -502,6 +521,12 @@ class PrstPan(wx.Panel):
             self.pass_2_pre.Disable()
 
         sel = f'{self.cmbx_prst.GetValue()} - {self.array[0]}'
+        if self.lctrl.GetSelectedItemCount() > 1:
+            self.btn_copyprofile.Disable()
+            self.btn_delprofile.Disable()
+            self.btn_editprofile.Disable()
+            sel = _('{0} - {1} profiles selected').format(
+                self.cmbx_prst.GetValue(), self.lctrl.GetSelectedItemCount())
         self.parent.statusbar_msg(sel, None)
     # ------------------------------------------------------------------#
 
@@ -963,6 +988,100 @@ class PrstPan(wx.Panel):
         return kwargs
     # ----------------------------------------------------------------#
 
+    def selected_profiles(self):
+        """
+        Returns the list of the data of the selected
+        profiles, in the order of the list control.
+        """
+        tofile = os.path.join(self.user_prst,
+                              self.cmbx_prst.GetValue() + '.json'
+                              )
+        names, item = [], self.lctrl.GetFirstSelected()
+        while item != -1:
+            names.append(self.lctrl.GetItemText(item))
+            item = self.lctrl.GetNextSelected(item)
+        if len(names) < 2:
+            return []
+        collections = json_data(tofile)
+        if collections == 'error':
+            return []
+        profiles = {prf.get('Name'): prf for prf in collections}
+        return [profiles[name] for name in names if name in profiles]
+    # ----------------------------------------------------------------#
+
+    def check_group(self, profiles, index=None):
+        """
+        Check the files of a group of profiles, each output name
+        is tagged with the profile name.
+        Returns a tuple ([file_sources], [[file_dest], ...]) with
+        a list of destinations for each profile, None otherwise.
+        """
+        if [prf for prf in profiles if prf['Second_pass'].strip()]:
+            self.parent.statusbar_msg(_("Two-pass profiles cannot be "
+                                        "grouped"),
+                                      PrstPan.YELLOW, PrstPan.BLACK)
+            return None
+        if len({' '.join(prf['Preinput_1'].split())
+                for prf in profiles}) > 1:
+            self.parent.statusbar_msg(_("Grouped profiles must have the "
+                                        "same input arguments"),
+                                      PrstPan.YELLOW, PrstPan.BLACK)
+            return None
+        if index is not None:
+            src = [self.parent.file_src[index]]
+            outfilenames = [self.parent.outputnames[index]]
+        else:
+            src = self.parent.file_src
+            outfilenames = self.parent.outputnames
+
+        for prf in profiles:
+            src = supported_formats(prf['Supported_list'], src)
+            if not src:
+                return None
+        dests = []
+        for prf in profiles:
+            tag = re.sub(r'[^\w-]+', '_', prf['Name']).strip('_')
+            outext = ('' if prf['Output_extension'] == 'copy'
+                      else prf['Output_extension'])
+            dests.append(output_pathnames(src,
+                                          self.appdata['outputdir'],
+                                          self.appdata['outputdir_asinput'],
+                                          self.appdata['filesuffix'],
+                                          outext,
+                                          [f'{name}_{tag}' for name
+                                           in outfilenames],
+                                          ))
+        if not check_inout(src, [dst for lst in dests for dst in lst]):
+            return None
+
+        return src, dests
+    # ----------------------------------------------------------------#
+
+    def get_group_args(self, profiles):
+        """
+        Set the ffmpeg command arguments of a 'Multi output'
+        item for the given group of profiles. The `outputs`
+        key is filled for each file.
+        """
+        preset = self.cmbx_prst.GetValue()
+        return {'type': 'Multi output', 'args': ['', ''],
+                'pre-input-1': " ".join(profiles[0]['Preinput_1'].split()),
+                'pre-input-2': '',
+                'preset name': f'Presets Manager - {preset}',
+                }
+    # ----------------------------------------------------------------#
+
+    def group_outputs(self, profiles, dests, index):
+        """
+        Returns the `outputs` list of a 'Multi output' item
+        of the file with the given `index`.
+        """
+        return [{'args': " ".join(prf['First_pass'].split()),
+                 'destination': dst[index],
+                 'profile': prf['Name'],
+                 } for prf, dst in zip(profiles, dests)]
+    # ----------------------------------------------------------------#
+
     def queue_mode(self):
         """
         build queue mode arguments. This method is
@@ -972,18 +1091,30 @@ class PrstPan(wx.Panel):
         logname = 'Queue Processing.log'
         index = self.parent.file_src.index(self.parent.filedropselected)
 
-        check = self.check_options(index)
-        if not check:
-            return None
+        profiles = self.selected_profiles()
+        if profiles:
+            check = self.check_group(profiles, index)
+            if not check:
+                return None
+            f_src, dests = check[0][0], check[1]
+            kwargs = self.get_group_args(profiles)
+            kwargs['outputs'] = self.group_outputs(profiles, dests, 0)
+            f_dest = kwargs['outputs'][0]['destination']
+            ext = profiles[0]['Output_extension']
+        else:
+            check = self.check_options(index)
+            if not check:
+                return None
+            f_src, f_dest = check[0][0], check[1][0]
+            kwargs = self.get_codec_args()
+            ext = self.array[5]
 
-        f_src, f_dest = check[0][0], check[1][0]
-        kwargs = self.get_codec_args()
         dur, ss, et = update_timeseq_duration(self.parent.time_seq,
                                               self.parent.duration
                                               )
         kwargs['start-time'], kwargs['end-time'] = ss, et
         kwargs['logname'] = logname
-        kwargs['extension'] = '' if self.array[5] == 'copy' else self.array[5]
+        kwargs['extension'] = '' if ext == 'copy' else ext
         kwargs['source'] = f_src
         kwargs['destination'] = f_dest
         kwargs["duration"] = dur[index]
@@ -998,17 +1129,28 @@ class PrstPan(wx.Panel):
         """
         logname = 'Presets Manager.log'
 
-        check = self.check_options()
-        if not check:
-            return None
+        profiles = self.selected_profiles()
+        if profiles:
+            check = self.check_group(profiles)
+            if not check:
+                return None
+            f_src, dests = check
+            f_dest = dests[0]
+            kwargs = self.get_group_args(profiles)
+            ext = profiles[0]['Output_extension']
+        else:
+            check = self.check_options()
+            if not check:
+                return None
+            f_src, f_dest = check
+            kwargs = self.get_codec_args()
+            ext = self.array[5]
 
-        f_src, f_dest = check
-        kwargs = self.get_codec_args()
         dur, ss, et = update_timeseq_duration(self.parent.time_seq,
                                               self.parent.duration
                                               )
         kwargs['start-time'], kwargs['end-time'] = ss, et
-        kwargs['extension'] = '' if self.array[5] == 'copy' else self.array[5]
+        kwargs['extension'] = '' if ext == 'copy' else ext
 
         batchlist = []
         for index in enumerate(self.parent.file_src):
@@ -1016,9 +1158,12 @@ class PrstPan(wx.Panel):
             kw['source'] = f_src[index[0]]
             kw['destination'] = f_dest[index[0]]
             kw['duration'] = dur[index[0]]
+            if profiles:
+                kw['outputs'] = self.group_outputs(profiles, dests, index[0])
             batchlist.append(kw)
 
-        keyval = self.update_dict(len(self.parent.file_src), **kwargs)
+        keyval = self.update_dict(len(self.parent.file_src), profiles,
+                                  **kwargs)
         ending = Formula(self, (700, 200),
                          self.parent.movetotrash,
                          self.parent.emptylist,
@@ -1033,12 +1178,17 @@ class PrstPan(wx.Panel):
         return None
     # ----------------------------------------------------------------#
 
-    def update_dict(self, cntmax, **kwa):
+    def update_dict(self, cntmax, profiles=None, **kwa):
         """
         Update information before send to epilogue
 
         """
         passes = '2' if self.array[3] else '1'
+        name, ext = self.array[0], self.array[5]
+        if profiles:
+            passes = '1'
+            name = ', '.join(prf['Name'] for prf in profiles)
+            ext = ', '.join(prf['Output_extension'] for prf in profiles)
 
         if not self.parent.time_seq:
             sst, endt = _('Same as source'), _('Same as source')
@@ -1055,6 +1205,6 @@ class PrstPan(wx.Panel):
                   "Encoding passes\nProfile Used\nOutput Format\n"
                   "Start of segment\nClip duration"))
         vals = (f"{cntmax}\n{dest}\n{kwa['preset name']}"
-                f"\n{passes}\n{self.array[0]}\n{self.array[5]}\n{sst}\n{endt}"
+                f"\n{passes}\n{name}\n{ext}\n{sst}\n{endt}"
                 )
         return {'key': keys, 'val': vals}
@@ -33,6 +33,7 @@ from videomass.vdms_utils.get_bmpfromsvg import get_bmp
 from videomass.vdms_dialogs.epilogue import Formula
 from videomass.vdms_dialogs.filter_scale import Scale
 from videomass.vdms_threads.ffprobe import ffprobe
+from videomass.vdms_io.probe_cache import probe_cache
 from videomass.vdms_utils.utils import trailing_name_with_prog_digit
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
@@ -456,7 +457,9 @@ class SequenceToVideo(wx.Panel):
                 return
             pathname = fdlg.GetPath()
 
-        probe = ffprobe(pathname, self.ffprobe_cmd, hide_banner=None)
+        probe = ffprobe(pathname, self.ffprobe_cmd,
+                        cache=probe_cache(self.appdata['cachedir']),
+                        hide_banner=None)
 
         if probe[1]:  # some error
             msg = _("Invalid file: '{}'\n\n{}").format(pathname, probe[1])
@@ -96,6 +96,26 @@ class ConfigManager:
     ffplay_loglev (str):
         -loglevel one of `quiet`, `fatal`, `error`, `warning`, `info`
 
+    parallel_jobs (bool):
+        If True, batch and queue items are processed by a pool of
+        parallel FFmpeg jobs instead of one at a time.
+        Default is False.
+
+    max_parallel_jobs (int):
+        Max number of FFmpeg jobs running at once when
+        `parallel_jobs` or `chunked_encoding` is True. 0 means
+        the number of CPU cores (default).
+
+    chunked_encoding (bool):
+        If True, one-pass video encodings are split into segments
+        encoded in parallel by up to `max_parallel_jobs` FFmpeg
+        processes and then joined. Default is False.
+
+    ffprobe_workers (int):
+        Number of files probed at once by ffprobe when they are
+        added to the file list, default is 4. Use lower values
+        for slow network shares.
+
     warnexiting (bool):
         with True displays a message dialog before exiting the app
 
@@ -221,7 +241,7 @@ class ConfigManager:
         column width in the format code panel (ytdownloader).
 
     """
-    VERSION = 8.0
+    VERSION = 8.1
     DEFAULT_OPTIONS = {"confversion": VERSION,
                        "shutdown": False,
                        "sudo_password": "",
@@ -236,6 +256,10 @@ class ConfigManager:
                        "ffplay_cmd": "",
                        "ffplay_islocal": False,
                        "ffplay_loglev": "-loglevel error",
+                       "parallel_jobs": False,
+                       "max_parallel_jobs": 0,
+                       "chunked_encoding": False,
+                       "ffprobe_workers": 4,
                        "ffprobe_cmd": "",
                        "ffprobe_islocal": False,
                        "warnexiting": True,
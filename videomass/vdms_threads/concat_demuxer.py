@@ -29,9 +29,9 @@ import time
 import subprocess
 import platform
 import wx
-from pubsub import pub
 from videomass.vdms_utils.utils import Popen
 from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_threads.event_dispatcher import post_message
 if not platform.system() == 'Windows':
     import shlex
 
@@ -85,8 +85,7 @@ class ConcatDemuxer(Thread):
                     f'details see Current Log.\nDestination: '
                     f'"{self.kwa["destination"]}"')
 
-        wx.CallAfter(pub.sendMessage,
-                     "COUNT_EVT",
+        post_message("COUNT_EVT",
                      count=countevt,
                      duration=self.kwa['duration'],
                      end='CONTINUE',
@@ -104,8 +103,8 @@ class ConcatDemuxer(Thread):
                        encoding=self.appdata['encoding'],
                        ) as proc:
                 for line in proc.stderr:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
+                    post_message("UPDATE_EVT",
+                                 merge='time=' in line,
                                  output=line,
                                  duration=self.kwa['duration'],
                                  status=0,
@@ -114,22 +113,19 @@ class ConcatDemuxer(Thread):
                         proc.stdin.write('q')  # stop ffmpeg
                         out = proc.communicate()[1]
                         proc.wait()
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
+                        post_message("UPDATE_EVT",
                                      output='STOP',
                                      duration=self.kwa['duration'],
                                      status=1,
                                      )
                         logwrite('', out, self.logfile)
                         time.sleep(1)
-                        wx.CallAfter(pub.sendMessage, "END_EVT",
-                                     filetotrash=filedone)
+                        post_message("END_EVT", filetotrash=filedone)
                         return
 
                 if proc.wait():  # error
                     out = proc.communicate()[1]
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
+                    post_message("UPDATE_EVT",
                                  output='FAILED',
                                  duration=self.kwa['duration'],
                                  status=proc.wait(),
@@ -140,15 +136,13 @@ class ConcatDemuxer(Thread):
 
                 else:  # Done
                     filedone = self.kwa["source"]
-                    wx.CallAfter(pub.sendMessage,
-                                 "COUNT_EVT",
+                    post_message("COUNT_EVT",
                                  count='',
                                  duration='',
                                  end='DONE'
                                  )
         except (OSError, FileNotFoundError) as err:
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
+            post_message("COUNT_EVT",
                          count=err,
                          duration=0,
                          end='ERROR',
@@ -156,7 +150,7 @@ class ConcatDemuxer(Thread):
             logwrite('', err, self.logfile)
 
         time.sleep(.5)
-        wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=filedone)
+        post_message("END_EVT", filetotrash=filedone)
     # --------------------------------------------------------------------#
 
     def stop(self):
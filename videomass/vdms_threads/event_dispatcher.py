@@ -0,0 +1,197 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: event_dispatcher.py
+Porpose: coalescing and rate-limited delivery of the pubsub messages
+         sent by the worker threads to the GUI.
+Compatibility: Python3, wxPython4 Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Thread, Condition
+import time
+import wx
+from pubsub import pub
+
+
+def is_droppable(topic, kwargs):
+    """
+    Returns True if the message of the given `topic` and
+    data `kwargs` is a log line which can be dropped when
+    the GUI is not able to keep up.
+    """
+    return topic == 'UPDATE_EVT' and kwargs.get('status') == 0
+# ------------------------------------------------------------------------#
+
+
+class EventDispatcher:
+    """
+    Collects the pubsub messages posted by any worker thread and
+    delivers them to the GUI thread in batches, using a single
+    `wx.CallAfter` per batch at a fixed maximum rate (`RATE`
+    deliveries per second), instead of one `wx.CallAfter` for
+    each message.
+
+    The order of the posted messages is preserved within and
+    across batches. Messages posted with `merge=True` (e.g.
+    progress updates) are coalesced: only the latest message
+    of the same topic and `jobid` waiting for delivery is kept.
+    If the GUI thread is not able to keep up, the log lines (i.e.
+    UPDATE_EVT messages with `status=0`) exceeding the `maxpending`
+    limit are dropped, while the control messages (e.g. COUNT_EVT,
+    END_EVT or a failure status) are always delivered.
+
+    USAGE:
+        >>> from videomass.vdms_threads.event_dispatcher import (
+                post_message)
+        >>> post_message("UPDATE_EVT", merge='time=' in line,
+                         output=line, duration=0, status=0)
+        >>> post_message("PROGRESS_EVT", merge=True, progress=record,
+                         duration=0, jobid=None)
+    """
+    RATE = 15  # max number of deliveries per second
+    MAXPENDING = 50000  # max number of messages waiting for delivery
+
+    def __init__(self, rate=RATE, maxpending=MAXPENDING):
+        """
+        Attributes defined here:
+
+        self.pending: messages waiting for delivery as
+                      (topic, kwargs) tuples, None if merged
+        self.merging: {(topic, jobid): index} of the messages
+                      in `self.pending` that can be merged
+        self.counters: statistics of the dispatched messages
+        """
+        self.interval = 1 / rate
+        self.maxpending = maxpending
+        self.cond = Condition()
+        self.pending = []
+        self.merging = {}
+        self.counters = {}
+        self.reset_counters()
+        self.thread = None
+    # ----------------------------------------------------------------#
+
+    def reset_counters(self):
+        """
+        Reset the statistics of the dispatched messages
+        """
+        with self.cond:
+            self.counters = {'posted': 0, 'delivered': 0, 'merged': 0,
+                             'dropped': 0, 'batches': 0}
+    # ----------------------------------------------------------------#
+
+    def stats(self):
+        """
+        Returns a copy of the counters of the posted, delivered,
+        merged and dropped messages and of the delivered batches.
+        """
+        with self.cond:
+            return dict(self.counters)
+    # ----------------------------------------------------------------#
+
+    def post(self, topic, merge=False, **kwargs):
+        """
+        Post a message of the given pubsub `topic` with the
+        given message data `kwargs`. This method can be called
+        from any thread and never blocks the caller.
+        """
+        with self.cond:
+            if not self.enqueue(topic, merge, kwargs):
+                return
+            if self.thread is None:
+                self.thread = Thread(target=self.dispatch, daemon=True)
+                self.thread.start()
+            self.cond.notify()
+    # ----------------------------------------------------------------#
+
+    def enqueue(self, topic, merge, kwargs):
+        """
+        Add a message to the pending messages, merging or
+        dropping it as described in the class docstring.
+        Returns False if the message was dropped.
+        """
+        with self.cond:
+            self.counters['posted'] += 1
+            if merge:
+                key = (topic, kwargs.get('jobid'))
+                index = self.merging.get(key)
+                if index is not None:
+                    self.pending[index] = None  # replaced by the latest
+                    self.counters['merged'] += 1
+                self.merging[key] = len(self.pending)
+
+            elif (len(self.pending) >= self.maxpending
+                  and is_droppable(topic, kwargs)):
+                self.counters['dropped'] += 1
+                return False
+
+            self.pending.append((topic, kwargs))
+            return True
+    # ----------------------------------------------------------------#
+
+    def take_batch(self):
+        """
+        Returns the pending messages as a batch to deliver
+        and empty the pending list.
+        """
+        with self.cond:
+            batch, self.pending = self.pending, []
+            self.merging.clear()
+            return batch
+    # ----------------------------------------------------------------#
+
+    def dispatch(self):
+        """
+        Dispatching loop, runs in a daemon thread.
+        """
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+                batch = self.take_batch()
+            wx.CallAfter(self.deliver, batch)
+            time.sleep(self.interval)
+    # ----------------------------------------------------------------#
+
+    def deliver(self, batch):
+        """
+        Send the messages of a batch in order, runs on
+        the GUI thread.
+        """
+        messages = [item for item in batch if item is not None]
+        with self.cond:
+            self.counters['delivered'] += len(messages)
+            self.counters['batches'] += 1
+
+        for topic, kwargs in messages:
+            pub.sendMessage(topic, **kwargs)
+# ------------------------------------------------------------------------#
+
+
+DISPATCHER = EventDispatcher()
+
+
+def post_message(topic, merge=False, **kwargs):
+    """
+    Post a pubsub message to the GUI through the shared
+    dispatcher instance, see `EventDispatcher.post`.
+    """
+    DISPATCHER.post(topic, merge, **kwargs)
@@ -24,25 +24,55 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
-from threading import Thread
+from threading import Thread, Lock, get_ident
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from shutil import rmtree
+import os
 import time
 import subprocess
 import platform
 import wx
-from pubsub import pub
-from videomass.vdms_utils.utils import Popen
-from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_utils.utils import (Popen,
+                                        time_to_integer,
+                                        integer_to_time,
+                                        format_bytes,
+                                        )
+from videomass.vdms_utils.job_scheduler import JobScheduler, estimate_cost
+from videomass.vdms_utils.multiout_utils import multi_output_args
+from videomass.vdms_utils.chunk_utils import (chunk_ranges,
+                                              concat_list,
+                                              check_chunked_output,
+                                              frame_rate,
+                                              )
+from videomass.vdms_threads.ffprobe import ffprobe, ffprobe_batch
+from videomass.vdms_io.probe_cache import probe_cache
+from videomass.vdms_io.keyframe_index import keyframe_indexer
+from videomass.vdms_io.make_filelog import logwrite, flush_logs
+from videomass.vdms_io.pass_stats import pass_stats
+from videomass.vdms_io.job_journal import RUNNING, DONE, FAILED, PENDING
+from videomass.vdms_io.loudness_store import (loudness_store,
+                                              loudnorm_args,
+                                              loudnorm_measured,
+                                              loudnorm_retarget,
+                                              loudnorm_targets,
+                                              measured_filter,
+                                              )
+from videomass.vdms_utils.progress_utils import PROGRESS_ARGS, progress_blocks
+from videomass.vdms_threads.event_dispatcher import post_message
 if not platform.system() == 'Windows':
     import shlex
 
 
 def ffmpeg_cmd_args():
     """
-    Get ffmpeg command and default args
+    Get ffmpeg command and default args.
+    Progress statistics are written as key=value blocks on
+    the standard output instead of the standard error.
     """
     get = wx.GetApp()
     appdata = get.appset
-    defargs = f'-y -stats -hide_banner {appdata["ffmpeg_loglev"]}'
+    defargs = (f'-y {PROGRESS_ARGS} -hide_banner '
+               f'{appdata["ffmpeg_loglev"]}')
     return {"ffmpeg_cmd": appdata["ffmpeg_cmd"],
             "ffmpeg-default-args": defargs}
 # ----------------------------------------------------------------------
@@ -182,6 +212,34 @@ def simple_one_pass(*args, **kwa):
 # ----------------------------------------------------------------------
 
 
+def multi_output(*args, **kwa):
+    """
+    Command builder for one pass to multiple outputs.
+    The segment duration is given as input option, so
+    that it applies to all outputs.
+    """
+    cmd = ffmpeg_cmd_args()
+    pass1 = (f'"{cmd["ffmpeg_cmd"]}" '
+             f'{cmd["ffmpeg-default-args"]} '
+             f'{kwa.get("pre-input-1", "")} '
+             f'{kwa["start-time"]} '
+             f'{kwa["end-time"]} '
+             f'-i "{kwa["source"]}" '
+             f'{multi_output_args(kwa["outputs"])}'
+             )
+    dests = '\n'.join(f'Destination: "{out["destination"]}"'
+                      for out in kwa['outputs'])
+    count1 = (f'File {args[0]}/{args[1]} - {len(kwa["outputs"])} outputs'
+              f'\nSource: "{kwa["source"]}"\n{dests}')
+    stamp1 = f'{count1}\n\n[COMMAND]:\n{pass1}'
+
+    if not platform.system() == 'Windows':
+        pass1 = shlex.split(pass1)
+
+    return {'pass1': pass1, 'count1': count1, 'stamp1': stamp1}
+# ----------------------------------------------------------------------
+
+
 def one_pass_ebu(*args, **kwa):
     """
     Command builder for one pass ebu
@@ -250,24 +308,51 @@ class FFmpeg(Thread):
     It is able to pipe up to two FFmpeg subprocesses to execute
     tasks in succession using command concatenation.
 
+    If a number of parallel jobs greater than one is given, the
+    items are dispatched to a pool of worker threads, each of which
+    runs its own FFmpeg subprocesses. The passes of each item are
+    always executed in succession on the same worker. In this mode
+    every pubsub message also carries the `jobid` of the item, so
+    that the receiver can track the progress of each job. Each item
+    is started when its estimated cost fits the available resources
+    (see `schedule`).
+
+    The video of a 'Chunked' item is split into segments encoded
+    at the same time by parallel FFmpeg subprocesses, which are
+    then joined by the concat demuxer (see `chunked_passes`).
+
+    A 'Multi output' item encodes its source to several outputs
+    with a single FFmpeg subprocess (see `multi_passes`).
+
     NOTE capturing output in real-time (Windows, Unix):
     https://stackoverflow.com/questions/1388753/how-to-get-output-
     from-subprocess-popen-proc-stdout-readline-blocks-no-dat?rq=1
 
     """
+    BACKOFF = 2  # seconds between the admission attempts
+
     def __init__(self, *args):
         """
         Called from `long_processing_task.topic_thread`.
         Also see `main_frame.switch_to_processing`.
 
+        The optional third argument is the max number of
+        parallel jobs (default is 1, i.e. sequential), the
+        optional fourth argument a `JobJournal` instance which
+        records the state of each item (e.g. of a queue).
         """
         get = wx.GetApp()  # get data from bootstrap
         self.appdata = get.appset
         self.stop_work_thread = False  # set stop ffmpeg
+        self.fatal_error = False  # set on OSError in parallel mode
         self.count = 0  # count for loop
         self.logfile = args[0]  # log filename
         self.kwargs = args[1]  # it is a list of dictionaries
         self.nargs = len(self.kwargs)  # how many items...
+        self.jobs = args[2] if len(args) > 2 else 1  # parallel jobs
+        self.journal = args[3] if len(args) > 3 else None  # job journal
+        self.exitstatus = {}  # {thread id: last exit status}
+        self.filedone = []  # processed source files
 
         Thread.__init__(self)
         self.start()
@@ -276,185 +361,690 @@ class FFmpeg(Thread):
         """
         Run the separated thread.
         """
-        filedone = []
-        for kwa in self.kwargs:
-            self.count += 1
-            if kwa['type'] == 'One pass':
-                model = simple_one_pass(self.count, self.nargs, **kwa)
+        if self.journal:
+            self.journal.start(self.kwargs)
+        try:
+            self.run_items()
+        finally:
+            if self.journal:
+                self.journal.close()
+    # --------------------------------------------------------------------#
 
-            elif kwa['type'] == 'Two pass EBU':
-                model = one_pass_ebu(self.count, self.nargs, **kwa)
+    def run_items(self):
+        """
+        Process the items in succession or in parallel.
+        """
+        if self.jobs > 1 and self.nargs > 1:
+            self.schedule()
+            if self.stop_work_thread:
+                time.sleep(.5)
+                post_message("END_EVT", filetotrash=None)
+                return
+        else:
+            for kwa in self.kwargs:
+                self.count += 1
+                ret = self.processing(self.count, kwa)
+                if ret == 'STOP':
+                    time.sleep(.5)
+                    post_message("END_EVT", filetotrash=None)
+                    return
+                if ret == 'ERROR':
+                    break
+                if ret is None:  # unknown type
+                    return
 
-            elif kwa['type'] == 'Two pass VIDSTAB':
-                model = one_pass_stab(self.count, self.nargs, **kwa)
+        time.sleep(.5)
+        post_message("END_EVT", filetotrash=self.filedone)
+    # --------------------------------------------------------------------#
 
-            elif kwa['type'] == 'Two pass':
-                model = one_pass(self.count, self.nargs, **kwa)
+    def job_costs(self):
+        """
+        Returns the list of the estimated costs of the items,
+        see `job_scheduler.estimate_cost`. The sources are
+        probed through the ffprobe cache.
+        """
+        probes = ffprobe_batch([kwa['source'] for kwa in self.kwargs],
+                               self.appdata['ffprobe_cmd'],
+                               self.appdata['encoding'],
+                               probe_cache(self.appdata['cachedir']),
+                               hide_banner=None, pretty=None)
+        return [estimate_cost(kwa, probe[0], self.chunk_workers()
+                              if kwa['type'] == 'Chunked' else 1)
+                for kwa, probe in zip(self.kwargs, probes)]
+    # --------------------------------------------------------------------#
+
+    def schedule(self):
+        """
+        Run the items on a pool of `self.jobs` workers. Each item
+        is admitted by a `JobScheduler` when its estimated cost fits
+        the CPU and memory budget and the machine is not saturated,
+        otherwise it waits. Items are admitted in order, but a
+        cheaper item can start before a costly one which is waiting.
+        The scheduler decisions are written in the log file.
+        """
+        sched = JobScheduler(self.jobs)
+        logwrite('', f'[VIDEOMASS]: Scheduler: {sched.budget()}',
+                 self.logfile)
+        pending = list(zip(range(1, self.nargs + 1), self.kwargs,
+                           self.job_costs()))
+        running, deferred = {}, {}
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while pending or running:
+                if self.stop_work_thread or self.fatal_error:
+                    pending.clear()
+                for item in list(pending):
+                    count, kwa, cost = item
+                    admitted, reason = sched.admit(count, cost)
+                    if admitted:
+                        pending.remove(item)
+                        future = pool.submit(self.processing, count,
+                                             kwa, count)
+                        running[future] = count
+                        msg = f'job {count} started ({reason})'
+                    elif deferred.get(count) != reason:
+                        deferred[count] = reason
+                        msg = f'job {count} waiting ({reason})'
+                    else:
+                        continue
+                    logwrite('', (f'[VIDEOMASS]: Scheduler: {msg}, cost: '
+                                  f'cpu {cost["cpu"]:.1f}, mem '
+                                  f'{format_bytes(cost["mem"])}; '
+                                  f'{sched.status()}'), self.logfile)
+
+                done = wait(running, timeout=self.BACKOFF,
+                            return_when=FIRST_COMPLETED)[0]
+                for future in done:
+                    count = running.pop(future)
+                    sched.release(count)
+                    try:
+                        future.result()
+                    except Exception as err:  # e.g. malformed item
+                        self.job_failed(count, err)
+    # --------------------------------------------------------------------#
+
+    def job_failed(self, count, err):
+        """
+        Report the failure of the job `count` which raised
+        an unexpected exception `err` in a worker of the pool.
+        """
+        msg = (f'[VIDEOMASS]: Job {count} failed unexpectedly: '
+               f'{type(err).__name__}: {err}')
+        post_message("UPDATE_EVT",
+                     output='FAILED',
+                     duration=0,
+                     status=1,
+                     jobid=count,
+                     )
+        logwrite('', msg, self.logfile)
+        flush_logs(self.logfile)
+        if self.journal:
+            self.journal.mark(count, FAILED)
+    # --------------------------------------------------------------------#
+
+    def processing(self, count, kwa, jobid=None):
+        """
+        Process a single item of the list, running its first
+        pass and, if any, its second pass.
+
+        If `jobid` is given, the item is processed by a worker
+        of the pool: source and destination are made absolute
+        and the subprocesses run into a private working directory,
+        so that pass log files of concurrent jobs do not collide.
+
+        Returns 'DONE', 'FAILED', 'STOP', 'ERROR', 'SKIP' or None
+        if the item type is unknown.
+        """
+        if self.stop_work_thread or self.fatal_error:
+            return 'SKIP'
+
+        workdir = None
+        if jobid is not None:
+            kwa = {**kwa, 'source': os.path.abspath(kwa['source']),
+                   'destination': os.path.abspath(kwa['destination'])}
+            workdir = os.path.abspath(os.path.join(self.appdata['cachedir'],
+                                                   'tmp', f'job-{jobid}'))
+            os.makedirs(workdir, exist_ok=True)
+        if self.journal:
+            self.journal.mark(count, RUNNING)
+        try:
+            status = self.item_passes(count, kwa, jobid, workdir)
+
+        except (OSError, FileNotFoundError) as err:
+            self.fatal_error = True
+            post_message("COUNT_EVT",
+                         count=err,
+                         duration=0,
+                         end='ERROR',
+                         jobid=jobid,
+                         )
+            logwrite('', err, self.logfile)
+            flush_logs(self.logfile)
+            status = 'ERROR'
+
+        finally:
+            if workdir:
+                rmtree(workdir, ignore_errors=True)
+
+        if self.journal:
+            exitcode = self.exitstatus.pop(get_ident(), None)
+            if status == 'DONE':
+                self.journal.mark(count, DONE, 0)
+            elif status == 'STOP':
+                self.journal.mark(count, PENDING, exitcode)
             else:
-                return
+                self.journal.mark(count, FAILED, exitcode)
+        if jobid is not None:
+            post_message("COUNT_EVT",
+                         count='',
+                         duration=0,
+                         end='JOBEND',
+                         jobid=jobid,
+                         )
+        return status
+    # --------------------------------------------------------------------#
+
+    def item_passes(self, count, kwa, jobid, workdir):
+        """
+        Run the passes of the given item in succession.
+        See `processing` method for returned values.
+        Raise: `OSError` or `FileNotFoundError`
+        """
+        summary, measured, statskey = None, None, None
+        stats = pass_stats(self.appdata['cachedir'])
+        if kwa['type'] == 'Chunked':
+            return self.chunked_passes(count, kwa, jobid, workdir)
+        if kwa['type'] == 'Multi output':
+            return self.multi_passes(count, kwa, jobid, workdir)
+
+        if kwa['type'] == 'One pass':
+            model = simple_one_pass(count, self.nargs, **kwa)
+
+        elif kwa['type'] == 'Two pass EBU':
+            model = one_pass_ebu(count, self.nargs, **kwa)
+            summary = model['summary']
+            measured = self.known_loudness(kwa)
+
+        elif kwa['type'] == 'Two pass VIDSTAB':
+            model = one_pass_stab(count, self.nargs, **kwa)
 
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
+        elif kwa['type'] == 'Two pass':
+            model = one_pass(count, self.nargs, **kwa)
+            if kwa['args'][1]:
+                statskey = stats.make_key(kwa, self.appdata['ffmpeg_cmd'])
+        else:
+            return None
+
+        rundir = workdir or os.getcwd()
+        msg = None
+        if measured and 'vidstabdetect' not in kwa['args'][0]:
+            msg = '[VIDEOMASS]: Loudness measurements known, pass skipped.'
+        elif statskey and stats.restore(statskey, rundir):
+            msg = '[VIDEOMASS]: Pass one statistics found, pass skipped.'
+        if msg:
+            post_message("COUNT_EVT",
+                         count=f"{model['count1']}\n\n{msg}",
+                         duration=kwa['duration'],
+                         end='CONTINUE',
+                         jobid=jobid,
+                         )
+            logwrite(model['stamp1'], '', self.logfile)
+            logwrite('', msg, self.logfile)
+        else:
+            post_message("COUNT_EVT",
                          count=model['count1'],
                          duration=kwa['duration'],
                          end='CONTINUE',
+                         jobid=jobid,
                          )
             logwrite(model['stamp1'], '', self.logfile)
-            try:
-                with Popen(model['pass1'],
-                           stderr=subprocess.PIPE,
-                           stdin=subprocess.PIPE,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding=self.appdata['encoding'],
-                           ) as proc1:
-
-                    for line in proc1.stderr:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output=line,
-                                     duration=kwa['duration'],
-                                     status=0
-                                     )
-                        if self.stop_work_thread:
-                            proc1.stdin.write('q')  # stop ffmpeg
-                            out = proc1.communicate()[1]
-                            proc1.wait()
-                            wx.CallAfter(pub.sendMessage,
-                                         "UPDATE_EVT",
-                                         output='STOP',
-                                         duration=kwa['duration'],
-                                         status=1,
-                                         )
-                            logwrite('', out, self.logfile)
-                            time.sleep(.5)
-                            wx.CallAfter(pub.sendMessage, "END_EVT",
-                                         filetotrash=None)
-                            return
-
-                        if kwa["type"] == 'Two pass EBU':
-                            summary = model['summary']
-                            for k in summary:
-                                if line.startswith(k):
-                                    summary[k] = line.split(':')[1].split()[0]
-
-                    if proc1.wait():  # ..Failed
-                        out = proc1.communicate()[1]
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output='FAILED',
-                                     duration=kwa['duration'],
-                                     status=proc1.wait(),
-                                     )
-                        logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
-                                      f"{proc1.wait()} {out}"), self.logfile)
-                        time.sleep(1)
-                        continue
+            started = time.time() - 2  # coarse file system timestamps
+            status = self.run_pass(model['pass1'], kwa, jobid,
+                                   workdir, summary)
+            if status == 'STOP':
+                return status
+            if status:  # ..Failed
+                return 'FAILED'
+            if summary is not None:
+                measured = self.store_loudness(kwa, summary) or measured
+            if statskey:
+                stats.store(statskey, rundir, started)
 
-            except (OSError, FileNotFoundError) as err:
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count=err,
-                             duration=0,
-                             end='ERROR'
-                             )
-                logwrite('', err, self.logfile)
-                break
-
-            if proc1.wait() == 0:  # ..Finished
-                if not kwa["args"][1]:
-                    filedone.append(kwa["source"])
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count='',
+        # ..Finished
+        if not kwa["args"][1]:
+            self.filedone.append(kwa["source"])
+        post_message("COUNT_EVT",
+                     count='',
+                     duration=kwa['duration'],
+                     end='DONE',
+                     jobid=jobid,
+                     )
+        if not kwa["args"][1]:
+            return 'DONE'
+
+        # --------------- second pass ----------------#
+        if kwa["type"] == 'Two pass EBU':
+            if measured is None:  # not parsed, let ffmpeg fail
+                measured = {'measured_I': None, 'measured_LRA': None,
+                            'measured_TP': None, 'measured_thresh': None,
+                            'offset': None}
+            filters = (f'{kwa["EBU"]}{measured_filter(measured)}'
+                       f':linear=true:dual_mono=true'
+                       )
+            model = two_pass_ebu(count, self.nargs, filters, **kwa)
+            time.sleep(.5)
+
+        elif kwa['type'] == 'Two pass VIDSTAB':
+            model = two_pass_stab(count, self.nargs, **kwa)
+
+        elif kwa['type'] == 'Two pass':
+            model = two_pass(count, self.nargs, **kwa)
+
+        post_message("COUNT_EVT",
+                     count=model['count2'],
+                     duration=kwa['duration'],
+                     end='CONTINUE',
+                     jobid=jobid,
+                     )
+        logwrite(model['stamp2'], '', self.logfile)
+        status = self.run_pass(model['pass2'], kwa, jobid, workdir)
+        if status == 'STOP':
+            return status
+        if status:  # ..Failed
+            return 'FAILED'
+
+        # ..Finished
+        self.filedone.append(kwa["source"])
+        post_message("COUNT_EVT",
+                     count='',
+                     duration=kwa['duration'],
+                     end='DONE',
+                     jobid=jobid,
+                     )
+        return 'DONE'
+    # --------------------------------------------------------------------#
+
+    def multi_passes(self, count, kwa, jobid, workdir):
+        """
+        Run a 'Multi output' item: the source is decoded once
+        and encoded to each output of the `outputs` list with
+        its own args. The result of each output is reported
+        separately; the item is 'FAILED' if any output failed.
+        See `processing` method for returned values.
+        Raise: `OSError` or `FileNotFoundError`
+        """
+        outputs = [{**out, 'destination': os.path.abspath(out['destination'])}
+                   for out in kwa['outputs']]
+        kwa = {**kwa, 'outputs': outputs}
+        model = multi_output(count, self.nargs, **kwa)
+        post_message("COUNT_EVT",
+                     count=model['count1'],
+                     duration=kwa['duration'],
+                     end='CONTINUE',
+                     jobid=jobid,
+                     )
+        logwrite(model['stamp1'], '', self.logfile)
+        status = self.run_pass(model['pass1'], kwa, jobid, workdir)
+        if status == 'STOP':
+            return status
+
+        failed = 0
+        for num, out in enumerate(outputs, start=1):
+            done = (not status and os.path.isfile(out['destination'])
+                    and os.path.getsize(out['destination']) > 0)
+            failed += not done
+            msg = (f'[VIDEOMASS]: Output {num}/{len(outputs)} '
+                   f'{"SUCCESS" if done else "FAILED"}: '
+                   f'"{out["destination"]}"')
+            post_message("UPDATE_EVT",
+                         output=f'{msg}\n',
+                         duration=kwa['duration'],
+                         status=0,
+                         jobid=jobid,
+                         )
+            logwrite('', msg, self.logfile)
+        if status:  # ..Failed
+            return 'FAILED'
+        if failed:
+            post_message("UPDATE_EVT",
+                         output='FAILED',
+                         duration=kwa['duration'],
+                         status=1,
+                         jobid=jobid,
+                         )
+            return 'FAILED'
+
+        # ..Finished
+        self.filedone.append(kwa["source"])
+        post_message("COUNT_EVT",
+                     count='',
+                     duration=kwa['duration'],
+                     end='DONE',
+                     jobid=jobid,
+                     )
+        return 'DONE'
+    # --------------------------------------------------------------------#
+
+    def chunk_workers(self):
+        """
+        Returns the number of segments of a chunked item, i.e.
+        the share of the max parallel jobs of each item.
+        """
+        njobs = self.appdata['max_parallel_jobs'] or os.cpu_count() or 1
+        return max(1, njobs // self.jobs)
+
+    def chunked_passes(self, count, kwa, jobid, workdir):
+        """
+        Run the passes of a 'Chunked' item: the first pass encodes
+        the video (`args[0]`) of the source split at its key frames
+        into segments by parallel FFmpeg subprocesses, the second
+        pass joins the segments losslessly with the concat demuxer,
+        adding audio, subtitles and metadata from the source with
+        the output args (`args[1]`). Finally, the frame count and
+        duration of the output file are verified.
+
+        If the source is too short to be split, the item is
+        processed as a 'One pass' item.
+        See `processing` method for returned values.
+        Raise: `OSError` or `FileNotFoundError`
+        """
+        offset = (time_to_integer(kwa['start-time'].split()[1])
+                  if kwa['start-time'] else 0)
+        index = keyframe_indexer(self.appdata['cachedir']).get(
+            kwa['source'], self.appdata['ffprobe_cmd'],
+            self.appdata['encoding'])
+        keyframes = [round(sec * 1000) - offset
+                     for sec in (index.times if index else ())]
+        ranges = chunk_ranges(kwa['duration'], self.chunk_workers(),
+                              [pos for pos in keyframes if pos > 0])
+        if len(ranges) < 2:
+            kwa = {**kwa, 'type': 'One pass',
+                   'args': [f'{kwa["args"][0]} {kwa["args"][1]}', '']}
+            return self.item_passes(count, kwa, jobid, workdir)
+
+        tmpdir = os.path.abspath(workdir or os.path.join(
+            self.appdata['cachedir'], 'tmp', f'chunks-{count}'))
+        os.makedirs(tmpdir, exist_ok=True)
+        try:
+            return self.chunked_encode(count, kwa, jobid, tmpdir,
+                                       offset, ranges)
+        finally:
+            if not workdir:
+                rmtree(tmpdir, ignore_errors=True)
+
+    def chunked_encode(self, count, kwa, jobid, tmpdir, offset, ranges):
+        """
+        Encode the segments of a 'Chunked' item and join them,
+        see `chunked_passes`.
+        """
+        cmd = ffmpeg_cmd_args()
+        chunks = [os.path.join(tmpdir, f'chunk-{num:04d}.mkv')
+                  for num in range(len(ranges))]
+        times, frames = [0] * len(ranges), [0] * len(ranges)
+        lock = Lock()
+
+        def progress_of(num):
+            """
+            Returns the progress callable of the segment `num`,
+            which sends the overall progress of all segments.
+            """
+            def onprogress(progress):
+                with lock:
+                    times[num] = progress['time']
+                    frames[num] = progress['frame'] or frames[num]
+                    overall = {**progress, 'time': sum(times),
+                               'frame': sum(frames)}
+                post_message("PROGRESS_EVT",
+                             merge=True,
+                             progress=overall,
                              duration=kwa['duration'],
-                             end='DONE'
+                             jobid=jobid,
                              )
+            return onprogress
 
-            if not kwa["args"][1]:
-                continue
-
-            # --------------- second pass ----------------#
-            if kwa["type"] == 'Two pass EBU':
-                filters = (f'{kwa["EBU"]}'
-                           f':measured_I={summary["Input Integrated:"]}'
-                           f':measured_LRA={summary["Input LRA:"]}'
-                           f':measured_TP={summary["Input True Peak:"]}'
-                           f':measured_thresh={summary["Input Threshold:"]}'
-                           f':offset={summary["Target Offset:"]}'
-                           f':linear=true:dual_mono=true'
-                           )
-                model = two_pass_ebu(self.count, self.nargs, filters, **kwa)
-                time.sleep(.5)
+        def encode(num):
+            """
+            Encode the segment `num`, runs in a worker thread.
+            """
+            if self.stop_work_thread:
+                return 'STOP'
+            start, length = ranges[num]
+            segment = (f'"{cmd["ffmpeg_cmd"]}" '
+                       f'{cmd["ffmpeg-default-args"]} '
+                       f'{kwa.get("pre-input-1", "")} '
+                       f'-ss {integer_to_time(offset + start)} '
+                       f'-i "{kwa["source"]}" '
+                       f'-t {integer_to_time(length)} '
+                       f'{kwa["args"][0]} -an -sn -dn '
+                       f'"{chunks[num]}"'
+                       )
+            logwrite(f'Segment {num + 1}/{len(ranges)}\n\n[COMMAND]:\n'
+                     f'{segment}', '', self.logfile)
+            if not platform.system() == 'Windows':
+                segment = shlex.split(segment)
+            return self.run_pass(segment, kwa, jobid, tmpdir,
+                                 onprogress=progress_of(num))
+
+        count1 = (f'File {count}/{self.nargs} - Pass One\n'
+                  f'Encoding {len(ranges)} video segments in parallel...'
+                  f'\n\nSource: "{kwa["source"]}"\nDestination: '
+                  f'"{tmpdir}"')
+        post_message("COUNT_EVT",
+                     count=count1,
+                     duration=kwa['duration'],
+                     end='CONTINUE',
+                     jobid=jobid,
+                     )
+        logwrite(count1, '', self.logfile)
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            status = list(pool.map(encode, range(len(ranges))))
+        if 'STOP' in status:
+            return 'STOP'
+        if any(status):  # ..Failed
+            return 'FAILED'
+        post_message("COUNT_EVT",
+                     count='',
+                     duration=kwa['duration'],
+                     end='DONE',
+                     jobid=jobid,
+                     )
+        # --------------- second pass ----------------#
+        listfile = os.path.join(tmpdir, 'chunks.txt')
+        with open(listfile, 'w', encoding='utf-8') as lst:
+            lst.write(concat_list(chunks))
+        pass2 = (f'"{cmd["ffmpeg_cmd"]}" '
+                 f'{cmd["ffmpeg-default-args"]} '
+                 f'{kwa.get("pre-input-2", "")} '
+                 f'{kwa["start-time"]} '
+                 f'-i "{kwa["source"]}" '
+                 f'-f concat -safe 0 -i "{listfile}" '
+                 f'{kwa["end-time"]} '
+                 f'-map 1:v:0 -c:v copy '
+                 f'{kwa["args"][1]} '
+                 f'{kwa.get("volume", "")} '
+                 f'"{kwa["destination"]}"'
+                 )
+        count2 = (f'File {count}/{self.nargs} - Pass Two\n'
+                  f'Joining the video segments...\n\nSource: '
+                  f'"{kwa["source"]}"\nDestination: '
+                  f'"{kwa["destination"]}"')
+        post_message("COUNT_EVT",
+                     count=count2,
+                     duration=kwa['duration'],
+                     end='CONTINUE',
+                     jobid=jobid,
+                     )
+        logwrite(f'{count2}\n\n[COMMAND]:\n{pass2}', '', self.logfile)
+        if not platform.system() == 'Windows':
+            pass2 = shlex.split(pass2)
+        status = self.run_pass(pass2, kwa, jobid, tmpdir)
+        if status == 'STOP':
+            return status
+        if status:  # ..Failed
+            return 'FAILED'
+
+        source = ffprobe(kwa['source'], self.appdata['ffprobe_cmd'],
+                         self.appdata['encoding'],
+                         cache=probe_cache(self.appdata['cachedir']),
+                         hide_banner=None, pretty=None)
+        rate = frame_rate(source[0] or {}, kwa['args'][0])
+        probe = ffprobe(kwa['destination'], self.appdata['ffprobe_cmd'],
+                        self.appdata['encoding'], count_packets=None,
+                        select_streams='v:0')
+        errors = (check_chunked_output(kwa['duration'], probe[0], rate,
+                                       len(ranges))
+                  if probe[0] else [str(probe[1])])
+        if errors:
+            msg = ('[VIDEOMASS]: Chunked encoding verification failed: '
+                   f'{"; ".join(errors)}')
+            post_message("UPDATE_EVT",
+                         output=msg,
+                         duration=kwa['duration'],
+                         status=0,
+                         jobid=jobid,
+                         )
+            post_message("UPDATE_EVT",
+                         output='FAILED',
+                         duration=kwa['duration'],
+                         status=1,
+                         jobid=jobid,
+                         )
+            logwrite('', msg, self.logfile)
+            flush_logs(self.logfile)
+            return 'FAILED'
 
-            elif kwa['type'] == 'Two pass VIDSTAB':
-                model = two_pass_stab(self.count, self.nargs, **kwa)
+        # ..Finished
+        self.filedone.append(kwa["source"])
+        post_message("COUNT_EVT",
+                     count='',
+                     duration=kwa['duration'],
+                     end='DONE',
+                     jobid=jobid,
+                     )
+        return 'DONE'
+    # --------------------------------------------------------------------#
 
-            elif kwa['type'] == 'Two pass':
-                model = two_pass(self.count, self.nargs, **kwa)
+    def known_loudness(self, kwa):
+        """
+        Returns the stored loudnorm measurements of the given
+        EBU item, also made for other target levels, None if
+        unknown. They are looked up when the item runs, so the
+        identity of the source file (see `LoudnessStore`) is
+        checked at that time.
+        """
+        args = loudnorm_args(kwa, self.appdata['ffmpeg_cmd'])
+        if args is None:
+            return None
+        stored = loudness_store(self.appdata['cachedir']).get(*args)
+        return loudnorm_retarget(stored, kwa['EBU'])
 
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=model['count2'],
+    def store_loudness(self, kwa, summary):
+        """
+        Store the loudnorm measurements of the item parsed
+        from the output of the first pass, with the targets
+        they were measured for (see `loudnorm_retarget`).
+        Returns the measurements, None if not parsed.
+        """
+        measured = loudnorm_measured(summary)
+        args = loudnorm_args(kwa, self.appdata['ffmpeg_cmd'])
+        if measured and args:
+            loudness_store(self.appdata['cachedir']).put(
+                *args, {**measured, 'targets': loudnorm_targets(kwa['EBU'])})
+        return measured
+    # --------------------------------------------------------------------#
+
+    def read_messages(self, stderr, kwa, jobid, summary=None):
+        """
+        Read the FFmpeg messages from the standard error of the
+        subprocess, sending them line by line. If `summary` dict
+        is given, it is filled with the values of the loudnorm
+        statistics. This method runs in a helper thread.
+        """
+        for line in stderr:
+            post_message("UPDATE_EVT",
+                         output=line,
                          duration=kwa['duration'],
-                         end='CONTINUE',
+                         status=0,
+                         jobid=jobid,
                          )
-            logwrite(model['stamp2'], '', self.logfile)
-
-            with Popen(model['pass2'],
-                       stderr=subprocess.PIPE,
-                       stdin=subprocess.PIPE,
-                       bufsize=1,
-                       universal_newlines=True,
-                       encoding=self.appdata['encoding'],
-                       ) as proc2:
-
-                for line2 in proc2.stderr:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output=line2,
+            if summary is not None:
+                for k in summary:
+                    if line.startswith(k):
+                        summary[k] = line.split(':')[1].split()[0]
+    # --------------------------------------------------------------------#
+
+    def run_pass(self, cmd, kwa, jobid, workdir, summary=None,
+                 onprogress=None):
+        """
+        Run a FFmpeg subprocess reading its output in real-time.
+        The progress blocks are read from the standard output and
+        sent as a single structured PROGRESS_EVT message each (or
+        passed to the `onprogress` callable if given), while the
+        messages from the standard error are read by a helper
+        thread (see `read_messages`).
+
+        Returns 'STOP' if the user has stopped the process,
+        the exit status of the subprocess otherwise.
+        Raise: `OSError` or `FileNotFoundError`
+        """
+        with Popen(cmd,
+                   stdout=subprocess.PIPE,
+                   stderr=subprocess.PIPE,
+                   stdin=subprocess.PIPE,
+                   bufsize=1,
+                   universal_newlines=True,
+                   encoding=self.appdata['encoding'],
+                   cwd=workdir,
+                   ) as proc:
+
+            reader = Thread(target=self.read_messages,
+                            args=(proc.stderr, kwa, jobid, summary),
+                            daemon=True)
+            reader.start()
+
+            for progress in progress_blocks(proc.stdout):
+                if onprogress:
+                    onprogress(progress)
+                else:
+                    post_message("PROGRESS_EVT",
+                                 merge=True,
+                                 progress=progress,
                                  duration=kwa['duration'],
-                                 status=0,
+                                 jobid=jobid,
                                  )
-                    if self.stop_work_thread:
-                        proc2.stdin.write('q')  # stop ffmpeg
-                        out = proc2.communicate()[1]
-                        proc2.wait()
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output='STOP',
-                                     duration=kwa['duration'],
-                                     status=1,
-                                     )
-                        logwrite('', out, self.logfile)
-                        time.sleep(.5)
-                        wx.CallAfter(pub.sendMessage, "END_EVT",
-                                     filetotrash=None)
-                        return
-
-                if proc2.wait():  # ..Failed
-                    out = proc2.communicate()[1]
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output='FAILED',
+                if self.stop_work_thread:
+                    try:
+                        proc.stdin.write('q')  # stop ffmpeg
+                        proc.stdin.flush()
+                    except BrokenPipeError:  # already terminated
+                        pass
+                    proc.wait()
+                    reader.join()
+                    post_message("UPDATE_EVT",
+                                 output='STOP',
                                  duration=kwa['duration'],
-                                 status=proc2.wait(),
+                                 status=1,
+                                 jobid=jobid,
                                  )
-                    logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
-                                  f"{proc2.wait()} {out}"), self.logfile)
-                    time.sleep(1)
-                    continue
-
-            if proc2.wait() == 0:  # ..Finished
-                filedone.append(kwa["source"])
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count='',
+                    logwrite('', '[VIDEOMASS]: STOP command received.',
+                             self.logfile)
+                    return 'STOP'
+
+            reader.join()
+            if proc.wait():  # ..Failed
+                post_message("UPDATE_EVT",
+                             output='FAILED',
                              duration=kwa['duration'],
-                             end='DONE'
+                             status=proc.wait(),
+                             jobid=jobid,
                              )
-        time.sleep(.5)
-        wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=filedone)
+                logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
+                              f"{proc.wait()}"), self.logfile)
+                flush_logs(self.logfile)
+                time.sleep(1)
+
+        self.exitstatus[get_ident()] = proc.wait()
+        return proc.wait()
     # --------------------------------------------------------------------#
 
     def stop(self):
@@ -25,10 +25,12 @@ This file is part of FFcuesplitter.
    You should have received a copy of the GNU General Public License
    along with FFcuesplitter.  If not, see <http://www.gnu.org/licenses/>.
 """
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 import shlex
 import platform
 import json
+import os
 from videomass.vdms_utils.utils import Popen
 
 
@@ -46,13 +48,17 @@ def from_kwargs_to_args(kwargs):
     return args
 
 
-def ffprobe(filename, cmd='ffprobe', txtenc='utf-8', **kwargs):
+def ffprobe(filename, cmd='ffprobe', txtenc='utf-8', cache=None, **kwargs):
     """
     Run ffprobe subprocess on the specified file.
     This function always returns a tuple of two items (data, error),
     where `data` is the data representation given from the subprocess
     output, and `error` is the current status error.
 
+    If a `cache` instance is given (see `vdms_io.probe_cache`), the
+    stored data is returned without running ffprobe when the file
+    has not changed since it was last probed.
+
     Raises:
         `OSError` or `FileNotFoundError` occurs if the ffprobe
         binary/executable does not exists.
@@ -66,6 +72,7 @@ def ffprobe(filename, cmd='ffprobe', txtenc='utf-8', **kwargs):
         >>> probe = ffprobe(filename,
                             cmd='/path/to/ffprobe',
                             loglevel='error',
+                            cache=probe_cache(cachedir),
                             hide_banner=None,
                             **kwargs,
                             )
@@ -74,8 +81,81 @@ def ffprobe(filename, cmd='ffprobe', txtenc='utf-8', **kwargs):
         >>> else:
         >>>     probe[0]
     """
+    opts = " ".join(from_kwargs_to_args(kwargs))
+    key = cache.make_key(filename, cmd, opts) if cache is not None else None
+    output = cache.get(key) if cache is not None else None
+    if output is not None:
+        return json.loads(output), None
+
     args = (f'"{cmd}" -show_format -show_streams -of json '
-            f'{" ".join(from_kwargs_to_args(kwargs))} '
+            f'{opts} '
+            f'"{filename}"'
+            )
+    args = shlex.split(args) if platform.system() != 'Windows' else args
+    try:
+        with Popen(args,
+                   stdout=subprocess.PIPE,
+                   stderr=subprocess.PIPE,
+                   bufsize=1,
+                   universal_newlines=True,
+                   encoding=txtenc,
+                   ) as proc:
+            output, error = proc.communicate()
+
+            if proc.returncode != 0:
+                return (None, f'ffprobe: {error}')
+
+    except (OSError, FileNotFoundError, UnicodeDecodeError) as excepterr:
+        return (None, excepterr)
+
+    data = json.loads(output)
+    if cache is not None:
+        cache.put(key, output)
+    return data, None
+
+
+def ffprobe_batch(filenames, cmd='ffprobe', txtenc='utf-8', cache=None,
+                  njobs=None, **kwargs):
+    """
+    Probe many files at once. Since ffprobe accepts a single
+    input file per invocation, the start-up time of the processes
+    is amortised by running up to `njobs` ffprobe processes at
+    the same time (default is the number of CPU cores, min 4),
+    the files already in the `cache` are not probed at all.
+
+    Returns a list of (data, error) tuples in the same order of
+    `filenames`, each one identical to what the `ffprobe` function
+    returns for the same file and arguments.
+
+    Usage:
+        >>> from videomass.vdms_threads.ffprobe import ffprobe_batch
+        >>> for (data, error) in ffprobe_batch(filenames,
+                                               cmd='/path/to/ffprobe',
+                                               hide_banner=None,
+                                               ):
+        >>>     ...
+    """
+    njobs = njobs or max(os.cpu_count() or 1, 4)
+    with ThreadPoolExecutor(max_workers=njobs) as pool:
+        return list(pool.map(lambda name: ffprobe(name, cmd, txtenc, cache,
+                                                  **kwargs), filenames))
+
+
+def ffprobe_keyframes(filename, cmd='ffprobe', txtenc='utf-8'):
+    """
+    Read the timestamps of the key frames of the first video
+    stream of the given file, from the packets flags (the
+    file is demuxed but not decoded).
+
+    Returns a tuple (data, error), where `data` is the sorted
+    list of the key frames timestamps in seconds relative to
+    the start time of the file (i.e. as the `-ss` option),
+    and `error` the current status error (see `ffprobe`
+    function).
+    """
+    args = (f'"{cmd}" -v error -select_streams v:0 '
+            f'-show_entries packet=pts_time,flags:format=start_time '
+            f'-of csv=p=0 '
             f'"{filename}"'
             )
     args = shlex.split(args) if platform.system() != 'Windows' else args
@@ -95,4 +175,14 @@ def ffprobe(filename, cmd='ffprobe', txtenc='utf-8', **kwargs):
     except (OSError, FileNotFoundError, UnicodeDecodeError) as excepterr:
         return (None, excepterr)
 
-    return json.loads(output), None
+    keyframes, start = [], 0.0
+    for line in output.splitlines():
+        pts, sep, flags = line.partition(',')
+        try:
+            if not sep:  # format start time
+                start = float(pts)
+            elif 'K' in flags:
+                keyframes.append(float(pts))
+        except ValueError:  # N/A
+            continue
+    return sorted(max(0.0, pts - start) for pts in keyframes), None
@@ -0,0 +1,107 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: file_ingestion.py
+Porpose: probes the files added to the file list in the background
+Compatibility: Python3, wxPython4 Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Thread
+from queue import Queue, Empty
+import wx
+from videomass.vdms_threads.ffprobe import ffprobe
+from videomass.vdms_threads.event_dispatcher import post_message
+from videomass.vdms_io.probe_cache import probe_cache
+
+
+class FileIngestion(Thread):
+    """
+    Probes a list of media files using a pool of worker threads
+    fed by a queue, so that the GUI is not blocked while adding
+    many files or files on slow network shares.
+
+    The result of each file is sent as soon as it is available
+    by the "INGEST_EVT" pubsub message, with the `seq` number given
+    with the file, the `probe` data (None on error) and the `error`
+    message (None on success). When all workers are finished, or
+    after a stop request, the "INGEST_END_EVT" message is sent.
+
+    Usage:
+        >>> thread = FileIngestion([(0, '/path/a.mkv'),
+                                    (1, '/path/b.mp4')], njobs=4)
+        >>> thread.stop()  # to cancel
+    """
+    def __init__(self, items, njobs=4):
+        """
+        items: list of (seq, pathname) tuples
+        njobs: number of files probed at once
+        """
+        get = wx.GetApp()  # get data from bootstrap
+        self.appdata = get.appset
+        self.queue = Queue()
+        for item in items:
+            self.queue.put(item)
+        self.njobs = max(1, min(njobs, len(items)))
+        self.cache = probe_cache(self.appdata['cachedir'])
+        self.stop_work_thread = False  # process terminate
+
+        Thread.__init__(self, daemon=True)
+        self.start()
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Start the workers and wait for them
+        """
+        workers = [Thread(target=self.worker, daemon=True)
+                   for n in range(self.njobs)]
+        for work in workers:
+            work.start()
+        for work in workers:
+            work.join()
+
+        post_message("INGEST_END_EVT", thread=self)
+    # ----------------------------------------------------------------#
+
+    def worker(self):
+        """
+        Takes the files from the queue until it is empty
+        or a stop request is received.
+        """
+        while not self.stop_work_thread:
+            try:
+                seq, path = self.queue.get_nowait()
+            except Empty:
+                return
+            probe = ffprobe(path, cmd=self.appdata['ffprobe_cmd'],
+                            txtenc=self.appdata['encoding'],
+                            cache=self.cache,
+                            hide_banner=None, pretty=None)
+            post_message("INGEST_EVT", seq=seq, probe=probe[0],
+                         error=probe[1])
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work thread to terminate the process,
+        the files already being probed are completed anyway.
+        """
+        self.stop_work_thread = True
@@ -0,0 +1,345 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: frame_server.py
+Porpose: long-lived decoding of the video frames shown by the
+         filter preview dialogs.
+Compatibility: Python3, wxPython4 Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Thread, Condition
+import platform
+import subprocess
+import wx
+from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.frame_utils import (frame_size,
+                                              frame_offset,
+                                              decoder_args,
+                                              filter_args,
+                                              read_frame,
+                                              )
+from videomass.vdms_io.frame_cache import frame_cache
+from videomass.vdms_io.keyframe_index import keyframe_indexer
+from videomass.vdms_threads.generic_task import logwrite
+if not platform.system() == 'Windows':
+    import shlex
+
+
+class FrameServer(Thread):
+    """
+    Serves the decoded frames of a single video file to a
+    preview dialog, as raw RGB data of `width` x `height`
+    pixels read from the standard output of FFmpeg, without
+    temporary image files and without blocking the GUI.
+
+    Each frame request has a `tag` (e.g. 'source', 'edit'):
+    only the latest request of the same tag waiting to be
+    served is kept, so fast seeks are coalesced. The frames
+    already served by any dialog are taken from the shared
+    frames cache (see `FrameCache`). Each tag owns a decoder
+    process which is kept alive between the requests: seeks
+    forward within `LOOKAHEAD` milliseconds are served by
+    reading the next frames of the running decoder, other
+    seeks restart it (see `start_point`). The served frames are
+    always the ones at the exact requested positions. The
+    filtered frames are made from the unfiltered ones. Only
+    the last frames served are written to the disk cache, when
+    the server stops, so that seeking never waits for the disk.
+
+    The frames are read straight into preallocated buffers
+    (bytearray) which are passed as they are to the `callback`
+    of the request, called on the GUI thread with the requested
+    position in milliseconds, the frame buffer and an error
+    message (None if no error). A buffer is reused once the
+    callback returns, so it must be consumed there, e.g. by
+    `wx.Bitmap.FromBuffer`.
+
+    USAGE:
+        >>> server = FrameServer(filename, width, height, logfile)
+        >>> server.request(msec, callback, vfilter='', tag='source')
+        >>> server.stop()  # when the dialog is closed
+    """
+    RATE = 25  # frames per second of the decoded stream
+    LOOKAHEAD = 2000  # max forward seek by reading in milliseconds
+    ERROR = 'Please, see "generic_task.log" file for error details.'
+
+    def __init__(self, filename, width, height, logfile):
+        """
+        Attributes defined here:
+
+        self.requests: {tag: (msec, vfilter, callback)} of the
+                       requests waiting to be served
+        self.decoders: {tag: decoder} of the running decoders,
+                       see `start_decoder`
+        self.buffers: the preallocated frame buffers
+        self.busy: the frame buffers waiting to be delivered
+        self.served: {tag: key} of the last frames served
+        """
+        get = wx.GetApp()
+        self.appdata = get.appset
+        self.filename = filename
+        self.width = width
+        self.height = height
+        self.logfile = logfile
+        self.cache = frame_cache(self.appdata['cachedir'])
+        self.cond = Condition()
+        self.requests = {}
+        self.decoders = {}
+        self.buffers = []
+        self.busy = []
+        self.served = {}
+        self.stopped = False
+
+        Thread.__init__(self, daemon=True)
+        self.start()
+    # ----------------------------------------------------------------#
+
+    def request(self, msec, callback, vfilter='', tag='source'):
+        """
+        Request the frame at `msec` milliseconds filtered by the
+        optional `vfilter`. Never blocks the caller.
+        """
+        with self.cond:
+            self.requests.pop(tag, None)  # replaced by the latest
+            self.requests[tag] = (msec, vfilter, callback)
+            self.cond.notify()
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Stop serving the frames and terminate the decoders.
+        Must be called on the GUI thread before destroying
+        the dialog.
+        """
+        with self.cond:
+            self.stopped = True
+            self.requests.clear()
+            self.cond.notify()
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Serving loop
+        """
+        while True:
+            with self.cond:
+                while not self.requests and not self.stopped:
+                    self.cond.wait()
+                if self.stopped:
+                    break
+                tag = next(iter(self.requests))
+                msec, vfilter, callback = self.requests.pop(tag)
+
+            frame, error = self.serve(tag, msec, vfilter)
+            if frame is not None:
+                with self.cond:
+                    self.busy.append(frame)
+            wx.CallAfter(self.deliver, callback, msec, frame, error)
+
+        for tag in list(self.decoders):
+            self.close_decoder(tag)
+        for key in self.served.values():
+            self.cache.persist(key)
+    # ----------------------------------------------------------------#
+
+    def deliver(self, callback, msec, frame, error):
+        """
+        Runs on the GUI thread, drops the frames served
+        after the dialog has been closed and releases
+        the frame buffer.
+        """
+        try:
+            if not self.stopped:
+                callback(msec, frame, error)
+        finally:
+            with self.cond:
+                self.busy = [buf for buf in self.busy if buf is not frame]
+    # ----------------------------------------------------------------#
+
+    def get_buffer(self):
+        """
+        Returns a frame buffer which is neither holding the
+        last frame of a decoder nor waiting to be delivered,
+        allocating a new one only if all of them are in use.
+        """
+        with self.cond:
+            held = self.busy + [dec['frame'] for dec in
+                                self.decoders.values()]
+        for buf in self.buffers:
+            if not any(buf is item for item in held):
+                return buf
+        buf = bytearray(frame_size(self.width, self.height))
+        self.buffers.append(buf)
+        return buf
+    # ----------------------------------------------------------------#
+
+    def serve(self, tag, msec, vfilter):
+        """
+        Returns a tuple (frame, error) with the frame at `msec`
+        filtered by `vfilter`, taken from the frames cache if
+        found, otherwise made by filtering the unfiltered frame
+        (see `apply_filter`), which in turn is taken from the
+        cache or decoded by the decoder of `tag`.
+        """
+        key = self.cache.make_key(self.filename, msec, self.width,
+                                  self.height, vfilter)
+        frame = self.cache.get(key) if key else None
+        if frame is not None:
+            self.served[tag] = key
+            return frame, None
+
+        if vfilter:
+            frame, error = self.serve(tag, msec, '')
+            if not error:
+                frame, error = self.apply_filter(frame, vfilter)
+        else:
+            frame, error = self.decode(tag, msec)
+        if error:
+            return None, error
+
+        if key:
+            self.cache.put(key, frame)
+            self.served[tag] = key
+        return frame, None
+    # ----------------------------------------------------------------#
+
+    def decode(self, tag, msec):
+        """
+        Returns a tuple (frame, error) with the unfiltered frame
+        at `msec` decoded by the decoder of `tag`.
+        """
+        decoder = self.decoders.get(tag)
+        index = None
+        if decoder:
+            index = frame_offset(decoder['start'], msec, self.RATE)
+            ahead = self.LOOKAHEAD * self.RATE // 1000
+            if index is not None and not (decoder['index'] <= index
+                                          <= decoder['index'] + ahead):
+                index = None
+
+        if index is None:
+            self.close_decoder(tag)
+            start = self.start_point(msec)
+            try:
+                decoder = self.start_decoder(start)
+            except OSError as err:
+                return None, err
+            self.decoders[tag] = decoder
+            index = frame_offset(start, msec, self.RATE)
+
+        while decoder['index'] < index:
+            buf = self.get_buffer()
+            if not read_frame(decoder['proc'].stdout, buf):
+                break  # end of stream, keeps the last frame
+            decoder['index'] += 1
+            decoder['frame'] = buf
+
+        if decoder['frame'] is None:
+            self.close_decoder(tag)
+            return None, FrameServer.ERROR
+        return decoder['frame'], None
+    # ----------------------------------------------------------------#
+
+    def apply_filter(self, frame, vfilter):
+        """
+        Returns a tuple (frame, error) with the given raw `frame`
+        filtered by `vfilter`, so that the filtered previews do
+        not need to decode the source file again.
+        """
+        cmd = self.command(filter_args(self.width, self.height, vfilter))
+        try:
+            with open(self.logfile, 'a', encoding='utf-8') as log:
+                with Popen(cmd,
+                           stdin=subprocess.PIPE,
+                           stdout=subprocess.PIPE,
+                           stderr=log,
+                           ) as proc:
+                    output = proc.communicate(frame)[0]
+        except OSError as err:
+            return None, err
+        if proc.returncode or len(output) != len(frame):
+            return None, FrameServer.ERROR
+        return output, None
+    # ----------------------------------------------------------------#
+
+    def command(self, args):
+        """
+        Returns the FFmpeg command with the given `args`
+        ready for `Popen`.
+        """
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" -nostdin -hide_banner '
+               f'{self.appdata["ffmpeg_loglev"]} {args}')
+        logwrite(self.logfile, f'From: FrameServer\n{cmd}\n')
+
+        if not platform.system() == 'Windows':
+            return shlex.split(cmd)
+        return cmd
+    # ----------------------------------------------------------------#
+
+    def start_point(self, msec):
+        """
+        Returns the position in milliseconds to start a decoder
+        for the frame at `msec`: the nearest key frame before it
+        if not farther than `LOOKAHEAD`, so that the decoder then
+        reads forward to the exact frame and it can also serve the
+        next seeks, otherwise `msec` itself (FFmpeg seeks exactly).
+        The key frames index is built in background if not yet
+        available (see `keyframe_index`).
+        """
+        index = keyframe_indexer(self.appdata['cachedir']).get(
+            self.filename, self.appdata['ffprobe_cmd'],
+            self.appdata['encoding'], wait=False)
+        sec = index.before(msec / 1000) if index else None
+        if sec is None or msec - sec * 1000 > self.LOOKAHEAD:
+            return msec
+        return round(sec * 1000)
+    # ----------------------------------------------------------------#
+
+    def start_decoder(self, msec):
+        """
+        Start a new decoder process at `msec` milliseconds.
+        Returns a decoder dict.
+        Raise: `OSError` if not FFmpeg
+        """
+        cmd = self.command(decoder_args(self.filename, msec, self.width,
+                                        self.height, self.RATE))
+        with open(self.logfile, 'a', encoding='utf-8') as log:
+            proc = Popen(cmd,
+                         stdin=subprocess.DEVNULL,
+                         stdout=subprocess.PIPE,
+                         stderr=log,
+                         )
+        return {'proc': proc,
+                'start': msec,
+                'index': -1,
+                'frame': None,
+                }
+    # ----------------------------------------------------------------#
+
+    def close_decoder(self, tag):
+        """
+        Terminate the decoder process of `tag`, if any.
+        """
+        decoder = self.decoders.pop(tag, None)
+        if decoder:
+            decoder['proc'].kill()
+            decoder['proc'].stdout.close()
+            decoder['proc'].wait()
@@ -30,6 +30,7 @@ import subprocess
 import wx
 from pubsub import pub
 from videomass.vdms_utils.utils import Popen
+from videomass.vdms_io.make_filelog import log_sink, flush_logs
 if not platform.system() == 'Windows':
     import shlex
 
@@ -38,8 +39,7 @@ def logwrite(logfile, cmd):
     """
     write ffmpeg command log
     """
-    with open(logfile, "a", encoding='utf-8') as log:
-        log.write(f"{cmd}\n")
+    log_sink(logfile).write(f"{cmd}\n")
 # ----------------------------------------------------------------#
 
 
@@ -47,8 +47,7 @@ def logerror(logfile, output):
     """
     write ffmpeg errors
     """
-    with open(logfile, "a", encoding='utf-8') as logerr:
-        logerr.write(f"\n[FFMPEG] generic_task ERRORS:\n{output}\n")
+    log_sink(logfile).write(f"\n[FFMPEG] generic_task ERRORS:\n{output}\n")
 # ----------------------------------------------------------------#
 
 
@@ -148,6 +147,8 @@ class FFmpegGenericTaskOutLines(Thread):
             output = ''.join(outlist)
             logwrite(self.logfile, f'[FFMPEG]:\n{output}')
 
+        flush_logs(self.logfile)  # job end
+
         wx.CallAfter(pub.sendMessage,
                      "RESULT_EVT",
                      status=''
@@ -236,6 +237,8 @@ class FFmpegGenericTask(Thread):
         if self.status:
             logerror(self.logfile, self.status)
 
+        flush_logs(self.logfile)  # job end
+
         wx.CallAfter(pub.sendMessage,
                      "RESULT_EVT",
                      status=''
@@ -29,9 +29,9 @@ import time
 import subprocess
 import platform
 import wx
-from pubsub import pub
 from videomass.vdms_utils.utils import Popen
 from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_threads.event_dispatcher import post_message
 if not platform.system() == 'Windows':
     import shlex
 
@@ -86,8 +86,7 @@ class PicturesFromVideo(Thread):
                   f'Destination: "{self.outputdir}"')
         com = f'{count1}\n\n[COMMAND]:\n{cmd}'
 
-        wx.CallAfter(pub.sendMessage,
-                     "COUNT_EVT",
+        post_message("COUNT_EVT",
                      count=count1,
                      duration=self.duration,
                      end='CONTINUE',
@@ -105,8 +104,8 @@ class PicturesFromVideo(Thread):
                        encoding=self.appdata['encoding'],
                        ) as proc:
                 for line in proc.stderr:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
+                    post_message("UPDATE_EVT",
+                                 merge='time=' in line,
                                  output=line,
                                  duration=self.duration,
                                  status=0,
@@ -115,22 +114,19 @@ class PicturesFromVideo(Thread):
                         proc.stdin.write('q')  # stop ffmpeg
                         out = proc.communicate()[1]
                         proc.wait()
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
+                        post_message("UPDATE_EVT",
                                      output='STOP',
                                      duration=self.kwa['duration'],
                                      status=1,
                                      )
                         logwrite('', out, self.logfile)
                         time.sleep(1)
-                        wx.CallAfter(pub.sendMessage, "END_EVT",
-                                     filetotrash=None)
+                        post_message("END_EVT", filetotrash=None)
                         return
 
                 if proc.wait():  # error
                     out = proc.communicate()[1]
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
+                    post_message("UPDATE_EVT",
                                  output='FAILED',
                                  duration=self.kwa['duration'],
                                  status=proc.wait(),
@@ -141,15 +137,13 @@ class PicturesFromVideo(Thread):
 
                 else:  # Done
                     filedone.append(self.fname)
-                    wx.CallAfter(pub.sendMessage,
-                                 "COUNT_EVT",
+                    post_message("COUNT_EVT",
                                  count='',
                                  duration='',
                                  end='DONE'
                                  )
         except (OSError, FileNotFoundError) as err:
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
+            post_message("COUNT_EVT",
                          count=err,
                          duration=0,
                          end='ERROR',
@@ -157,7 +151,7 @@ class PicturesFromVideo(Thread):
             logwrite('', err, self.logfile)
 
         time.sleep(.5)
-        wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=filedone)
+        post_message("END_EVT", filetotrash=filedone)
     # --------------------------------------------------------------------#
 
     def stop(self):
@@ -25,188 +25,34 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
-import tempfile
+import io
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from threading import Thread
 import time
 import subprocess
 import platform
 import wx
-from pubsub import pub
 from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.slideshow_utils import (normalize_image,
+                                                  stream_preinput)
 from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_threads.event_dispatcher import post_message
 if not platform.system() == 'Windows':
     import shlex
 
 
-def convert_images(*varargs, **kwargs):
-    """
-    Convert images to PNG format and assign
-    progressive digits to them.
-    """
-    flist = varargs[0]
-    tmpdir = varargs[1]
-    logname = varargs[2]
-    imagenames = varargs[3]
-
-    count1 = (f'Preparing temporary files...\nSource: Imported file list\n'
-              f'Destination: "{tmpdir}"\n')
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count=count1,
-                 duration=len(flist),
-                 end='CONTINUE',
-                 )
-    prognum = 0
-    args = (f'"{kwargs["ffmpeg_cmd"]}" '
-            f'{kwargs["ffmpeg-default-args"]} '
-            f'{kwargs["ffmpeg_loglev"]} ')
-    logwrite(f'Preparing temporary files...\n'
-             f'\n[COMMAND:]\n{args}', '', logname)
-
-    for files in flist:
-        prognum += 1
-        tmpf = os.path.join(tmpdir, f'{imagenames}{prognum}.bmp')
-        cmd_1 = f'{args} -i "{files}" "{tmpf}"'
-
-        if not platform.system() == 'Windows':
-            cmd_1 = shlex.split(cmd_1)
-        try:
-            with Popen(cmd_1,
-                       stderr=subprocess.PIPE,
-                       bufsize=1,
-                       universal_newlines=True,
-                       encoding=kwargs['encoding'],
-                       ) as proc1:
-                error = proc1.communicate()[1]
-
-            if proc1.returncode:  # ffmpeg error
-                if error:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output='FAILED',
-                                 duration=0,
-                                 status=proc1.wait(),
-                                 )
-                    logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
-                                  f"{proc1.wait()} {error}"), logname)
-                    time.sleep(1)
-                    return error
-
-            else:  # ok
-                wx.CallAfter(pub.sendMessage,
-                             "UPDATE_EVT",
-                             output=f' |{prognum}|  {files}  >  {tmpf}\n',
-                             duration=0,
-                             status=0,
-                             )
-        except (OSError, FileNotFoundError) as err:  # cmd not found
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=err,
-                         duration=0,
-                         end='ERROR',
-                         )
-            return err
-
-    time.sleep(.5)
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count='',
-                 duration=0,
-                 end='DONE'
-                 )
-    return None
-
-
-def resizing_process(*varargs, **kwargs):
-    """
-    After the images have been converted to the required format,
-    this process performs the resizing using ffmpeg filters.
-    This is a necessary workaround for proper video playback.
-    """
-    flist = varargs[0]
-    tmpdir = varargs[1]
-    cmdargs = varargs[2]
-    logname = varargs[3]
-
-    count1 = (f'\n\nFile resizing...\nSource: Temporary directory\n'
-              f'Destination: "{tmpdir}"')
-
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count=count1,
-                 duration=len(flist),
-                 end='CONTINUE',
-                 )
-
-    tmpf = os.path.join(tmpdir, 'TMP_%d.bmp')
-    tmpfout = os.path.join(tmpdir, 'IMAGE_%d.bmp')
-    cmd_1 = (f'"{kwargs["ffmpeg_cmd"]}" '
-             f'{kwargs["ffmpeg-default-args"]} '
-             f'{kwargs["ffmpeg_loglev"]} '
-             f'-i "{tmpf}" {cmdargs} "{tmpfout}"'
-             )
-    logwrite(f'\nFile resizing...\n\n[COMMAND]:\n{cmd_1}', '', logname)
-
-    if not platform.system() == 'Windows':
-        cmd_1 = shlex.split(cmd_1)
-    try:
-        with Popen(cmd_1,
-                   stderr=subprocess.PIPE,
-                   bufsize=1,
-                   universal_newlines=True,
-                   encoding=kwargs['encoding'],
-                   ) as proc1:
-            error = proc1.communicate()[1]
-
-        if proc1.returncode:  # ffmpeg error
-            if error:
-                wx.CallAfter(pub.sendMessage,
-                             "UPDATE_EVT",
-                             output='FAILED',
-                             duration=0,
-                             status=proc1.wait(),
-                             )
-                logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
-                              f"{proc1.wait()} {error}"), logname)
-                time.sleep(1)
-                return error
-
-        else:  # ok
-            wx.CallAfter(pub.sendMessage,
-                         "UPDATE_EVT",
-                         output='',
-                         duration=0,
-                         status=0,
-                         )
-            logwrite('', error, logname)
-            time.sleep(1)
-
-    except (OSError, FileNotFoundError) as err:  # cmd not found
-        wx.CallAfter(pub.sendMessage,
-                     "COUNT_EVT",
-                     count=err,
-                     duration=0,
-                     end='ERROR',
-                     )
-        return err
-
-    time.sleep(.5)
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count='',
-                 duration=0,
-                 end='DONE'
-                 )
-    return None
-
-
 class SlideshowMaker(Thread):
     """
     Represents the ffmpeg subprocess to produce a video in
-    mkv format from a sequence of images already converted
-    and resized in a temporary context.
+    mkv format from a sequence of images, which are decoded
+    and normalized (and resized if required) by parallel
+    workers and streamed in order to the standard input of
+    a single ffmpeg process (image2pipe), without temporary
+    files.
     """
+    WINDOW = 2  # normalized images ahead per worker
+    MAXKEEP = 256 * 1024 * 1024  # max bytes of images kept to be looped
 
     def __init__(self, *args, **kwargs):
         """
@@ -224,135 +70,184 @@ class SlideshowMaker(Thread):
         self.logfile = args[0]  # log filename
         self.destination = kwargs['destination']
         self.kwa = kwargs
+        self.feed_error = None
+        self.frames = None  # normalized images kept to be looped
+        self.keptsize = 0  # bytes of the kept images
+        self.njobs = (self.appdata['max_parallel_jobs']
+                      or os.cpu_count() or 1)
 
         self.start()
 
+    def stream(self, stdin, pool, filenames):
+        """
+        Normalizes the images of `filenames` by the workers of
+        `pool` and writes them to `stdin` in order, keeping at
+        most `WINDOW` images ahead per worker. Returns False if
+        the streaming must stop.
+        """
+        window = self.njobs * SlideshowMaker.WINDOW
+        pending = deque()
+        try:
+            for filename in filenames:
+                pending.append((filename, pool.submit(
+                    normalize_image, filename, self.kwa['resize'],
+                    **self.appdata)))
+                if len(pending) >= window and not self.write(
+                        stdin, *pending.popleft()):
+                    return False
+            while pending:
+                if not self.write(stdin, *pending.popleft()):
+                    return False
+            return True
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def feed(self, proc, loop):
+        """
+        Writes the normalized images to the stdin pipe of the
+        ffmpeg `proc` in the order of the source list, once or,
+        if `loop` is True, until ffmpeg stops reading them.
+        Each image is normalized once and kept to be looped,
+        unless they exceed `MAXKEEP` bytes on the whole: then
+        they are normalized again on each loop. Kills `proc`
+        on broken images. Runs in a separate thread.
+        """
+        self.frames = [] if loop else None
+        try:
+            with ThreadPoolExecutor(max_workers=self.njobs) as pool:
+                if self.stream(proc.stdin, pool, self.kwa['source']):
+                    while loop and self.kwa['source']:
+                        if self.frames is None:
+                            if not self.stream(proc.stdin, pool,
+                                               self.kwa['source']):
+                                break
+                            continue
+                        for data in self.frames:
+                            if self.stop_work_thread:
+                                return
+                            proc.stdin.write(data)
+        except (BrokenPipeError, ValueError):
+            pass  # ffmpeg has stopped reading (e.g. `-t` reached)
+        finally:
+            self.frames = None
+            if self.feed_error:
+                proc.kill()  # broken images, drop the output
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    def write(self, stdin, filename, future):
+        """
+        Writes the normalized image of the given future to
+        `stdin`, also keeping it in `frames` while they do not
+        exceed `MAXKEEP` bytes. Returns False if the streaming
+        must stop.
+        """
+        if self.feed_error or self.stop_work_thread:
+            return False
+        data, error = future.result()
+        if error:
+            self.feed_error = f'"{filename}": {error}'
+            return False
+        stdin.write(data)
+        if self.frames is not None:
+            self.frames.append(data)
+            self.keptsize += len(data)
+            if self.keptsize > SlideshowMaker.MAXKEEP:
+                self.frames = None  # too large, normalize on each loop
+        return True
+
     def run(self):
         """
         Subprocess initialize thread.
         """
-        imgtmpnames = 'TMP_' if self.kwa["resize"] else 'IMAGE_'
         filedone = []
-        with tempfile.TemporaryDirectory() as tempdir:  # make tmp dir
-            tmpproc1 = convert_images(self.kwa['source'],
-                                      tempdir,
-                                      self.logfile,
-                                      imgtmpnames,
-                                      **self.appdata,
-                                      )
-            if tmpproc1 is not None or self.stop_work_thread:
-                wx.CallAfter(pub.sendMessage,
-                             "UPDATE_EVT",
-                             output='ERROR',
-                             duration=self.kwa['duration'],
-                             status=1,
-                             )
-                self.end_process(None)
-                return
+        preinput, loop = stream_preinput(self.kwa["pre-input-1"])
+        cmd_2 = (f'"{self.appdata["ffmpeg_cmd"]}" '
+                 f'{self.appdata["ffmpeg-default-args"]} '
+                 f'{self.appdata["ffmpeg_loglev"]} '
+                 f'{preinput} '
+                 f'-f image2pipe -c:v ppm -i pipe:0 '
+                 f'{self.kwa["args"]} '
+                 f'"{self.destination}"'
+                 )
+        count = (f'Video production...\nSource: Imported file list '
+                 f'({len(self.kwa["source"])} images, {self.njobs} '
+                 f'workers)\nDestination: "{self.destination}"\n')
+        log = (f'{count}\nResizing: {self.kwa["resize"] or "None"}'
+               f'\n\n[COMMAND]:\n{cmd_2}')
+
+        post_message("COUNT_EVT",
+                     count=count,
+                     duration=self.duration,
+                     end='CONTINUE',
+                     )
+        logwrite(log, '', self.logfile)
+
+        if not self.appdata['ostype'] == 'Windows':
+            cmd_2 = shlex.split(cmd_2)
 
-            if imgtmpnames == 'TMP_':
-                tmpproc2 = resizing_process(self.kwa['source'],
-                                            tempdir,
-                                            self.kwa["resize"],
-                                            self.logfile,
-                                            **self.appdata,
-                                            )
+        try:
+            with Popen(cmd_2,
+                       stderr=subprocess.PIPE,
+                       stdin=subprocess.PIPE,
+                       ) as proc2:
+                feeder = Thread(target=self.feed, args=(proc2, loop),
+                                daemon=True)
+                feeder.start()
+                lastlines = deque(maxlen=20)
+                for line in io.TextIOWrapper(proc2.stderr,
+                                             encoding=self.appdata['encoding'],
+                                             errors='replace'):
+                    lastlines.append(line)
+                    post_message("UPDATE_EVT",
+                                 merge='time=' in line,
+                                 output=line,
+                                 duration=self.duration,
+                                 status=0,
+                                 )
+                feeder.join()
 
-                if tmpproc2 is not None or self.stop_work_thread:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output='ERROR',
+                if self.stop_work_thread:
+                    proc2.wait()
+                    post_message("UPDATE_EVT",
+                                 output='STOP',
                                  duration=self.kwa['duration'],
                                  status=1,
                                  )
+                    logwrite('', ''.join(lastlines), self.logfile)
+                    time.sleep(1)
                     self.end_process(None)
                     return
 
-            # ------------------------------- make video
-            tmpgroup = os.path.join(tempdir, 'IMAGE_%d.bmp')
-            cmd_2 = (f'"{self.appdata["ffmpeg_cmd"]}" '
-                     f'{self.appdata["ffmpeg-default-args"]} '
-                     f'{self.appdata["ffmpeg_loglev"]} '
-                     f'{self.kwa["pre-input-1"]} '
-                     f'-i "{tmpgroup}" '
-                     f'{self.kwa["args"]} '
-                     f'"{self.destination}"'
-                     )
-            count = (f'\n\nVideo production...\nSource: "{tempdir}"\n'
-                     f'Destination: "{self.destination}"\n')
-            log = f'{count}\n\n[COMMAND]:\n{cmd_2}'
+                status = proc2.wait() or (1 if self.feed_error else 0)
+                if status:  # error
+                    out = self.feed_error or ''.join(lastlines)
+                    post_message("UPDATE_EVT",
+                                 output='FAILED',
+                                 duration=self.kwa['duration'],
+                                 status=status,
+                                 )
+                    logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
+                                  f"{status} {out}"), self.logfile)
+                    time.sleep(1)
 
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=count,
-                         duration=self.duration,
-                         end='CONTINUE',
+                else:  # status ok
+                    filedone = self.kwa['source']
+                    post_message("COUNT_EVT",
+                                 count='',
+                                 duration=self.duration,
+                                 end='DONE'
+                                 )
+        except (OSError, FileNotFoundError) as err:
+            post_message("COUNT_EVT",
+                         count=err,
+                         duration=0,
+                         end='ERROR',
                          )
-
-            logwrite(log, '', self.logfile)
-            time.sleep(1)
-
-            if not self.appdata['ostype'] == 'Windows':
-                cmd_2 = shlex.split(cmd_2)
-
-            try:
-                with Popen(cmd_2,
-                           stderr=subprocess.PIPE,
-                           stdin=subprocess.PIPE,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding=self.appdata['encoding'],
-                           ) as proc2:
-                    for line in proc2.stderr:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output=line,
-                                     duration=self.duration,
-                                     status=0,
-                                     )
-                        if self.stop_work_thread:
-                            proc2.stdin.write('q')  # stop ffmpeg
-                            out = proc2.communicate()[1]
-                            proc2.wait()
-                            wx.CallAfter(pub.sendMessage,
-                                         "UPDATE_EVT",
-                                         output='STOP',
-                                         duration=self.kwa['duration'],
-                                         status=1,
-                                         )
-                            logwrite('', out, self.logfile)
-                            time.sleep(1)
-                            self.end_process(None)
-                            return
-
-                    if proc2.wait():  # error
-                        out = proc2.communicate()[1]
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output='FAILED',
-                                     duration=self.kwa['duration'],
-                                     status=proc2.wait(),
-                                     )
-                        logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
-                                      f"{proc2.wait()} {out}"), self.logfile)
-                        time.sleep(1)
-
-                    else:  # status ok
-                        filedone = self.kwa['source']
-                        wx.CallAfter(pub.sendMessage,
-                                     "COUNT_EVT",
-                                     count='',
-                                     duration=self.duration,
-                                     end='DONE'
-                                     )
-            except (OSError, FileNotFoundError) as err:
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count=err,
-                             duration=0,
-                             end='ERROR',
-                             )
-                logwrite('', err, self.logfile)
+            logwrite('', err, self.logfile)
         self.end_process(filedone)
 
     def end_process(self, filedone):
@@ -360,10 +255,12 @@ class SlideshowMaker(Thread):
         The process is finished
         """
         time.sleep(.5)
-        wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=filedone)
+        post_message("END_EVT", filetotrash=filedone)
 
     def stop(self):
         """
-        Sets the stop work thread to terminate the process
+        Sets the stop work thread to terminate the process:
+        the streaming of the images stops and ffmpeg ends
+        the output with the images already received.
         """
         self.stop_work_thread = True
@@ -0,0 +1,172 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: timeline_strip.py
+Porpose: background build of the thumbnails strip and of the
+         audio peaks drawn by the timeline.
+Compatibility: Python3, wxPython4 Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Thread
+import platform
+import subprocess
+import wx
+from videomass.vdms_utils.utils import Popen
+from videomass.vdms_io.timeline_cache import (timeline_cache,
+                                              audio_peaks,
+                                              peaks_rate,
+                                              showinfo_times,
+                                              THUMB_WIDTH,
+                                              THUMB_HEIGHT,
+                                              NTHUMBS,
+                                              )
+from videomass.vdms_threads.generic_task import logwrite
+if not platform.system() == 'Windows':
+    import shlex
+
+
+class TimelineStrip(Thread):
+    """
+    Loads the timeline strip (see `TimelineCache`) of the given
+    media file from the cache or, if not found, builds it once
+    in background and stores it: the thumbnails are taken from
+    up to `NTHUMBS` key frames evenly spread over the duration,
+    decoding the key frames only, and the audio peaks from the
+    first audio stream resampled to a low sample rate. Both are
+    read from the standard output of FFmpeg, without temporary
+    files.
+
+    The `callback` is called on the GUI thread with the filename
+    and the strip (None if it cannot be made).
+
+    USAGE:
+        >>> TimelineStrip(filename, duration, logfile, callback)
+    """
+    def __init__(self, filename, duration, logfile, callback):
+        """
+        duration: duration of the media in milliseconds
+        """
+        get = wx.GetApp()
+        self.appdata = get.appset
+        self.filename = filename
+        self.duration = duration
+        self.logfile = logfile
+        self.callback = callback
+
+        Thread.__init__(self, daemon=True)
+        self.start()
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Load or build the strip
+        """
+        cache = timeline_cache(self.appdata['cachedir'])
+        key = cache.make_key(self.filename)
+        strip = cache.load(key) if key else None
+        if strip is None:
+            times, atlas = self.thumbnails()
+            peaks = self.peaks()
+            if times or peaks:
+                strip = {'times': times,
+                         'width': THUMB_WIDTH,
+                         'height': THUMB_HEIGHT,
+                         'atlas': atlas,
+                         'peaks': peaks,
+                         }
+                if key:
+                    cache.store(key, strip)
+        wx.CallAfter(self.callback, self.filename, strip)
+    # ----------------------------------------------------------------#
+
+    def command(self, args):
+        """
+        Returns the FFmpeg command with the given `args`
+        ready for `Popen`.
+        """
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" -nostdin -hide_banner '
+               f'-nostats {args}')
+        logwrite(self.logfile, f'From: Timeline\n{cmd}\n')
+        if not platform.system() == 'Windows':
+            return shlex.split(cmd)
+        return cmd
+    # ----------------------------------------------------------------#
+
+    def thumbnails(self):
+        """
+        Returns a tuple (times, atlas) with the times in seconds
+        of the thumbnails and their raw RGB data, or ([], b'')
+        if the media has no video.
+        """
+        step = self.duration / 1000 / NTHUMBS
+        size = f'{THUMB_WIDTH}:{THUMB_HEIGHT}'
+        vfilter = (f"select='isnan(prev_selected_t)+"
+                   f"gte(t-prev_selected_t,{step:.3f})',"
+                   f"scale={size}:force_original_aspect_ratio=decrease,"
+                   f"pad={size}:-1:-1,showinfo")
+        cmd = self.command(f'-loglevel info -skip_frame nokey '
+                           f'-i "{self.filename}" -an -sn -dn '
+                           f'-vf "{vfilter}" -fps_mode passthrough '
+                           f'-frames:v {NTHUMBS} '
+                           f'-f rawvideo -pix_fmt rgb24 pipe:1')
+        try:
+            with Popen(cmd,
+                       stdin=subprocess.DEVNULL,
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.PIPE,
+                       ) as proc:
+                atlas, output = proc.communicate()
+        except OSError as err:
+            logwrite(self.logfile, f'[VIDEOMASS]: ERROR: {err}\n')
+            return [], b''
+
+        output = output.decode(self.appdata['encoding'], errors='replace')
+        if proc.returncode:
+            logwrite(self.logfile, f'[FFMPEG] ERRORS:\n{output}\n')
+        times = showinfo_times(output)
+        thumbsize = THUMB_WIDTH * THUMB_HEIGHT * 3
+        count = min(len(times), len(atlas) // thumbsize, NTHUMBS)
+        return times[:count], atlas[:count * thumbsize]
+    # ----------------------------------------------------------------#
+
+    def peaks(self):
+        """
+        Returns the list of the audio peaks, empty if the
+        media has no audio.
+        """
+        rate = peaks_rate(self.duration)
+        cmd = self.command(f'-loglevel error -i "{self.filename}" '
+                           f'-vn -sn -dn -map 0:a:0? -ac 1 -ar {rate} '
+                           f'-f s16le -acodec pcm_s16le pipe:1')
+        try:
+            with Popen(cmd,
+                       stdin=subprocess.DEVNULL,
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.DEVNULL,
+                       ) as proc:
+                peaks = audio_peaks(proc.stdout,
+                                    self.duration * rate // 1000)
+        except OSError as err:
+            logwrite(self.logfile, f'[VIDEOMASS]: ERROR: {err}\n')
+            return []
+        if proc.returncode or not any(peaks):
+            return []
+        return peaks
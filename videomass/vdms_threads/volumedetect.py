@@ -25,13 +25,18 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
-from threading import Thread
+from threading import Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 import platform
 import wx
-from pubsub import pub
-from videomass.vdms_utils.utils import Popen
-from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_utils.utils import Popen, time_to_integer
+from videomass.vdms_io.make_filelog import (make_log_template,
+                                            log_sink,
+                                            flush_logs,
+                                            )
+from videomass.vdms_io.loudness_store import loudness_store
+from videomass.vdms_threads.event_dispatcher import post_message
 if not platform.system() == 'Windows':
     import shlex
 
@@ -40,7 +45,14 @@ class VolumeDetectThread(Thread):
     """
     This class represents a separate subprocess thread to get
     audio volume peak level when required for audio normalization
-    process.
+    process. The files are analyzed by a bounded pool of parallel
+    FFmpeg processes.
+
+    The state of each file is sent by the "ITEM_PROGRESS_EVT"
+    pubsub message with `jobid` (the file index), `state` (one
+    of 'RUNNING', 'DONE', 'ERROR', 'STOP', 'SKIPPED') and `info`
+    args, the end of the whole process by the "RESULT_EVT" message
+    (see `ProgressListDialog`).
 
     NOTE: all error handling (including verification of the
     existence of files) is entrusted to ffmpeg, except for the
@@ -50,7 +62,7 @@ class VolumeDetectThread(Thread):
     ERROR = 'Please, see volumedetected.log file for error details.\n'
     STOP = '[Videomass]: STOP command received.'
 
-    def __init__(self, timeseq, filelist, audiomap):
+    def __init__(self, timeseq, filelist, audiomap, durations=None):
         """
         Replace /dev/null with NUL on Windows.
 
@@ -60,6 +72,10 @@ class VolumeDetectThread(Thread):
                    parameters and the self.status of the output error,
                    in the form:
                    ([[maxvol, medvol], [etc,etc]], None or "str errors")
+        durations: optional list of the files duration in
+                   milliseconds, used to show the progress.
+        self.store: the measurements already stored by previous
+                    analyses are reused (see `LoudnessStore`).
         """
         get = wx.GetApp()
         self.appdata = get.appset
@@ -69,6 +85,15 @@ class VolumeDetectThread(Thread):
         self.audiomap = audiomap
         self.status = None
         self.data = None
+        self.lock = Lock()
+        self.store = loudness_store(self.appdata['cachedir'])
+        self.durations = list(durations or [0] * len(filelist))
+        if self.time_seq[1]:  # e.g. '-t 00:01:00.000'
+            limit = time_to_integer(self.time_seq[1].split()[1])
+            self.durations = [min(dur, limit) if dur else limit
+                              for dur in self.durations]
+        self.njobs = (self.appdata['max_parallel_jobs']
+                      or os.cpu_count() or 1)
         self.nul = 'NUL' if platform.system() == 'Windows' else '/dev/null'
         self.logf = os.path.join(self.appdata['logdir'], 'volumedetected.log')
         make_log_template('volumedetected.log',
@@ -81,88 +106,152 @@ class VolumeDetectThread(Thread):
     def run(self):
         """
         Audio volume data is getted by the thread's caller using
-        the thread.data method (see io_tools).
-        NOTE: wx.callafter(pub...) do not send data to pop-up
+        the thread.data method (see io_tools). The volume data
+        list keeps the same order as the file list.
+        NOTE: the "RESULT_EVT" message do not send data to pop-up
               dialog, but a empty string that is useful to get
               the end of the process to close of the pop-up
 
         """
-        volume = []
-        for files in self.filelist:
-            cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
-                   f'{self.appdata["ffmpeg-default-args"]} '
-                   f'{self.appdata["ffmpeg_loglev"]} '
-                   f'{self.time_seq[0]} '
-                   f'-i "{files}" '
-                   f'{self.time_seq[1]} '
-                   f'{self.audiomap} '
-                   f'-af volumedetect -vn -sn -dn -f null '
-                   f'{self.nul}'
-                   )
-            self.logwrite(cmd)
-
-            if not platform.system() == 'Windows':
-                cmd = shlex.split(cmd)
+        volume = [('', '')] * len(self.filelist)
+        njobs = max(1, min(self.njobs, len(self.filelist)))
+        with ThreadPoolExecutor(max_workers=njobs) as pool:
+            futures = [pool.submit(self.analyze, index, files, volume)
+                       for index, files in enumerate(self.filelist)]
+        for index, future in enumerate(futures):
             try:
-                with Popen(cmd,
-                           stderr=subprocess.PIPE,
-                           stdin=subprocess.PIPE,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding=self.appdata['encoding'],
-                           ) as proc:
-                    meanv, maxv = '', ''
-                    for line in proc.stderr:
-                        if 'max_volume:' in line:
-                            maxv = line.split(':')[1].strip()
-                        if 'mean_volume:' in line:
-                            meanv = line.split(':')[1].strip()
-
-                        if self.stop_work_thread:
-                            proc.stdin.write('q')  # stop ffmpeg
-                            output = proc.communicate()[1]
-                            proc.wait()
-                            self.status = 'INFO', VolumeDetectThread.STOP
-                            break
-
-                        if proc.wait():
-                            output = proc.communicate()[1]
-                            self.status = 'ERROR', VolumeDetectThread.ERROR
-                            break
-
-                    volume.append((maxv, meanv))
-
-            except (OSError, FileNotFoundError) as err:
-                self.status = 'ERROR', VolumeDetectThread.ERROR
-                output = err
-
-            if self.status:
-                self.logerror(output)
-                break
+                future.result()
+            except Exception as err:  # e.g. unexpected ffmpeg output
+                self.logerror(f'"{self.filelist[index]}": '
+                              f'{type(err).__name__}: {err}')
+                self.set_status(('ERROR', VolumeDetectThread.ERROR))
+                post_message("ITEM_PROGRESS_EVT", jobid=index,
+                             state='ERROR', info='')
 
         self.data = (volume, self.status)
+        flush_logs(self.logf)
+
+        post_message("RESULT_EVT", status='')
+    # ----------------------------------------------------------------#
+
+    def set_status(self, status):
+        """
+        Set the status of the whole process, the
+        first error or stop received is kept.
+        """
+        with self.lock:
+            if not self.status:
+                self.status = status
+    # ----------------------------------------------------------------#
+
+    def analyze(self, index, files, volume):
+        """
+        Runs the volumedetect analysis of a single file
+        in a worker thread, the result is stored into the
+        `volume` list at the given `index`.
+        """
+        if self.stop_work_thread or self.status:
+            post_message("ITEM_PROGRESS_EVT", merge=True, jobid=index,
+                         state='STOP' if self.stop_work_thread
+                         else 'SKIPPED', info='')
+            return
+
+        stored = self.store.get(files, self.appdata['ffmpeg_cmd'],
+                                'volumedetect', self.time_seq,
+                                self.audiomap)
+        if stored:
+            volume[index] = stored['max_volume'], stored['mean_volume']
+            post_message("ITEM_PROGRESS_EVT", merge=True, jobid=index,
+                         state='DONE', info=(f'max: {volume[index][0]}, '
+                                             f'mean: {volume[index][1]} '
+                                             f'(stored)'))
+            return
+
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
+               f'{self.appdata["ffmpeg-default-args"]} '
+               f'{self.appdata["ffmpeg_loglev"]} '
+               f'{self.time_seq[0]} '
+               f'-i "{files}" '
+               f'{self.time_seq[1]} '
+               f'{self.audiomap} '
+               f'-af volumedetect -vn -sn -dn -f null '
+               f'{self.nul}'
+               )
+        self.logwrite(cmd)
+        post_message("ITEM_PROGRESS_EVT", merge=True, jobid=index,
+                     state='RUNNING', info='')
+
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        output, status = [], None
+        try:
+            with Popen(cmd,
+                       stderr=subprocess.PIPE,
+                       stdin=subprocess.PIPE,
+                       bufsize=1,
+                       universal_newlines=True,
+                       encoding=self.appdata['encoding'],
+                       ) as proc:
+                for line in proc.stderr:
+                    output.append(line)
+                    if 'time=' in line and self.durations[index]:
+                        pos = line.index('time=') + 5
+                        msec = time_to_integer(line[pos:].split()[0])
+                        perc = min(100, msec * 100 // self.durations[index])
+                        post_message("ITEM_PROGRESS_EVT", merge=True,
+                                     jobid=index, state='RUNNING',
+                                     info=f'{perc}%')
+
+                    if self.stop_work_thread:
+                        proc.stdin.write('q')  # stop ffmpeg
+                        output.append(proc.communicate()[1])
+                        proc.wait()
+                        status = 'INFO', VolumeDetectThread.STOP
+                        break
+
+                if not status and proc.wait():
+                    status = 'ERROR', VolumeDetectThread.ERROR
+
+        except (OSError, FileNotFoundError) as err:
+            status = 'ERROR', VolumeDetectThread.ERROR
+            output = [str(err)]
+
+        if status:
+            self.logerror(''.join(output))
+            self.set_status(status)
+            post_message("ITEM_PROGRESS_EVT", merge=True, jobid=index,
+                         state='STOP' if status[0] == 'INFO' else 'ERROR',
+                         info='')
+            return
 
-        wx.CallAfter(pub.sendMessage,
-                     "RESULT_EVT",
-                     status=''
-                     )
+        maxv, meanv = '', ''
+        for line in output:
+            if 'max_volume:' in line:
+                maxv = line.split(':')[1].strip()
+            if 'mean_volume:' in line:
+                meanv = line.split(':')[1].strip()
+        volume[index] = (maxv, meanv)
+        if maxv and meanv:
+            self.store.put(files, self.appdata['ffmpeg_cmd'], 'volumedetect',
+                           self.time_seq, self.audiomap,
+                           {'max_volume': maxv, 'mean_volume': meanv})
+        post_message("ITEM_PROGRESS_EVT", merge=True, jobid=index,
+                     state='DONE', info=f'max: {maxv}, mean: {meanv}')
     # ----------------------------------------------------------------#
 
     def logwrite(self, cmd):
         """
         write ffmpeg command log
         """
-        with open(self.logf, "a", encoding='utf-8') as log:
-            log.write(f"{cmd}\n")
+        log_sink(self.logf).write(f"{cmd}\n")
     # ----------------------------------------------------------------#
 
     def logerror(self, output):
         """
         write ffmpeg volumedected errors
         """
-        with open(self.logf, "a", encoding='utf-8') as logerr:
-            logerr.write(f"\n[FFMPEG] volumedetect "
-                         f"ERRORS:\n{output}\n")
+        log_sink(self.logf).write(f"\n[FFMPEG] volumedetect "
+                                  f"ERRORS:\n{output}\n")
     # ----------------------------------------------------------------#
 
     def stop(self):
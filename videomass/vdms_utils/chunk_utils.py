@@ -0,0 +1,127 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: chunk_utils.py
+Porpose: helpers of the segment-parallel (chunked) video encoding
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from bisect import bisect_left
+import re
+
+MINLEN = 20000  # min length of a segment in milliseconds
+
+
+def chunk_ranges(duration, nchunks, keyframes=None, minlen=MINLEN):
+    """
+    Split a `duration` in milliseconds into up to `nchunks`
+    segments of about the same length, each one at least `minlen`
+    milliseconds long (except a single segment).
+
+    If a sorted list of `keyframes` positions (milliseconds,
+    relative to the start of the duration) is given, each
+    segment boundary is moved to the nearest keyframe, so that
+    every segment starts with a keyframe of the source.
+
+    Returns a list of (start, length) tuples in milliseconds.
+    """
+    nchunks = max(1, min(nchunks, duration // minlen if minlen else nchunks))
+    bounds = [0]
+    for num in range(1, nchunks):
+        pos = duration * num // nchunks
+        if keyframes:
+            idx = bisect_left(keyframes, pos)
+            near = keyframes[max(0, idx - 1):idx + 1]
+            pos = min(near, key=lambda k: abs(k - pos))
+        if bounds[-1] + minlen <= pos <= duration - minlen:
+            bounds.append(pos)
+    bounds.append(duration)
+
+    return [(start, end - start) for start, end in zip(bounds, bounds[1:])]
+
+
+def concat_list(filenames):
+    """
+    Returns the text of a FFmpeg concat demuxer list file
+    of the given `filenames`, quoting single quotes.
+    """
+    lines = []
+    for name in filenames:
+        name = name.replace("'", "'\\''")
+        lines.append(f"file '{name}'\n")
+    return ''.join(lines)
+
+
+def frame_rate(probe, args=''):
+    """
+    Returns the frame rate (float) of the encoded video, i.e. the
+    rate given by the `-r` option of the output `args`, if any, or
+    the average frame rate of the first video stream of the ffprobe
+    data `probe` of the source. Returns None if not known.
+    """
+    found = re.search(r'-r(?::v)?\s+(\S+)', args)
+    rates = [found.group(1)] if found else []
+    rates += [st.get('avg_frame_rate', '') for st in probe.get('streams', [])
+              if st.get('codec_type') == 'video'][:1]
+    for rate in rates:
+        num, _sep, den = rate.partition('/')
+        try:
+            value = float(num) / float(den or 1)
+        except (ValueError, ZeroDivisionError):
+            continue
+        if value > 0:
+            return value
+    return None
+
+
+def check_chunked_output(expected, output, rate, nchunks=1, tolerance=500):
+    """
+    Verify the output of a chunked encoding, `expected` is the
+    duration in milliseconds of the selected range of the source,
+    `output` the ffprobe data of the output file probed with the
+    `count_packets` option, `rate` the frame rate of the source
+    (see `frame_rate`) and `nchunks` the number of segments, each
+    boundary of which may round the frame count by one frame.
+
+    Returns a list of error messages, empty if nothing wrong.
+    """
+    errors = []
+    streams = [st for st in output.get('streams', [])
+               if st.get('codec_type') == 'video']
+    if not streams:
+        return ['no video stream found in the output file']
+    try:
+        packets = int(streams[0]['nb_read_packets'])
+    except (KeyError, ValueError):
+        packets = None
+    if rate and packets is not None:
+        frames = round(expected * rate / 1000)
+        if abs(packets - frames) > nchunks:
+            errors.append(f'frame count mismatch: expected {frames}, '
+                          f'output {packets}')
+    try:
+        duration = float(output['format']['duration']) * 1000
+    except (KeyError, ValueError):
+        duration = None
+    if duration is None or abs(duration - expected) > tolerance:
+        errors.append(f'duration mismatch: expected {expected} ms, '
+                      f'output {duration} ms')
+    return errors
@@ -0,0 +1,91 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: frame_utils.py
+Porpose: helpers of the raw video frames decoded for the previews
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+PIXFMT = 'rgb24'  # pixel format of the raw frames
+DEPTH = 3  # bytes per pixel of the `PIXFMT`
+
+
+def frame_size(width, height):
+    """
+    Returns the size in bytes of a raw frame of
+    `width` x `height` pixels.
+    """
+    return int(width) * int(height) * DEPTH
+
+
+def frame_offset(start, msec, rate):
+    """
+    Returns the index of the frame at `msec` milliseconds
+    in a stream of `rate` frames per second beginning at
+    `start` milliseconds, None if `msec` is before `start`.
+    """
+    if msec < start:
+        return None
+    return round((msec - start) * rate / 1000)
+
+
+def read_frame(stream, buf):
+    """
+    Read a whole frame from the binary `stream` straight into
+    the preallocated `buf` (bytearray) without intermediate
+    copies. Returns False if the stream ends before the frame
+    is complete.
+    """
+    view = memoryview(buf)
+    done = 0
+    while done < len(view):
+        num = stream.readinto(view[done:])
+        if not num:
+            return False
+        done += num
+    return True
+
+
+def decoder_args(filename, start, width, height, rate):
+    """
+    Returns the FFmpeg arguments (without `ffmpeg` command and
+    global options) to decode the video stream of `filename`
+    from `start` milliseconds as a sequence of raw frames of
+    `width` x `height` pixels at `rate` frames per second,
+    written on standard output.
+    """
+    seek = f'-ss {start / 1000:.3f} ' if start > 0 else ''
+    return (f'{seek}-i "{filename}" -an -sn -dn '
+            f'-vf "fps={rate},scale={int(width)}:{int(height)}" '
+            f'-f rawvideo -pix_fmt {PIXFMT} pipe:1')
+
+
+def filter_args(width, height, vfilter):
+    """
+    Returns the FFmpeg arguments (without `ffmpeg` command and
+    global options) to apply the `vfilter` filter chain to a
+    single raw frame of `width` x `height` pixels read from
+    standard input, written on standard output.
+    """
+    return (f'-f rawvideo -pix_fmt {PIXFMT} -s {int(width)}x{int(height)} '
+            f'-i pipe:0 -vf "{vfilter}" -frames:v 1 '
+            f'-f rawvideo -pix_fmt {PIXFMT} pipe:1')
@@ -0,0 +1,234 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: job_scheduler.py
+Porpose: cost estimation and admission of the parallel FFmpeg jobs
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from videomass.vdms_utils.utils import format_bytes
+
+HD = 1920 * 1080  # reference number of pixels of the costs below
+BASEMEM = 150 * 1024 * 1024  # bytes of a FFmpeg process (demux/decode)
+# approx. busy CPU cores and bytes per pixel of each video encoder
+# with a 1920x1080 source
+VIDEO_COSTS = {'libaom-av1': (8, 800),
+               'libsvtav1': (6, 600),
+               'librav1e': (6, 400),
+               'libx265': (6, 400),
+               'libvpx-vp9': (4, 250),
+               'libvpx': (2, 150),
+               'libx264': (3, 150),
+               'copy': (0.2, 0),
+               }
+DEFAULT_VIDEO = (2, 100)  # any other video encoder
+HWACCEL = (0.5, 50)  # hardware encoders, e.g. h264_nvenc
+AUDIO_ONLY = (0.5, 0)
+# options which select the video encoder
+VIDEO_CODECS = ('-c:v', '-codec:v', '-c:v:0', '-vcodec', '-c', '-codec')
+
+
+def video_size(probe):
+    """
+    Returns the number of pixels of the first video stream
+    of the given ffprobe `probe` data, None if unknown.
+    """
+    for stream in (probe or {}).get('streams', []):
+        if stream.get('codec_type') == 'video':
+            try:
+                return int(stream['width']) * int(stream['height'])
+            except (KeyError, TypeError, ValueError):
+                return None
+    return None
+
+
+def output_cost(args, pixels):
+    """
+    Returns the (cpu, mem) cost of the encoding of a single
+    output of the given `args` string for a video of `pixels`.
+    """
+    tokens = args.split()
+    if '-vn' in tokens:
+        return AUDIO_ONLY[0], BASEMEM
+    codec = None
+    for opt, val in zip(tokens, tokens[1:]):
+        if opt in VIDEO_CODECS:
+            codec = val
+    if codec in VIDEO_COSTS:
+        cpu, bpp = VIDEO_COSTS[codec]
+    elif codec and codec.endswith(('_nvenc', '_qsv', '_vaapi', '_amf',
+                                   '_videotoolbox', '_v4l2m2m')):
+        cpu, bpp = HWACCEL
+    else:
+        cpu, bpp = DEFAULT_VIDEO
+    scale = max(pixels / HD, 0.25)
+    return cpu * scale, BASEMEM + bpp * pixels
+
+
+def estimate_cost(kwa, probe=None, segments=1):
+    """
+    Estimate the cost of the given FFmpeg item from its args
+    and from the ffprobe data of the source (if known, a 1080p
+    video is assumed otherwise). `segments` is the number of
+    subprocesses running at the same time (e.g. of a 'Chunked'
+    item). The passes of an item run in succession, while the
+    outputs of a 'Multi output' item are encoded together.
+
+    Returns a dict with the following keys:
+        'cpu': (float) number of busy CPU cores
+        'mem': (int) memory in bytes
+    """
+    pixels = video_size(probe) or HD
+    if kwa.get('outputs'):
+        costs = [output_cost(out['args'], pixels) for out in kwa['outputs']]
+        cpu = sum(cost[0] for cost in costs)
+        mem = sum(cost[1] for cost in costs) - BASEMEM * (len(costs) - 1)
+    else:
+        costs = [output_cost(args, pixels) for args in kwa['args'] if args]
+        cpu = max((cost[0] for cost in costs), default=AUDIO_ONLY[0])
+        mem = max((cost[1] for cost in costs), default=BASEMEM)
+
+    return {'cpu': cpu * segments, 'mem': int(mem * segments)}
+
+
+def total_memory():
+    """
+    Returns the amount of physical memory in bytes,
+    None if unknown (e.g. on MS Windows).
+    """
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def system_load():
+    """
+    Returns a (load, available) tuple of the 1 minute load
+    average and of the available memory in bytes, each one
+    None if not supported by the platform.
+    """
+    try:
+        load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        load = None
+    try:
+        with open('/proc/meminfo', 'r', encoding='utf-8') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    return load, int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        avail = os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        avail = None
+    return load, avail
+
+
+class JobScheduler:
+    """
+    Admission control of the FFmpeg jobs running in parallel.
+    Instead of always running a fixed number of jobs, each job
+    (see `estimate_cost`) is admitted only if the costs of all
+    running jobs fit the CPU and memory budget of the machine,
+    up to `maxjobs` jobs. The scheduler also backs off when the
+    system is saturated by other processes, i.e. when the load
+    average exceeds `OVERLOAD` times the CPU cores or when the
+    available memory would drop below the `RESERVE` fraction.
+
+    A job is always admitted if nothing is running, so a job
+    exceeding the whole budget still runs, alone.
+
+    Usage:
+        >>> sched = JobScheduler(maxjobs=4)
+        >>> admit, reason = sched.admit(jobid, cost)
+        >>> sched.release(jobid)  # when done
+    """
+    OVERLOAD = 1.25  # max load average per CPU core
+    RESERVE = 0.1  # fraction of the memory kept available
+
+    def __init__(self, maxjobs, cpus=None, memory=None, sysload=system_load):
+        """
+        `cpus` and `memory` are the budget, by default the
+        CPU cores and the physical memory of the machine.
+        `sysload` returns the live load, see `system_load`.
+        """
+        self.maxjobs = maxjobs
+        self.cpus = cpus or os.cpu_count() or 1
+        self.memory = memory if memory is not None else total_memory()
+        self.sysload = sysload
+        self.running = {}  # {jobid: cost} of the admitted jobs
+
+    def budget(self):
+        """
+        Returns a string describing the budget
+        """
+        mem = format_bytes(self.memory) if self.memory else 'N/A'
+        return (f'{self.cpus} CPUs, {mem} memory, '
+                f'max {self.maxjobs} jobs')
+
+    def status(self):
+        """
+        Returns a string describing the resources in use
+        and the live load.
+        """
+        load, avail = self.sysload()
+        cpu = sum(cost['cpu'] for cost in self.running.values())
+        mem = sum(cost['mem'] for cost in self.running.values())
+        return (f'running {len(self.running)}, cpu {cpu:.1f}, '
+                f'mem {format_bytes(mem)}, '
+                f'load {"N/A" if load is None else f"{load:.2f}"}, '
+                f'free {"N/A" if avail is None else format_bytes(avail)}')
+
+    def admit(self, jobid, cost):
+        """
+        Try to admit the job `jobid` of the given `cost`.
+        Returns a (admitted, reason) tuple, where `reason`
+        is a string describing the decision.
+        """
+        if self.running:
+            cpu = sum(val['cpu'] for val in self.running.values())
+            mem = sum(val['mem'] for val in self.running.values())
+            load, avail = self.sysload()
+            reserve = self.RESERVE * (self.memory or 0)
+            if len(self.running) >= self.maxjobs:
+                return False, 'max jobs running'
+            if cpu + min(cost['cpu'], self.cpus) > self.cpus:
+                return False, 'CPU budget exceeded'
+            if self.memory and mem + cost['mem'] > self.memory - reserve:
+                return False, 'memory budget exceeded'
+            if load is not None and load > self.cpus * self.OVERLOAD:
+                return False, 'system overloaded'
+            if avail is not None and avail - cost['mem'] < reserve:
+                return False, 'low available memory'
+            self.running[jobid] = cost
+            return True, 'fits the budget'
+
+        self.running[jobid] = cost
+        return True, 'no jobs running'
+
+    def release(self, jobid):
+        """
+        Release the resources of a terminated job
+        """
+        self.running.pop(jobid, None)
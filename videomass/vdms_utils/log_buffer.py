@@ -0,0 +1,122 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: log_buffer.py
+Porpose: fixed-capacity ring buffer of the console log records
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+class LogBuffer:
+    """
+    Fixed-capacity ring buffer of (severity, text) line records.
+    Once the `capacity` is reached, each new line overwrites the
+    oldest one, so that memory usage and access time remain
+    constant regardless of the number of lines written.
+
+    The text is written as a stream like on a text control: it
+    is splitted into lines and a text which does not end with a
+    newline is continued by the next `write`.
+
+    USAGE:
+        >>> buf = LogBuffer(capacity=3)
+        >>> buf.write('INFO', 'first line\\nsecond ')
+        >>> buf.write('INFO', 'line\\n')
+        >>> buf[1]
+        ('INFO', 'second line')
+
+    """
+    CAPACITY = 10000  # default max number of lines
+
+    def __init__(self, capacity=CAPACITY):
+        """
+        Attributes defined here:
+        self.records: list of records, at most `capacity` items
+        self.start: index of the oldest record in `self.records`
+        self.isopen: True if the last line is not terminated yet
+        self.discarded: number of lines overwritten so far
+        """
+        self.capacity = capacity
+        self.records = []
+        self.start = 0
+        self.isopen = False
+        self.discarded = 0
+
+    def __len__(self):
+        """
+        Returns the number of lines in the buffer
+        """
+        return len(self.records)
+
+    def __getitem__(self, index):
+        """
+        Returns the (severity, text) record at the given
+        `index`, where 0 is the oldest line in the buffer.
+        """
+        size = len(self.records)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('LogBuffer index out of range')
+        return self.records[(self.start + index) % size]
+
+    def append(self, record):
+        """
+        Add a new (severity, text) line record, overwriting
+        the oldest one if the buffer is full.
+        """
+        if len(self.records) < self.capacity:
+            self.records.append(record)
+        else:
+            self.records[self.start] = record
+            self.start = (self.start + 1) % self.capacity
+            self.discarded += 1
+
+    def write(self, severity, text):
+        """
+        Write the given `text` string using the given `severity`
+        (e.g. the color key of the line).
+        """
+        if not text:
+            return
+        lines = text.split('\n')
+        isopen = lines[-1] != ''
+        if not isopen:
+            lines.pop()
+
+        if self.isopen and self.records:
+            sev, last = self[-1]
+            index = (self.start + len(self.records) - 1) % len(self.records)
+            self.records[index] = (sev if last else severity,
+                                   last + lines.pop(0))
+        for line in lines:
+            self.append((severity, line))
+        self.isopen = isopen
+
+    def clear(self):
+        """
+        Delete all records
+        """
+        self.records.clear()
+        self.start = 0
+        self.isopen = False
+        self.discarded = 0
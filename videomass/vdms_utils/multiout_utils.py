@@ -0,0 +1,159 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: multiout_utils.py
+Porpose: helpers of the multi-output (single decode) encoding
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import re
+import shlex
+
+# options which cannot be moved into a shared filtergraph
+GRAPH_OPTIONS = ('-filter_complex', '-filter_complex_script', '-lavfi', '-i')
+# options of the video filters of a single output
+VIDEO_FILTERS = ('-vf', '-filter:v', '-filter:v:0')
+# options of the video codec of a single output
+VIDEO_CODECS = ('-c', '-codec', '-c:v', '-codec:v', '-c:v:0', '-vcodec')
+
+
+def split_args(args):
+    """
+    Split the given FFmpeg arguments string into a list of
+    tokens, removing quotes but keeping backslashes (e.g.
+    of Windows pathnames).
+    """
+    lex = shlex.shlex(args, posix=True)
+    lex.whitespace_split = True
+    lex.escape = ''
+    return list(lex)
+
+
+def quote_arg(token):
+    """
+    Returns the given token quoted for the command line,
+    if needed.
+    """
+    if token and not re.search(r'[\s"\';|&<>()\[\]]', token):
+        return token
+    return '"' + token.replace('"', '\\"') + '"'
+
+
+def split_output(tokens, label):
+    """
+    Rewrite the given output `tokens` to take the video stream
+    from the filtergraph `label` instead of the first input.
+
+    Returns a (filters, tokens) tuple, where `filters` is the
+    video filter chain removed from the output ('null' if none),
+    (None, tokens) if the output has no video or copies it,
+    None if the output cannot use a shared filtergraph (e.g.
+    it maps streams by index or has other inputs).
+    """
+    if '-vn' in tokens:
+        return None, tokens
+    for opt, val in zip(tokens, tokens[1:]):
+        if opt in VIDEO_CODECS and val == 'copy':
+            return None, tokens
+
+    filters, maps, others = 'null', [], []
+    itertokens = iter(tokens)
+    for opt in itertokens:
+        if opt in GRAPH_OPTIONS:
+            return None
+        if opt in VIDEO_FILTERS:
+            filters = next(itertokens, 'null')
+        elif opt == '-map':
+            spec = next(itertokens, '')
+            if re.match(r'0:[vV](:.*)?\??$', spec):
+                continue  # replaced by the filtergraph output
+            if re.match(r'0\??$', spec):
+                maps += ['-map', spec, '-map', '-0:v']
+            elif re.match(r'-?0:[asdt](:.*)?\??$', spec):
+                maps += ['-map', spec]
+            else:
+                return None
+        else:
+            others.append(opt)
+
+    if not maps and not any(tok.startswith('-map') for tok in tokens):
+        maps = ['-map', '0:a:0?']  # like the default stream selection
+    return filters, ['-map', f'[{label}]', *maps, *others]
+
+
+def valid_outputs(outputs):
+    """
+    Returns True if the given `outputs` object is a non-empty
+    list of {'args': str, 'destination': str} dicts with
+    distinct destinations, False otherwise.
+    """
+    if not isinstance(outputs, list) or not outputs:
+        return False
+    for out in outputs:
+        if not (isinstance(out, dict)
+                and isinstance(out.get('args'), str)
+                and isinstance(out.get('destination'), str)):
+            return False
+    dests = [out['destination'] for out in outputs]
+    return len(set(dests)) == len(dests)
+
+
+def multi_output_args(outputs):
+    """
+    Returns the output arguments string of a single FFmpeg
+    command encoding the first input to several `outputs`,
+    a list of {'args': str, 'destination': str} dicts.
+
+    When at least two outputs encode the video, a `split`
+    filtergraph decodes the video once and feeds each output
+    with its own video filters, e.g.:
+
+        -filter_complex "[0:v:0]split=2[s0][s1];[s0]scale=-2:720[v0];
+        [s1]null[v1]" -map [v0] ... "out0.mp4" -map [v1] ... "out1.mp4"
+
+    Otherwise (or if any output can not be rewritten, see
+    `split_output`) the outputs are simply listed in order,
+    which also decodes the input once.
+    """
+    plain = ' '.join(f'{out["args"]} "{out["destination"]}"'
+                     for out in outputs)
+    rewritten, chains = [], []
+    for out in outputs:
+        split = split_output(split_args(out['args']), f'v{len(chains)}')
+        if split is None:
+            return plain
+        filters, tokens = split
+        if filters is not None:
+            chains.append(filters)
+        rewritten.append((tokens, out['destination']))
+
+    if len(chains) < 2:
+        return plain
+
+    labels = ''.join(f'[s{num}]' for num in range(len(chains)))
+    graph = ';'.join([f'[0:v:0]split={len(chains)}{labels}']
+                     + [f'[s{num}]{chain}[v{num}]' for num, chain
+                        in enumerate(chains)])
+    args = [f'-filter_complex {quote_arg(graph)}']
+    for tokens, dest in rewritten:
+        args.append(' '.join(quote_arg(tok) for tok in tokens))
+        args.append(f'"{dest}"')
+    return ' '.join(args)
@@ -0,0 +1,107 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: progress_utils.py
+Porpose: parsing of the FFmpeg machine-readable progress output
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# FFmpeg global options to write progress blocks on standard output
+PROGRESS_ARGS = '-nostats -progress pipe:1'
+
+
+def _to_number(value, kind=int):
+    """
+    Convert the given progress `value` string to a number
+    of `kind` type. Returns None if the value is not available
+    (e.g. 'N/A').
+    """
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def progress_record(block: dict) -> dict:
+    """
+    Given a dict of raw key=value pairs of a single progress
+    block (as written by `ffmpeg -progress`), returns a compact
+    progress record with the following keys:
+
+        'time': (int) output time position in milliseconds
+        'frame': (int) number of frames, None if not available
+        'fps': (float) frames per second, None if not available
+        'size': (int) total output size in bytes, None if N/A
+        'bitrate': (str) current bitrate as given by ffmpeg
+        'speed': (float) encoding speed factor, None if N/A
+        'end': (bool) True with the last block of the process
+
+    Note that ffmpeg writes `out_time_ms` in microseconds,
+    like `out_time_us`.
+    """
+    usec = _to_number(block.get('out_time_us', block.get('out_time_ms')))
+    speed = block.get('speed', 'N/A').strip().rstrip('x')
+
+    return {'time': usec // 1000 if usec and usec > 0 else 0,
+            'frame': _to_number(block.get('frame')),
+            'fps': _to_number(block.get('fps'), float),
+            'size': _to_number(block.get('total_size')),
+            'bitrate': block.get('bitrate', 'N/A').strip(),
+            'speed': _to_number(speed, float),
+            'end': block.get('progress') == 'end',
+            }
+
+
+def progress_blocks(stream):
+    """
+    Generator that reads the FFmpeg `-progress` output from the
+    given text `stream` (any iterable of lines) and yields a
+    progress record (see `progress_record`) for each complete
+    block. A block always ends with the `progress` key.
+    """
+    block = {}
+    for line in stream:
+        key, sep, value = line.strip().partition('=')
+        if not sep:
+            continue
+        block[key] = value
+        if key == 'progress':
+            yield progress_record(block)
+            block = {}
+
+
+def progress_labels(record: dict) -> list:
+    """
+    Returns a list of "key: value" strings describing the given
+    progress `record`, for displaying purposes.
+    """
+    labels = []
+    if record['frame'] is not None:
+        labels.append(f"frame: {record['frame']}")
+    if record['fps'] is not None:
+        labels.append(f"fps: {record['fps']:g}")
+    if record['size'] is not None:
+        labels.append(f"size: {record['size'] // 1024}KiB")
+    labels.append(f"bitrate: {record['bitrate']}")
+    if record['speed'] is not None:
+        labels.append(f"speed: {record['speed']:g}x")
+    return labels
@@ -28,6 +28,7 @@ import os
 import json
 import wx
 from videomass.vdms_dialogs.singlechoicedlg import SingleChoice
+from videomass.vdms_utils.multiout_utils import valid_outputs
 
 
 def write_json_file_queue(data, queuefile=None):
@@ -47,7 +48,10 @@ def load_json_file_queue(newincoming=None):
     """
     Locates, loads and validates a QUEUE json file.
     Note, a Videomass queue file cannot contain multiple
-    occurrences of the 'destination' key value
+    occurrences of the 'destination' key value.
+    The 'Multi output' items also require the 'outputs' key,
+    a list of {"args": "...", "destination": "..."} objects,
+    one for each output of the source.
     """
     if not newincoming:
         wild = "Source (*.json)|*.json| All files (*.*)|*.*"
@@ -85,6 +89,16 @@ def load_json_file_queue(newincoming=None):
                               None
                               )
                 return None
+        if (ck['type'] == 'Multi output'
+                and not valid_outputs(ck.get('outputs'))):
+            msg = (_('ERROR: invalid outputs found.\n'
+                     'Invalid file: «{0}»').format(newincoming))
+            wx.MessageBox(msg, _('Videomass - Error!'), wx.STAY_ON_TOP
+                          | wx.ICON_ERROR
+                          | wx.OK,
+                          None
+                          )
+            return None
     occurences = []
     msg = (_('ERROR: invalid data found loading queue file.\n'
              '«{0}»\n\nCannot contain multiple occurrences '
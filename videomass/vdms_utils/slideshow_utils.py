@@ -0,0 +1,77 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: slideshow_utils.py
+Porpose: helpers of the images streaming of the slideshow maker
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint .
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import subprocess
+import platform
+from videomass.vdms_utils.utils import Popen
+if not platform.system() == 'Windows':
+    import shlex
+
+
+def normalize_image(filename, resize, **kwargs):
+    """
+    Decode the given image file applying the optional `resize`
+    filter args and returns a tuple (data, error) where `data`
+    is the normalized image (uncompressed PPM, in memory only)
+    and `error` the error message, if any.
+    """
+    cmd = (f'"{kwargs["ffmpeg_cmd"]}" -nostdin -hide_banner '
+           f'{kwargs["ffmpeg_loglev"]} -i "{filename}" {resize} '
+           f'-frames:v 1 -f image2pipe -c:v ppm -pix_fmt rgb24 pipe:1')
+    if not platform.system() == 'Windows':
+        cmd = shlex.split(cmd)
+    try:
+        with Popen(cmd,
+                   stdin=subprocess.DEVNULL,
+                   stdout=subprocess.PIPE,
+                   stderr=subprocess.PIPE,
+                   ) as proc:
+            data, error = proc.communicate()
+    except OSError as err:
+        return None, err
+    if proc.returncode or not data:
+        return None, error.decode(kwargs['encoding'], errors='replace')
+    return data, None
+
+
+def stream_preinput(preinput):
+    """
+    Adapts the image2 input options `preinput` to the images
+    streamed on a pipe, which cannot be looped by the demuxer.
+    Returns a tuple (preinput, loop), where `loop` is True if
+    the images must be streamed again and again until the
+    `-t` duration is reached; looped images without a given
+    frame rate are streamed at one image per second.
+    """
+    args = preinput.split()
+    loop = False
+    if '-loop' in args:
+        idx = args.index('-loop')
+        loop = args[idx + 1:idx + 2] == ['1']
+        del args[idx:idx + 2]
+        if loop and '-framerate' not in args:
+            args += ['-framerate', '1']
+    return ' '.join(args), loop
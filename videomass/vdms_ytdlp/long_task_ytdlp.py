@@ -28,7 +28,10 @@ import os
 from pubsub import pub
 import wx
 from videomass.vdms_dialogs.widget_utils import notification_area
-from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_io.make_filelog import (make_log_template,
+                                            log_sink,
+                                            flush_logs,
+                                            )
 from videomass.vdms_ytdlp.ydl_downloader import YdlDownloader, YtdlExecDL
 from videomass.vdms_io import io_tools
 
@@ -118,6 +121,7 @@ class LogOut(wx.Panel):
         """
         if self.logfile:
             fname = str(self.logfile)
+            flush_logs(fname)
             if os.path.exists(fname) and os.path.isfile(fname):
                 io_tools.openpath(fname)
     # ----------------------------------------------------------------------
@@ -180,8 +184,7 @@ class LogOut(wx.Panel):
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT1']))
                 self.txtout.AppendText(f'{output}')
 
-            with open(self.logfile, "a", encoding='utf-8') as logerr:
-                logerr.write(f"[YT_DLP]: {output}")
+            log_sink(self.logfile).write(f"[YT_DLP]: {output}")
     # ---------------------------------------------------------------------#
 
     def downloader_activity(self, output, duration, status):
@@ -212,8 +215,8 @@ class LogOut(wx.Panel):
             elif '[download]' not in output:
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT1']))
                 self.txtout.AppendText(f'{output}\n')
-                with open(self.logfile, "a", encoding='utf-8') as logerr:
-                    logerr.write(f"[YT_DLP]: {status} > {output}\n")
+                log_sink(self.logfile).write(f"[YT_DLP]: {status} > "
+                                             f"{output}\n")
 
         elif status == 'DOWNLOAD':
             perc = duration['_percent_str'].strip()
@@ -228,8 +231,7 @@ class LogOut(wx.Panel):
             self.txtout.AppendText(f'{duration}\n')
 
         if status in ['ERROR', 'WARNING']:
-            with open(self.logfile, "a", encoding='utf-8') as logerr:
-                logerr.write(f"[YT_DLP]: {output}\n")
+            log_sink(self.logfile).write(f"[YT_DLP]: {output}\n")
     # ---------------------------------------------------------------------#
 
     def update_count(self, count, fsource, destination, duration, end):
@@ -300,6 +302,7 @@ class LogOut(wx.Panel):
             self.txtout.AppendText(f"{endmsg}\n")
 
         self.txtout.AppendText('\n')
+        flush_logs(self.logfile)
         self.reset_all()
         pub.sendMessage("PROCESS_TERMINATED_YTDLP", msg='Terminated')
     # ----------------------------------------------------------------------
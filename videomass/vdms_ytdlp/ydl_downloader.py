@@ -32,9 +32,9 @@ import itertools
 import platform
 import subprocess
 import wx
-from pubsub import pub
 from videomass.vdms_utils.utils import Popen
 from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_threads.event_dispatcher import post_message
 if not platform.system() == 'Windows':
     import shlex
 if wx.GetApp().appset['yt_dlp'] is True:
@@ -87,8 +87,7 @@ class YtdlExecDL(Thread):
             self.count += 1
             count = f"URL {self.count}/{self.countmax}"
 
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_YTDL_EVT",
+            post_message("COUNT_YTDL_EVT",
                          count=count,
                          fsource=f'Source: {url}',
                          destination='',
@@ -108,28 +107,25 @@ class YtdlExecDL(Thread):
                            encoding='utf-8',
                            ) as proc:
                     for line in proc.stdout:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_YDL_EXECUTABLE_EVT",
+                        post_message("UPDATE_YDL_EXECUTABLE_EVT",
                                      output=line,
                                      duration=100,
                                      status=0,
                                      )
                         if self.stop_work_thread:
                             killbill(proc.pid)
-                            wx.CallAfter(pub.sendMessage,
-                                         "UPDATE_YDL_EXECUTABLE_EVT",
+                            post_message("UPDATE_YDL_EXECUTABLE_EVT",
                                          output='STOP',
                                          duration=100,
                                          status='ERROR',
                                          )
                             logwrite('', YtdlExecDL.STOP, self.logfile)
                             time.sleep(.5)
-                            wx.CallAfter(pub.sendMessage, "END_YTDL_EVT")
+                            post_message("END_YTDL_EVT")
                             return
 
                     if proc.wait():
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_YDL_EXECUTABLE_EVT",
+                        post_message("UPDATE_YDL_EXECUTABLE_EVT",
                                      output='FAILED',
                                      duration=100,
                                      status='ERROR',
@@ -140,8 +136,7 @@ class YtdlExecDL(Thread):
                         continue
 
             except (OSError, FileNotFoundError) as err:
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_YTDL_EVT",
+                post_message("COUNT_YTDL_EVT",
                              count=err,
                              fsource='',
                              destination='',
@@ -152,8 +147,7 @@ class YtdlExecDL(Thread):
                 break
 
             if proc.wait() == 0:  # ..Finished
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_YTDL_EVT",
+                post_message("COUNT_YTDL_EVT",
                              count='',
                              fsource='',
                              destination='',
@@ -162,7 +156,7 @@ class YtdlExecDL(Thread):
                              )
                 time.sleep(1)
         time.sleep(.5)
-        wx.CallAfter(pub.sendMessage, "END_YTDL_EVT")
+        post_message("END_YTDL_EVT")
     # --------------------------------------------------------------------#
 
     def stop(self):
@@ -193,8 +187,7 @@ class MyLogger:
         are passed into debug. You can distinguish them
         by the prefix '[debug] '
         """
-        wx.CallAfter(pub.sendMessage,
-                     "UPDATE_YDL_EVT",
+        post_message("UPDATE_YDL_EVT",
                      output=msg,
                      duration='',
                      status='DEBUG',
@@ -206,8 +199,7 @@ class MyLogger:
         Get warning messages
         """
         msg = f'WARNING: {msg}'
-        wx.CallAfter(pub.sendMessage,
-                     "UPDATE_YDL_EVT",
+        post_message("UPDATE_YDL_EVT",
                      output=msg,
                      duration='',
                      status='WARNING',
@@ -217,8 +209,7 @@ class MyLogger:
         """
         Get error messages
         """
-        wx.CallAfter(pub.sendMessage,
-                     "UPDATE_YDL_EVT",
+        post_message("UPDATE_YDL_EVT",
                      output=msg,
                      duration='',
                      status='ERROR',
@@ -234,23 +225,21 @@ def my_hook(data):
     if data['status'] == 'downloading':
         keys = ('_percent_str', '_total_bytes_str', '_speed_str', '_eta_str')
 
-        wx.CallAfter(pub.sendMessage,
-                     "UPDATE_YDL_EVT",
+        post_message("UPDATE_YDL_EVT",
+                     merge=True,
                      output='',
                      duration={x: data.get(x, 'N/A') for x in keys},
                      status='DOWNLOAD',
                      )
     if data['status'] == 'finished':
-        wx.CallAfter(pub.sendMessage,
-                     "COUNT_YTDL_EVT",
+        post_message("COUNT_YTDL_EVT",
                      count='',
                      fsource='',
                      destination='',
                      duration='',
                      end='DONE',
                      )
-        wx.CallAfter(pub.sendMessage,
-                     "UPDATE_YDL_EVT",
+        post_message("UPDATE_YDL_EVT",
                      output='',
                      duration='Done downloading, now converting ...',
                      status='FINISHED',
@@ -302,8 +291,7 @@ class YdlDownloader(Thread):
             self.count += 1
             count = f"URL {self.count}/{self.countmax}"
 
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_YTDL_EVT",
+            post_message("COUNT_YTDL_EVT",
                          count=count,
                          fsource=f'Source: {url}',
                          destination='',
@@ -325,7 +313,7 @@ class YdlDownloader(Thread):
                 except Exception:
                     break
 
-        wx.CallAfter(pub.sendMessage, "END_YTDL_EVT")
+        post_message("END_YTDL_EVT")
 
     def stop(self):
         """